@@ -0,0 +1,178 @@
+"""Local performance benchmarks for leet2git storage and rendering.
+
+Every benchmark works on synthetic, realistically sized question data inside a
+temporary directory, so it never touches the user configuration or LeetCode.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+
+import click
+
+from leet2git.config_manager import AppConfig, ReadmeConfig
+from leet2git.file_handler import create_file_handler
+from leet2git.question_db import QuestionData, QuestionDB, TopicTag
+from leet2git.readme_handler import ReadmeHandler
+from leet2git.ruff_formatter import FormatQueue
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+TOPICS = (
+    ("Array", "array"),
+    ("Hash Table", "hash-table"),
+    ("String", "string"),
+    ("Dynamic Programming", "dynamic-programming"),
+    ("Math", "math"),
+    ("Sorting", "sorting"),
+    ("Greedy", "greedy"),
+    ("Depth-First Search", "depth-first-search"),
+    ("Binary Search", "binary-search"),
+    ("Tree", "tree"),
+)
+
+
+def make_question(question_id: int) -> QuestionData:
+    """Build a synthetic question with LeetCode-sized text fields."""
+    slug = f"synthetic-problem-{question_id}"
+    return QuestionData(
+        title=f"Synthetic Problem {question_id}",
+        title_slug=slug,
+        url=f"https://leetcode.com/problems/{slug}",
+        id=question_id,
+        internal_id=question_id + 100_000,
+        creation_time=1_600_000_000.0 + question_id * 3600,
+        difficulty=DIFFICULTIES[question_id % len(DIFFICULTIES)],
+        file_path=f"src/leetcode_{question_id}_synthetic_problem_{question_id}.py",
+        test_file_path=f"tests/test_{question_id}.py",
+        question_template=(
+            "class Solution:\n    def solve(self, nums: List[int], target: int) -> List[int]:\n"
+        ),
+        raw_code="class Solution:\n    def solve(self, nums, target):\n        return nums\n" * 4,
+        language="python3",
+        function_name=["solve"],
+        description=[f"Description line {line} of problem {question_id}." for line in range(25)],
+        inputs=["[2,7,11,15], 9", "[3,2,4], 6", "[3,3], 6"],
+        outputs=["[0,1]", "[1,2]", "[0,1]"],
+        categories=[
+            TopicTag(name=name, slug=topic_slug)
+            for name, topic_slug in TOPICS[question_id % 7 : question_id % 7 + 3]
+        ],
+    )
+
+
+def time_call(function: Callable[[], object], repeat: int) -> list[float]:
+    """Return the wall-clock duration of each call in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> float:
+    """Print min/median timings and return the median."""
+    median = statistics.median(timings)
+    click.echo(f"{name:<32} min {min(timings):8.2f} ms   median {median:8.2f} ms")
+    return median
+
+
+@click.group()
+def main() -> None:
+    """Run leet2git performance benchmarks."""
+
+
+@main.command("question-db-load")
+@click.option("--questions", type=click.IntRange(min=1), default=3000, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=10, show_default=True)
+def question_db_load(questions: int, repeat: int) -> None:
+    """Time loading the database and saving one more question."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = AppConfig(source_path=tmp_dir, legacy_data_path=tmp_dir)
+        question_db = QuestionDB(config)
+        for question_id in range(1, questions + 1):
+            question_db.add_question(make_question(question_id))
+        question_db.save()
+
+        report("load", time_call(lambda: QuestionDB(config).load(), repeat))
+        new_ids = iter(range(questions + 1, questions + repeat + 1))
+
+        def save() -> None:
+            question_db.add_question(make_question(next(new_ids)))
+            question_db.save()
+
+        report("save one question", time_call(save, repeat))
+        size = os.path.getsize(question_db.db_file)
+        click.echo(f"{questions} questions, {size / 1e6:.1f} MB database")
+
+
+@main.command("readme-render")
+@click.option("--questions", type=click.IntRange(min=1), default=5000, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=10, show_default=True)
+@click.option("--multi-page", is_flag=True, help="Split the README into pages.")
+def readme_render(questions: int, repeat: int, multi_page: bool) -> None:
+    """Time full README rebuilds, with and without changes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = AppConfig(
+            source_path=tmp_dir,
+            legacy_data_path=tmp_dir,
+            readme=ReadmeConfig(multi_page=multi_page),
+        )
+        question_list = [make_question(question_id) for question_id in range(1, questions + 1)]
+        readme_handler = ReadmeHandler(config)
+        readme_file = os.path.join(tmp_dir, "README.md")
+
+        def changed_rebuild() -> None:
+            os.remove(readme_file)
+            readme_handler.build_readme(question_list)
+
+        readme_handler.build_readme(question_list)
+        report("full rebuild", time_call(changed_rebuild, repeat))
+        report(
+            "unchanged rebuild", time_call(lambda: readme_handler.build_readme(question_list), repeat)
+        )
+        click.echo(f"{questions} questions, {os.path.getsize(readme_file) / 1e6:.1f} MB README")
+
+
+@main.command("source-pipeline")
+@click.option("--questions", type=click.IntRange(min=1), default=20, show_default=True)
+@click.option("--defer-formatting", is_flag=True, help="Format every file with one ruff run.")
+@click.option("--warm-cache", is_flag=True, help="Generate every file once before timing.")
+def source_pipeline(questions: int, defer_formatting: bool, warm_cache: bool) -> None:
+    """Time each stage of the Python source file generation."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = AppConfig(source_path=tmp_dir, legacy_data_path=tmp_dir)
+        if warm_cache:
+            for question_id in range(1, questions + 1):
+                question = make_question(question_id)
+                question.file_path = f"src/leetcode_{question_id}"
+                create_file_handler(question, config).generate_source()
+        format_queue = FormatQueue(tmp_dir)
+        totals: list[float] = []
+        stages: dict[str, list[float]] = {}
+        run_start = time.perf_counter()
+        for question_id in range(1, questions + 1):
+            question = make_question(question_id)
+            question.file_path = f"src/leetcode_{question_id}"
+            handler = create_file_handler(question, config)
+            handler.defer_formatting = defer_formatting
+            start = time.perf_counter()
+            question.file_path = str(handler.generate_source())
+            totals.append((time.perf_counter() - start) * 1000)
+            format_queue.add_question(question)
+            for stage, duration in getattr(handler, "source_timings", {}).items():
+                stages.setdefault(stage, []).append(duration * 1000)
+        if defer_formatting:
+            format_start = time.perf_counter()
+            format_queue.flush()
+            click.echo(f"deferred formatting: {(time.perf_counter() - format_start) * 1000:.2f} ms")
+        for stage, timings in stages.items():
+            report(stage, timings)
+        report("total", totals)
+        click.echo(f"{questions} files in {(time.perf_counter() - run_start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Defers the database save and README update of bulk operations
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+from collections.abc import Iterable
+from types import TracebackType
+from typing import Protocol
+
+from leet2git.question_db import QuestionData
+
+
+class _QuestionStore(Protocol):
+    def save(self) -> None: ...
+
+    def get_questions_sorted_by_creation_time(self) -> list[QuestionData]: ...
+
+
+class _Formatter(Protocol):
+    def add_question(self, question: QuestionData, /) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class _Cache(Protocol):
+    def prune(self, questions: Iterable[QuestionData], /) -> int: ...
+
+
+class _Readme(Protocol):
+    def build_readme(self, question_list: list[QuestionData], /) -> None: ...
+
+
+class BatchSession:
+    """Collects the questions changed by several operations and persists them once
+
+    Use it as a context manager: the database is saved and the README updated a single
+    time when the block exits, also if it exits with an error, so the operations that
+    completed are never lost.
+
+    Example:
+        with BatchSession(qdb, ReadmeHandler(config)) as session:
+            for question_id in question_ids:
+                qdb.delete_question(question_id)
+                session.mark_changed(question_id)
+    """
+
+    def __init__(
+        self,
+        qdb: _QuestionStore,
+        readme_handler: _Readme,
+        format_queue: _Formatter | None = None,
+        format_cache: _Cache | None = None,
+    ):
+        self.qdb = qdb
+        self.readme_handler = readme_handler
+        self.format_queue = format_queue
+        self.format_cache = format_cache
+        self.changed_ids: set[int] = set()
+
+    def __enter__(self) -> "BatchSession":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.flush()
+
+    def mark_changed(self, question_id: int) -> None:
+        """Record a question that was added, modified or deleted
+
+        Args:
+            question_id (int): the question id
+        """
+        self.changed_ids.add(question_id)
+
+    def add_generated(self, question: QuestionData) -> None:
+        """Record a question whose files were generated, queueing them for formatting
+
+        Args:
+            question (QuestionData): the question data
+        """
+        self.mark_changed(question.id)
+        if self.format_queue is not None:
+            self.format_queue.add_question(question)
+
+    def flush(self) -> bool:
+        """Format the generated files, save the database, update the README and prune the
+        format cache if any question changed
+
+        Returns:
+            bool: whether there was anything to flush
+        """
+        if self.format_queue is not None:
+            self.format_queue.flush()
+        if not self.changed_ids:
+            return False
+        self.qdb.save()
+        question_list = self.qdb.get_questions_sorted_by_creation_time()
+        self.readme_handler.build_readme(question_list)
+        if self.format_cache is not None:
+            self.format_cache.prune(question_list)
+        self.changed_ids.clear()
+        return True
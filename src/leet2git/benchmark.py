@@ -0,0 +1,198 @@
+"""
+Benchmarks the generated Python solutions locally and keeps their history
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import gc
+import hashlib
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from leet2git.state_store import RunHistory, RunHistoryStore, StoredRun
+
+BENCHMARKS_DIR_NAME = "benchmarks"
+BENCHMARK_HISTORY_VERSION = 1
+# runs kept for each question
+MAX_STORED_RUNS = 50
+# a median this much slower than the previous run is reported as a regression
+REGRESSION_THRESHOLD = 0.1
+
+
+@dataclass
+class BenchmarkStats:
+    """Timings of repeated calls, in seconds, and the peak memory of one call, in bytes"""
+
+    min: float
+    median: float
+    p95: float
+    peak_memory: int
+
+
+class BenchmarkRun(StoredRun):
+    """A stored benchmark of a question"""
+
+    repeat: int = 0
+    min: float = 0.0
+    median: float = 0.0
+    p95: float = 0.0
+    peak_memory: int = 0
+
+
+class BenchmarkHistory(RunHistory[BenchmarkRun]):
+    """Versioned persisted benchmark runs of a question"""
+
+    version: int = BENCHMARK_HISTORY_VERSION
+
+
+def measure(
+    prepare: Callable[[], Callable[[], object]],
+    repeat: int,
+    warmup: int,
+    trace_memory: bool = True,
+) -> tuple[list[float], int]:
+    """Time repeated calls, each one prepared beforehand so its setup is not timed
+
+    The garbage collector is disabled while timing, as in timeit. The peak memory is
+    measured with tracemalloc in one more call, since tracing slows every allocation down.
+
+    Args:
+        prepare (Callable[[], Callable[[], object]]): builds a call on fresh arguments
+        repeat (int): how many calls to time
+        warmup (int): how many calls to run before timing
+        trace_memory (bool, optional): measure the peak memory. Defaults to True.
+
+    Returns:
+        Tuple[List[float], int]: the duration of each call in seconds and the peak memory
+            allocated by one call in bytes, or 0 if it was not measured
+    """
+    for _ in range(warmup):
+        prepare()()
+
+    timings: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            call = prepare()
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if not trace_memory:
+        return timings, 0
+
+    call = prepare()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        call()
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return timings, max(peak_memory, 0)
+
+
+def summarize(timings: Sequence[float], peak_memory: int) -> BenchmarkStats:
+    """Compute the statistics of the call durations
+
+    Args:
+        timings (Sequence[float]): the duration of each call in seconds
+        peak_memory (int): the peak memory of one call in bytes
+
+    Returns:
+        BenchmarkStats: the minimum, median and 95th percentile durations
+    """
+    ordered = sorted(timings)
+    # nearest-rank percentile
+    p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+    return BenchmarkStats(ordered[0], statistics.median(ordered), p95, peak_memory)
+
+
+def benchmark_inputs(
+    make_call: Callable[[list[object]], Callable[[], object]],
+    inputs: Sequence[list[object]],
+    repeat: int,
+    warmup: int,
+) -> tuple[list[BenchmarkStats], BenchmarkStats]:
+    """Benchmark a solution on each input
+
+    Args:
+        make_call (Callable[[List[object]], Callable[[], object]]): builds a call of the
+            solution on fresh copies of an input
+        inputs (Sequence[List[object]]): the parsed inputs
+        repeat (int): how many calls to time for each input
+        warmup (int): how many calls to run for each input before timing
+
+    Returns:
+        Tuple[List[BenchmarkStats], BenchmarkStats]: the statistics of each input, and of
+            the total time of one call on every input
+    """
+    input_stats: list[BenchmarkStats] = []
+    totals = [0.0] * repeat
+    for arguments in inputs:
+        timings, peak_memory = measure(lambda arguments=arguments: make_call(arguments), repeat, warmup)
+        input_stats.append(summarize(timings, peak_memory))
+        totals = [total + timing for total, timing in zip(totals, timings, strict=True)]
+    peak_memory = max((stats.peak_memory for stats in input_stats), default=0)
+    return input_stats, summarize(totals, peak_memory)
+
+
+def hash_inputs(inputs: Sequence[object]) -> str:
+    """Return the hash identifying a set of benchmark inputs
+
+    Args:
+        inputs (Sequence[object]): the parsed inputs
+
+    Returns:
+        str: the hexadecimal digest
+    """
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("UTF8")).hexdigest()
+
+
+class BenchmarkStore(RunHistoryStore[BenchmarkRun]):
+    """Stores the benchmark runs of each question in the local state directory"""
+
+    dir_name = BENCHMARKS_DIR_NAME
+    state_type = BenchmarkHistory
+    max_runs = MAX_STORED_RUNS
+
+
+def relative_change(current: float, previous: float) -> float:
+    """Return how much slower (positive) or faster (negative) a timing got
+
+    Args:
+        current (float): the new timing
+        previous (float): the stored timing
+
+    Returns:
+        float: the change as a fraction of the stored timing
+    """
+    return current / previous - 1 if previous > 0 else 0.0
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration with a unit that keeps it readable
+
+    Args:
+        seconds (float): the duration
+
+    Returns:
+        str: the duration in s, ms or us
+    """
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
@@ -28,7 +28,7 @@ class _QuestionMap(Protocol):
 
     def set_id_title_map(self, id_title_map: IdTitleMap, /) -> None: ...
 
-    def save(self) -> None: ...
+    def save_catalog(self) -> None: ...
 
     def get_id_from_title(self, slug: str, /) -> int | None: ...
 
@@ -45,6 +45,10 @@ class _QuestionSink(Protocol):
     def add_question(self, question: QuestionData, /) -> None: ...
 
 
+class _GeneratedSink(Protocol):
+    def add_generated(self, question: QuestionData, /) -> None: ...
+
+
 def mgr_init() -> None:
     """initializer for SyncManager"""
     signal.signal(signal.SIGINT, signal.SIG_IGN)
@@ -88,7 +92,7 @@ def get_question_id(
     """
     if not qdb.check_if_id_is_known(title_slug):
         qdb.set_id_title_map(lc.get_id_title_map())
-        qdb.save()
+        qdb.save_catalog()
     return qdb.get_id_from_title(title_slug)
 
 
@@ -96,6 +100,7 @@ def wait_to_finish_download(
     jobs: Iterable[_Joinable],
     ret_dict: Mapping[object, QuestionData],
     qdb: _QuestionSink,
+    session: _GeneratedSink | None = None,
 ) -> int:
     """Wait until every subprocess finishes
 
@@ -103,6 +108,7 @@ def wait_to_finish_download(
         jobs (List[Process]): a list of subprocesses
         ret_dict (Dict[Any, Any]): the shared memory used to communicate with the subprocesses
         qdb (QuestionDB): the questionDB
+        session (BatchSession, optional): the session that records the generated files
 
     Returns:
         int: how may questions were imported in this batch
@@ -113,6 +119,8 @@ def wait_to_finish_download(
 
     for data in ret_dict.values():
         qdb.add_question(data)
+        if session is not None:
+            session.add_generated(data)
         imported_cnt += 1
 
     return imported_cnt
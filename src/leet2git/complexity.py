@@ -0,0 +1,228 @@
+"""
+Estimates the time complexity of the generated Python solutions from their timings
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from leet2git.benchmark import measure
+
+# growth models, from the slowest growing to the fastest growing
+MODELS: tuple[tuple[str, Callable[[float], float]], ...] = (
+    ("O(1)", lambda n: 0.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n^2)", lambda n: n * n),
+    ("O(2^n)", lambda n: math.pow(2, n)),
+)
+# complexities that usually exceed the LeetCode time limit on the largest inputs
+SLOW_COMPLEXITIES = ("O(n^2)", "O(2^n)")
+# a simpler model is kept when its error is at most this much above the best error
+SIMPLER_MODEL_TOLERANCE = 0.25
+# a fit whose time grows less than this fraction over the measured sizes is constant
+FLAT_GROWTH = 0.25
+MIN_SIZES = 4
+# larger growth values would overflow the least squares sums
+_MAX_GROWTH_VALUE = 1e100
+
+
+class ComplexityError(Exception):
+    """Raised when the complexity cannot be estimated"""
+
+
+@dataclass
+class ModelFit:
+    """The least squares fit of the timings to time = intercept + coefficient * f(n)"""
+
+    name: str
+    function: Callable[[float], float]
+    intercept: float
+    coefficient: float
+    residual: float
+    r_squared: float
+
+    def predict(self, size: int) -> float:
+        """Return the time the model predicts for an input size
+
+        Args:
+            size (int): the input size
+
+        Returns:
+            float: the predicted time in seconds, or infinity if it overflows
+        """
+        try:
+            return self.intercept + self.coefficient * self.function(max(size, 1))
+        except OverflowError:
+            return math.inf if self.coefficient else self.intercept
+
+
+@dataclass
+class ComplexityEstimate:
+    """The fits of every model, the chosen one first"""
+
+    fits: list[ModelFit]
+    # how much smaller the error of the chosen model is than the error of the next one
+    confidence: float
+
+    @property
+    def best(self) -> ModelFit:
+        """The chosen model
+
+        Returns:
+            ModelFit: the fit of the chosen model
+        """
+        return self.fits[0]
+
+
+def input_size(arguments: Sequence[object]) -> int:
+    """Return the size n of an input
+
+    The size is the number of list elements and string characters of the arguments, e.g.
+    m * n for a grid. Inputs without lists or strings, e.g. climbStairs(n), use their
+    largest integer.
+
+    Args:
+        arguments (Sequence[object]): the parsed arguments
+
+    Returns:
+        int: the input size
+    """
+    elements = sum(_count_elements(argument) for argument in arguments)
+    if elements:
+        return elements
+    return max((abs(argument) for argument in arguments if isinstance(argument, int)), default=0)
+
+
+def _count_elements(value: object) -> int:
+    """Return the number of list elements and characters in a value, 0 for scalars."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, list):
+        return sum(_count_elements(item) if isinstance(item, (list, str)) else 1 for item in value)
+    return 0
+
+
+def measure_growth(
+    make_call: Callable[[list[object]], Callable[[], object]],
+    generate: Callable[[float], list[object]],
+    steps: int,
+    repeat: int,
+    time_limit: float,
+) -> tuple[list[tuple[int, float]], bool]:
+    """Time a solution on inputs that double in size up to the largest allowed input
+
+    Args:
+        make_call (Callable[[List[object]], Callable[[], object]]): builds a call of the
+            solution on fresh copies of an input
+        generate (Callable[[float], List[object]]): generates the arguments of an input
+            scaled to a fraction of the largest allowed sizes
+        steps (int): how many sizes to try
+        repeat (int): how many calls to time for each size, the fastest one is kept
+        time_limit (float): stop growing the inputs once a call takes this many seconds
+
+    Returns:
+        Tuple[List[Tuple[int, float]], bool]: the size and time of each input, and whether
+            it stopped before the largest input because of the time limit
+    """
+    points: list[tuple[int, float]] = []
+    for step in range(steps):
+        arguments = generate(2.0 ** (step - steps + 1))
+        size = input_size(arguments)
+        if points and size <= points[-1][0]:
+            continue
+        timings, _ = measure(
+            lambda arguments=arguments: make_call(arguments), repeat, 1, trace_memory=False
+        )
+        points.append((size, min(timings)))
+        if points[-1][1] > time_limit and step < steps - 1:
+            return points, True
+    return points, False
+
+
+def fit_model(
+    name: str, function: Callable[[float], float], sizes: Sequence[int], timings: Sequence[float]
+) -> ModelFit | None:
+    """Fit the timings to one growth model with least squares
+
+    Args:
+        name (str): the model name
+        function (Callable[[float], float]): the growth function f(n)
+        sizes (Sequence[int]): the input sizes
+        timings (Sequence[float]): the time of each size in seconds
+
+    Returns:
+        ModelFit | None: the fit, or None if the growth function overflows on the sizes
+    """
+    try:
+        values = [function(max(size, 1)) for size in sizes]
+    except OverflowError:
+        return None
+    if not all(value <= _MAX_GROWTH_VALUE for value in values):
+        return None
+
+    mean_value = sum(values) / len(values)
+    mean_timing = sum(timings) / len(timings)
+    spread = sum((value - mean_value) ** 2 for value in values)
+    covariance = sum(
+        (value - mean_value) * (timing - mean_timing)
+        for value, timing in zip(values, timings, strict=True)
+    )
+    # a decreasing fit is no better than a constant
+    coefficient = max(covariance / spread, 0.0) if spread else 0.0
+    intercept = mean_timing - coefficient * mean_value
+    residual = sum(
+        (timing - intercept - coefficient * value) ** 2
+        for value, timing in zip(values, timings, strict=True)
+    )
+    total = sum((timing - mean_timing) ** 2 for timing in timings)
+    r_squared = 1 - residual / total if total else 1.0
+    return ModelFit(name, function, intercept, coefficient, residual, r_squared)
+
+
+def estimate_complexity(points: Sequence[tuple[int, float]]) -> ComplexityEstimate:
+    """Choose the growth model that best fits the timings
+
+    The model with the smallest error is chosen, unless a slower growing model fits almost
+    as well, since a faster growing model always fits the noise a little better. Timings
+    that barely grow over the sizes are constant whatever model fits their noise best.
+
+    Args:
+        points (Sequence[Tuple[int, float]]): the size and time of each input
+
+    Raises:
+        ComplexityError: if there are too few distinct sizes
+
+    Returns:
+        ComplexityEstimate: the fits, the chosen model first, and the confidence in it
+    """
+    if len({size for size, _ in points}) < MIN_SIZES:
+        raise ComplexityError(
+            f"At least {MIN_SIZES} different input sizes are needed to estimate the complexity."
+        )
+    sizes = [size for size, _ in points]
+    timings = [timing for _, timing in points]
+    fits = [
+        fit
+        for name, function in MODELS
+        if (fit := fit_model(name, function, sizes, timings)) is not None
+    ]
+    smallest_residual = min(fit.residual for fit in fits)
+    chosen = next(
+        fit for fit in fits if fit.residual <= smallest_residual * (1 + SIMPLER_MODEL_TOLERANCE) + 1e-30
+    )
+    smallest_size, largest_size = min(sizes), max(sizes)
+    start = chosen.predict(smallest_size)
+    growth = (chosen.predict(largest_size) - start) / start if start > 0 else math.inf
+    if growth < FLAT_GROWTH:
+        chosen = fits[0]
+        confidence = 1 - max(growth, 0.0) / FLAT_GROWTH
+    else:
+        others = [fit for fit in fits if fit is not chosen]
+        next_residual = min((fit.residual for fit in others), default=0.0)
+        confidence = 1 - chosen.residual / next_residual if next_residual else 0.0
+    others = sorted((fit for fit in fits if fit is not chosen), key=lambda fit: fit.residual)
+    return ComplexityEstimate([chosen, *others], min(max(confidence, 0.0), 1.0))
@@ -19,6 +19,7 @@ class ReadmeConfig(BaseModel):
 
     show_difficulty: bool = True
     show_category: bool = True
+    multi_page: bool = False
 
 
 class SourceCodeConfig(BaseModel):
@@ -27,6 +28,7 @@ class SourceCodeConfig(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
 
     add_description: bool = True
+    defer_formatting: bool = True
 
 
 class TestCodeConfig(BaseModel):
@@ -35,6 +37,8 @@ class TestCodeConfig(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
 
     generate_tests: bool = True
+    verify_before_submit: bool = False
+    verify_timeout: float = 60.0
 
 
 class AppConfig(BaseModel):
@@ -0,0 +1,211 @@
+"""
+Profiles the CPU time of the generated Python solutions and keeps their profiles
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import cProfile
+import glob
+import marshal
+import os
+import pstats
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from leet2git.state_store import RunHistory, RunHistoryStore, StoredRun
+
+PROFILES_DIR_NAME = "profiles"
+PROFILE_EXTENSION = ".prof"
+PROFILE_HISTORY_VERSION = 1
+# profiles kept for each question
+MAX_STORED_PROFILES = 20
+SORT_KEYS = ("tottime", "cumtime")
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class FunctionStats:
+    """The time spent in one function over the profiled calls, in seconds"""
+
+    location: str
+    calls: int
+    total_time: float
+    cumulative_time: float
+
+
+class StoredProfile(StoredRun):
+    """A stored CPU profile of a question"""
+
+    repeat: int = 0
+    # path of the cProfile file, relative to the profiles directory
+    file_name: str = ""
+
+
+class ProfileHistory(RunHistory[StoredProfile]):
+    """Versioned persisted CPU profiles of a question"""
+
+    version: int = PROFILE_HISTORY_VERSION
+
+
+def profile_calls(
+    prepare_calls: Iterable[Callable[[], Callable[[], object]]], repeat: int = 1
+) -> pstats.Stats:
+    """Run calls under cProfile, preparing each one outside of the profile
+
+    Args:
+        prepare_calls (Iterable[Callable[[], Callable[[], object]]]): build a call of the
+            solution on fresh arguments, one for each input
+        repeat (int, optional): how many times to run each call. Defaults to 1.
+
+    Returns:
+        pstats.Stats: the profile stats
+    """
+    profiler = cProfile.Profile()
+    for prepare in prepare_calls:
+        for _ in range(repeat):
+            call = prepare()
+            profiler.enable()
+            try:
+                call()
+            finally:
+                profiler.disable()
+    return pstats.Stats(profiler)
+
+
+def function_stats(stats: pstats.Stats, sort_key: str = "tottime") -> list[FunctionStats]:
+    """Return the time spent in each function, slowest first
+
+    Args:
+        stats (pstats.Stats): the profile stats
+        sort_key (str, optional): "tottime" to sort by the time spent in the function
+            itself or "cumtime" to include the functions it called. Defaults to "tottime".
+
+    Returns:
+        List[FunctionStats]: the stats of each function
+    """
+    rows: list[FunctionStats] = []
+    for (file_name, line_number, function_name), (_, calls, total, cumulative, _) in _raw_stats(
+        stats
+    ).items():
+        # the profiler itself and the leet2git code calling the solution
+        if "_lsprof.Profiler" in function_name or file_name.startswith(_PACKAGE_DIR):
+            continue
+        rows.append(
+            FunctionStats(
+                function_location(file_name, line_number, function_name), calls, total, cumulative
+            )
+        )
+    if sort_key == "cumtime":
+        return sorted(rows, key=lambda row: row.cumulative_time, reverse=True)
+    return sorted(rows, key=lambda row: row.total_time, reverse=True)
+
+
+def _raw_stats(
+    stats: pstats.Stats,
+) -> dict[tuple[str, int, str], tuple[int, int, float, float, object]]:
+    """Return the table of a profile, by file, line and function name."""
+    # documented, but missing from the type stubs
+    return getattr(stats, "stats")  # noqa: B009
+
+
+def function_location(file_name: str, line_number: int, function_name: str) -> str:
+    """Return a readable name of a profiled function, stable when lines move
+
+    Args:
+        file_name (str): the file of the function, "~" for built-in functions
+        line_number (int): the line where the function is defined
+        function_name (str): the function name
+
+    Returns:
+        str: e.g. "leetcode_1_two_sum.py:3(twoSum)" or "{built-in method builtins.len}"
+    """
+    if file_name == "~":
+        return function_name
+    return f"{os.path.basename(file_name)}:{line_number}({function_name})"
+
+
+def diff_function_stats(
+    current: Iterable[FunctionStats], previous: Iterable[FunctionStats]
+) -> dict[str, float]:
+    """Return how much the time spent in each function itself changed
+
+    The functions are matched by file and name, so they still match after lines move.
+
+    Args:
+        current (Iterable[FunctionStats]): the stats of the new profile
+        previous (Iterable[FunctionStats]): the stats of the stored profile
+
+    Returns:
+        Dict[str, float]: the change in seconds, by location in the new profile
+    """
+    previous_times: dict[str, float] = {}
+    for row in previous:
+        key = _stable_key(row.location)
+        previous_times[key] = previous_times.get(key, 0.0) + row.total_time
+    return {
+        row.location: row.total_time - previous_times.get(_stable_key(row.location), 0.0)
+        for row in current
+    }
+
+
+def _stable_key(location: str) -> str:
+    """Remove the line number from a function location."""
+    file_and_line, separator, function_name = location.partition("(")
+    if not separator:
+        return location
+    return f"{file_and_line.rsplit(':', 1)[0]}({function_name}"
+
+
+class ProfileStore(RunHistoryStore[StoredProfile]):
+    """Stores the CPU profiles of each question in the local state directory
+
+    The profiles use the cProfile format, so they can also be opened with pstats or
+    tools such as snakeviz. The history of each question records the inputs and the
+    repeat count of every profile, as only profiles of the same calls can be compared.
+    """
+
+    dir_name = PROFILES_DIR_NAME
+    state_type = ProfileHistory
+    max_runs = MAX_STORED_PROFILES
+
+    def previous_profile(self, question_id: int, inputs_hash: str, repeat: int) -> str | None:
+        """Return the path of the last profile of a question on the same calls
+
+        Args:
+            question_id (int): the question id
+            inputs_hash (str): the hash of the inputs
+            repeat (int): the profiled calls for each input
+
+        Returns:
+            str | None: the path, or None if there is no comparable profile
+        """
+        for run in reversed(self.load(question_id).runs):
+            file_path = os.path.join(self.store_dir, run.file_name)
+            if run.inputs_hash == inputs_hash and run.repeat == repeat and os.path.exists(file_path):
+                return file_path
+        return None
+
+    def add_profile(self, question_id: int, stats: pstats.Stats, run: StoredProfile) -> str:
+        """Store a profile, dropping the oldest ones beyond the limit
+
+        Args:
+            question_id (int): the question id
+            stats (pstats.Stats): the profile stats
+            run (StoredProfile): what was profiled, without the file name
+
+        Returns:
+            str: the path of the stored profile
+        """
+        file_name = os.path.join(str(question_id), f"{time.time_ns()}{PROFILE_EXTENSION}")
+        file_path = self._write(file_name, marshal.dumps(_raw_stats(stats)))
+        self.add_run(question_id, run.model_copy(update={"file_name": file_name}))
+        kept = {
+            os.path.join(self.store_dir, stored.file_name) for stored in self.load(question_id).runs
+        }
+        for old_profile in glob.glob(
+            os.path.join(self.store_dir, str(question_id), f"*{PROFILE_EXTENSION}")
+        ):
+            if old_profile not in kept:
+                os.remove(old_profile)
+        return file_path
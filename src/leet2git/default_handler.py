@@ -46,11 +46,7 @@ class DefaultHandler(FileHandler):
         )
         lines.append(code)
         file_path = self.question_data.file_path + extension
-        full_path = os.path.join(self.config.source_path, file_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
-        with open(full_path, "w", encoding="UTF8") as f:
-            f.writelines(lines)
+        self._write_generated_file(file_path, "".join(lines))
 
         return Path(file_path)
 
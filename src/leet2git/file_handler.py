@@ -4,18 +4,20 @@ Authors:
     - Yuri Rocha (yurirocha15@gmail.com)
 """
 
+import hashlib
 import os
 import signal
 import subprocess
 from abc import ABC, abstractmethod
-from collections.abc import MutableMapping
+from collections.abc import Callable, MutableMapping
 from pathlib import Path
 from typing import Protocol
 
 import click
 
 from leet2git.config_manager import AppConfig
-from leet2git.question_db import QuestionData
+from leet2git.file_lock import atomic_write
+from leet2git.question_db import GeneratedFile, QuestionData
 from leet2git.test_harness import get_local_test_limitation
 
 LANGUAGE_CONVERSIONS: dict[str, dict[str, str]] = {
@@ -55,6 +57,10 @@ class FileHandler(ABC):
     """Abstract base class for file handlers."""
 
     languages: list[str] = []
+    # leave the formatting to a FormatQueue that runs once for many files
+    defer_formatting: bool = False
+    # replace generated files even if they were edited since they were generated
+    overwrite_local_changes: bool = False
 
     def check_if_exists(self, language: str) -> bool:
         """Check if there is a handler for a given language
@@ -110,6 +116,62 @@ class FileHandler(ABC):
         """Remove any source entrypoint that targets a failed local test generation."""
         return None
 
+    def _write_generated_file(
+        self,
+        file_path: str,
+        content: str,
+        format_content: Callable[[str, str], str] | None = None,
+    ) -> bool:
+        """Write a generated file, unless it already has the generated content
+
+        The hash of the content and the size and modification time of the written file are
+        recorded in question_data.generated_files. If the file still matches its record and
+        the content did not change, the file is neither read, formatted nor written. Otherwise
+        the file is read and only replaced if its content is different. A recorded file that
+        was edited since it was generated is kept, unless overwrite_local_changes is set.
+
+        Args:
+            file_path (str): the file path, relative to the source repository
+            content (str): the generated content
+            format_content (Callable[[str, str], str], optional): formats the content before
+                it is written, given the content and the full file path. Defaults to None.
+
+        Returns:
+            bool: whether the file was written
+        """
+        full_path = os.path.join(self.config.source_path, file_path)
+        content_hash = hashlib.sha256(content.encode("UTF8")).hexdigest()
+        record = self.question_data.generated_files.get(file_path)
+        try:
+            stat: os.stat_result | None = os.stat(full_path)
+        except OSError:
+            stat = None
+        is_untouched = record is not None and stat is not None and record.matches(stat)
+        if is_untouched and record is not None and record.content_hash == content_hash:
+            return False
+        has_local_changes = record is not None and stat is not None and not is_untouched
+        if has_local_changes and not self.overwrite_local_changes:
+            click.secho(f"Keeping the local changes to {file_path}", fg="yellow")
+            return False
+
+        if format_content is not None:
+            content = format_content(content, full_path)
+        try:
+            with open(full_path, encoding="UTF8", newline="") as f:
+                written = f.read() != content
+        except (OSError, UnicodeDecodeError):
+            written = True
+        if written:
+            if has_local_changes:
+                click.secho(f"Overwriting the local changes to {file_path}", fg="yellow")
+            atomic_write(full_path, content)
+            stat = os.stat(full_path)
+        if stat is not None:
+            self.question_data.generated_files[file_path] = GeneratedFile(
+                content_hash=content_hash, mtime_ns=stat.st_mtime_ns, size=stat.st_size
+            )
+        return written
+
     def _build_source_header(self) -> tuple[str, str, list[str]]:
         """Build the source file header block.
 
@@ -170,6 +232,9 @@ def generate_files(
     timestamp: float,
     config: AppConfig,
     code: str = "",
+    defer_formatting: bool = False,
+    previous: QuestionData | None = None,
+    overwrite_local_changes: bool = False,
 ) -> None:
     """Auxiliar function to generate the question files
 
@@ -181,6 +246,13 @@ def generate_files(
          timestamp (float): the time the question was generated
          config (AppConfig): the user config
          code (Optional[str], optional): the question solution. Defaults to "".
+         defer_formatting (bool, optional): skip formatting the files, so a FormatQueue can
+            format them later. Defaults to False.
+         previous (Optional[QuestionData], optional): the stored data of a question that is
+            generated again. Its files edited since they were generated are kept.
+            Defaults to None.
+         overwrite_local_changes (bool, optional): replace the edited files of a question
+            that is generated again. Defaults to False.
     """
     previous_signal_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
     try:
@@ -192,11 +264,15 @@ def generate_files(
 
         data.language = config.language
         data.creation_time = timestamp
+        if previous is not None:
+            data.generated_files = dict(previous.generated_files)
         try:
             file_handler = create_file_handler(data, config)
         except Exception as error:
             click.secho(f"Error: Could not prepare import for {qid}: {error}", fg="red")
             return
+        file_handler.defer_formatting = defer_formatting
+        file_handler.overwrite_local_changes = overwrite_local_changes
 
         test_limitation = get_local_test_limitation(data)
         if config.test_code.generate_tests and not test_limitation:
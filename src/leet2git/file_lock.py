@@ -0,0 +1,127 @@
+"""
+Inter-process file locking and atomic file replacement
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import errno
+import os
+import stat
+import sys
+import tempfile
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# one thread at a time holds the lock of a path inside the process, as flock and msvcrt
+# locks are only exclusive between processes or file descriptors
+_thread_locks: dict[str, threading.RLock] = {}
+_thread_locks_guard = threading.Lock()
+# how many times the owning thread entered the lock of a path
+_held_locks: dict[str, int] = {}
+# the umask can only be read by setting it, so it is read once on import
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+@contextmanager
+def file_lock(lock_path: str) -> Generator[None]:
+    """Hold an exclusive inter-process lock while the context is active.
+
+    The lock is reentrant for the thread holding it, so a locked section can call other
+    functions that lock the same path. Other threads of the process wait for it, as other
+    processes do.
+
+    Args:
+        lock_path (str): the path to the lock file. It is created if needed.
+    """
+    key = os.path.abspath(lock_path)
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.RLock())
+    with thread_lock:
+        if _held_locks.get(key):
+            _held_locks[key] += 1
+            try:
+                yield
+            finally:
+                _held_locks[key] -= 1
+            return
+
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        with open(key, "a+b") as lock_file:
+            _acquire(lock_file.fileno())
+            _held_locks[key] = 1
+            try:
+                yield
+            finally:
+                _held_locks.pop(key, None)
+                _release(lock_file.fileno())
+
+
+def atomic_write(file_path: str, content: str | bytes) -> None:
+    """Replace a file in a single step, so readers never see a partial write.
+
+    The file keeps its permission bits. A new file gets the default ones of the umask,
+    instead of the owner-only bits of the temporary file.
+
+    Args:
+        file_path (str): the path to the file
+        content (str | bytes): the new file content, written as UTF8 text or raw bytes
+    """
+    mode = _file_mode(file_path)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(file_path))
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+        else:
+            with os.fdopen(fd, "w", encoding="UTF8", newline="") as f:
+                f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _file_mode(file_path: str) -> int:
+    """Return the permission bits of a file, or the default ones if it does not exist."""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _acquire(fileno: int) -> None:
+    """Block until the exclusive lock is acquired."""
+    if sys.platform == "win32":
+        os.lseek(fileno, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fileno, msvcrt.LK_LOCK, 1)
+                return
+            except OSError as e:
+                # LK_LOCK gives up after ten seconds, keep waiting like flock does
+                if e.errno != errno.EDEADLOCK:
+                    raise
+    else:
+        fcntl.flock(fileno, fcntl.LOCK_EX)
+
+
+def _release(fileno: int) -> None:
+    """Release an exclusive lock."""
+    if sys.platform == "win32":
+        os.lseek(fileno, 0, os.SEEK_SET)
+        msvcrt.locking(fileno, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fileno, fcntl.LOCK_UN)
@@ -0,0 +1,204 @@
+"""
+Caches the output of the import fixer and the formatter by content hash
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import functools
+import hashlib
+import os
+import subprocess
+import sys
+from collections.abc import Iterable
+from importlib.metadata import PackageNotFoundError, version
+
+from leet2git.file_lock import atomic_write
+from leet2git.question_db import DB_DIR_NAME, QuestionData, local_state_dir
+
+FORMAT_CACHE_DIR_NAME = "format_cache"
+AUTOIMPORT = "autoimport"
+RUFF = "ruff"
+RUFF_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+# the cache is pruned once it holds this many entries more than twice the tracked files
+PRUNE_SLACK = 100
+
+
+class FormatCache:
+    """Stores the fixed or formatted version of each code seen before
+
+    Entries are keyed by the hash of the tool fingerprint (its version, the selected rules
+    and the Ruff configuration files that apply to the repository) and the hash of the
+    input code, so upgrading a tool or changing its configuration never returns stale
+    output.
+    """
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        self.cache_dir = os.path.join(source_path, DB_DIR_NAME, FORMAT_CACHE_DIR_NAME)
+        self._fingerprints: dict[str, str] = {}
+
+    def get(self, tool: str, source: str) -> str | None:
+        """Return the cached output of a tool
+
+        Args:
+            tool (str): the tool name, AUTOIMPORT or RUFF
+            source (str): the code given to the tool
+
+        Returns:
+            str | None: the output of the tool, or None if it is not cached
+        """
+        try:
+            with open(self._entry_path(tool, source), encoding="UTF8", newline="") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, tool: str, source: str, output: str) -> None:
+        """Store the output of a tool
+
+        Args:
+            tool (str): the tool name, AUTOIMPORT or RUFF
+            source (str): the code given to the tool
+            output (str): the output of the tool
+        """
+        try:
+            local_state_dir(self.source_path, FORMAT_CACHE_DIR_NAME)
+            atomic_write(self._entry_path(tool, source), output)
+        except OSError:
+            # the cache is only an optimization
+            pass
+
+    def prune(self, questions: Iterable[QuestionData]) -> int:
+        """Remove the entries no tracked file can use, once the cache grew large
+
+        An entry is kept if it was made with the current tool fingerprint and its input is
+        the generated content of a tracked file or the current content of that file.
+        Reading the tracked files is only worth it when the cache holds many more entries
+        than there are files, so nothing is done before that.
+
+        Args:
+            questions (Iterable[QuestionData]): the questions whose generated files are tracked
+
+        Returns:
+            int: how many entries were removed
+        """
+        try:
+            entries = [name for name in os.listdir(self.cache_dir) if name.endswith(".txt")]
+        except OSError:
+            return 0
+        generated_files = [
+            (file_path, record)
+            for question in questions
+            for file_path, record in question.generated_files.items()
+        ]
+        if len(entries) <= 2 * len(generated_files) + PRUNE_SLACK:
+            return 0
+
+        live_hashes = {record.content_hash for _, record in generated_files}
+        for file_path, _ in generated_files:
+            try:
+                with open(os.path.join(self.source_path, file_path), "rb") as f:
+                    live_hashes.add(hashlib.sha256(f.read()).hexdigest())
+            except OSError:
+                continue
+        prefixes = {tool: f"{tool}-{self._fingerprint_digest(tool)}-" for tool in (AUTOIMPORT, RUFF)}
+        removed = 0
+        for name in entries:
+            tool = name.split("-", 1)[0]
+            prefix = prefixes.get(tool)
+            if prefix is not None and name.startswith(prefix) and name[len(prefix) : -4] in live_hashes:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def fingerprint(self, tool: str) -> str:
+        """Return the description of a tool that is part of every cache key
+
+        Ruff looks for its configuration in the directory of each file and in its parents,
+        then in the user configuration directory, so the configuration files of the
+        repository, of its parent directories and of the user are all part of it.
+
+        Args:
+            tool (str): the tool name, AUTOIMPORT or RUFF
+
+        Returns:
+            str: the tool fingerprint
+        """
+        if tool not in self._fingerprints:
+            if tool == AUTOIMPORT:
+                self._fingerprints[tool] = f"autoimport {_package_version('autoimport')}"
+            else:
+                from leet2git.ruff_formatter import RUFF_FIX_COMMAND
+
+                config_digest = hashlib.sha256()
+                for config_path in _ruff_config_paths(self.source_path):
+                    try:
+                        with open(config_path, "rb") as f:
+                            config_digest.update(config_path.encode() + b"\0" + f.read())
+                    except OSError:
+                        continue
+                self._fingerprints[tool] = (
+                    f"{_ruff_version()} {' '.join(RUFF_FIX_COMMAND[1:])} {config_digest.hexdigest()}"
+                )
+        return self._fingerprints[tool]
+
+    def _fingerprint_digest(self, tool: str) -> str:
+        """Return the short hash of a tool fingerprint used in the entry names."""
+        return hashlib.sha256(self.fingerprint(tool).encode()).hexdigest()[:16]
+
+    def _entry_path(self, tool: str, source: str) -> str:
+        """Return the path of the cache entry of a tool input."""
+        source_hash = hashlib.sha256(source.encode("UTF8")).hexdigest()
+        return os.path.join(
+            self.cache_dir, f"{tool}-{self._fingerprint_digest(tool)}-{source_hash}.txt"
+        )
+
+
+def _ruff_config_paths(source_path: str) -> list[str]:
+    """Return the Ruff configuration files that may apply to a repository, found or not.
+
+    Generated files live in the src and tests directories, so their configuration files
+    apply too, before the ones of the repository and its parents.
+    """
+    directory = os.path.abspath(source_path)
+    directories = [os.path.join(directory, "src"), os.path.join(directory, "tests")]
+    while True:
+        directories.append(directory)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    if sys.platform == "win32":
+        user_config = os.environ.get("APPDATA", "")
+    else:
+        user_config = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    if user_config:
+        directories.append(os.path.join(user_config, "ruff"))
+    return [
+        os.path.join(directory, config_file)
+        for directory in directories
+        for config_file in RUFF_CONFIG_FILES
+    ]
+
+
+def _package_version(package: str) -> str:
+    """Return the installed version of a package, or "unknown"."""
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@functools.cache
+def _ruff_version() -> str:
+    """Return the version reported by the Ruff executable, or "unknown"."""
+    try:
+        return subprocess.run(
+            ["ruff", "--version"], capture_output=True, encoding="UTF8", check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
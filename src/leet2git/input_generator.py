@@ -0,0 +1,420 @@
+"""
+Parses the question constraints and generates large inputs that respect them
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import ast
+import json
+import random
+import re
+import string
+from dataclasses import dataclass, field
+
+from leet2git.python_analysis import analyze_python_source
+from leet2git.question_db import QuestionData
+
+# used when the constraints do not limit a length or a value
+DEFAULT_LENGTH_RANGE = (1, 1000)
+DEFAULT_VALUE_RANGE = (-(10**4), 10**4)
+DEFAULT_ALPHABET = string.ascii_lowercase
+# keeps nested inputs such as 10^5 x 10^5 grids within memory
+MAX_GENERATED_VALUES = 10**6
+
+_CONSTRAINTS_HEADER = re.compile(r"^Constraints\s*:?\s*$", re.IGNORECASE)
+_CONSTRAINTS_END = re.compile(r"^(?:Follow[\s-]*up|Note)\b", re.IGNORECASE)
+_COMPARISON = re.compile(r"\s*(<=|≤|<)\s*")
+_ALIAS = re.compile(r"^(?P<left>[\w.\[\]]+)\s*==\s*(?P<right>[\w.\[\]]+)$")
+_ALPHABET = re.compile(
+    r"^(?P<name>[\w.\[\]]+)\s+(?:consists|contains|is|are)\s+(?:either\s+)?(?:of\s+)?(?:only\s+)?"
+    r"(?P<rest>.+)$"
+)
+_QUOTED_CHARACTER = re.compile(r"'(.)'")
+_INDEX = re.compile(r"\[\s*[A-Za-z_]\w*\s*\]")
+
+
+class InputGenerationError(Exception):
+    """Raised when no input can be generated for a question"""
+
+
+@dataclass
+class Constraints:
+    """The value ranges and alphabets of the "Constraints:" block of a question
+
+    Keys are the expressions of the description without spaces and with every index
+    renamed to i, e.g. "nums.length", "nums[i]" or "grid[i][i]".
+    """
+
+    ranges: dict[str, tuple[float, float]] = field(default_factory=dict)
+    alphabets: dict[str, str] = field(default_factory=dict)
+
+
+def parse_constraints(description: list[str]) -> Constraints:
+    """Parse the "Constraints:" block of a question description
+
+    Lines such as "1 <= nums.length <= 10^5", "1 <= k <= nums.length <= 10^5",
+    "1 <= m, n <= 200", "n == nums.length" and "s consists of lowercase English letters."
+    are understood, the others are ignored.
+
+    Args:
+        description (List[str]): the description lines
+
+    Raises:
+        InputGenerationError: if a constraint gives an empty range
+
+    Returns:
+        Constraints: the parsed ranges and alphabets
+    """
+    constraints = Constraints()
+    aliases: list[tuple[str, str]] = []
+    pending: list[tuple[list[str], list[str], list[str]]] = []
+    for line in _constraint_lines(description):
+        line = line.strip().rstrip(".").strip()
+        alias = _ALIAS.match(line)
+        if alias:
+            aliases.append((_normalize(alias.group("left")), _normalize(alias.group("right"))))
+            continue
+        parts = _COMPARISON.split(line)
+        # a chain of expressions separated by operators, e.g. low, operator, names, operator, high
+        if len(parts) >= 5 and len(parts) % 2:
+            pending.extend(_chain_bounds(parts[::2], parts[1::2]))
+            continue
+        alphabet = _ALPHABET.match(line)
+        if alphabet:
+            characters = _parse_alphabet(alphabet.group("rest"))
+            if characters:
+                constraints.alphabets[_normalize(alphabet.group("name"))] = characters
+
+    # bounds such as "k <= nums.length" need the ranges of other lines and of the aliases,
+    # the farther bounds of a chain are only used once the nearest ones cannot be resolved
+    while _resolve_bounds(constraints.ranges, aliases, pending, farther=False) or _resolve_bounds(
+        constraints.ranges, aliases, pending, farther=True
+    ):
+        pass
+    return constraints
+
+
+def _chain_bounds(
+    expressions: list[str], operators: list[str]
+) -> list[tuple[list[str], list[str], list[str]]]:
+    """Return the bounds of the names of a chain such as "1 <= k <= nums.length <= 10^5"
+
+    Args:
+        expressions (List[str]): the expressions of the chain
+        operators (List[str]): the operators between them
+
+    Returns:
+        List[Tuple[List[str], List[str], List[str]]]: for each inner expression, the low
+            bounds, the names and the high bounds, nearest bound first
+    """
+    bounds: list[tuple[list[str], list[str], list[str]]] = []
+    for index in range(1, len(expressions) - 1):
+        if _evaluate(expressions[index], {}, 0) is not None:
+            continue
+        names = [_normalize(name) for name in expressions[index].split(",")]
+        lows = [
+            _offset(expressions[other], operators[other:index].count("<"))
+            for other in reversed(range(index))
+        ]
+        highs = [
+            _offset(expressions[other], -operators[index:other].count("<"))
+            for other in range(index + 1, len(expressions))
+        ]
+        bounds.append((lows, names, highs))
+    return bounds
+
+
+def _offset(expression: str, offset: int) -> str:
+    """Return an expression shifted by the given integer, for strict comparisons."""
+    if not offset:
+        return expression
+    return f"({expression}) {'+' if offset > 0 else '-'} {abs(offset)}"
+
+
+def _resolve_bounds(
+    ranges: dict[str, tuple[float, float]],
+    aliases: list[tuple[str, str]],
+    pending: list[tuple[list[str], list[str], list[str]]],
+    farther: bool,
+) -> bool:
+    """Resolve the aliases and pending bounds that only depend on known ranges
+
+    Args:
+        ranges (Dict[str, Tuple[float, float]]): the known ranges, updated in place
+        aliases (List[Tuple[str, str]]): the names that share a range
+        pending (List[Tuple[List[str], List[str], List[str]]]): the unresolved bounds,
+            the resolved ones are removed
+        farther (bool): whether a bound may be resolved from a farther expression of its
+            chain when the nearest one is still unknown
+
+    Raises:
+        InputGenerationError: if a constraint gives an empty range
+
+    Returns:
+        bool: whether anything was resolved
+    """
+    progress = False
+    for left, right in aliases:
+        for source, target in ((left, right), (right, left)):
+            if source in ranges and target not in ranges:
+                ranges[target] = ranges[source]
+                progress = True
+    for entry in list(pending):
+        lows, names, highs = entry
+        low = _first_known(lows if farther else lows[:1], ranges, 0)
+        high = _first_known(highs if farther else highs[:1], ranges, 1)
+        if low is None or high is None:
+            continue
+        if low > high:
+            raise InputGenerationError(
+                f"The constraints of {', '.join(names)} give the empty range [{low}, {high}]"
+            )
+        for name in names:
+            ranges[name] = (low, high)
+        pending.remove(entry)
+        progress = True
+    return progress
+
+
+def _first_known(
+    expressions: list[str], ranges: dict[str, tuple[float, float]], bound: int
+) -> float | None:
+    """Return the value of the first expression that can be evaluated, if any."""
+    for expression in expressions:
+        value = _evaluate(expression, ranges, bound)
+        if value is not None:
+            return value
+    return None
+
+
+def _constraint_lines(description: list[str]) -> list[str]:
+    """Return the non-empty lines of the "Constraints:" block."""
+    lines: list[str] = []
+    in_block = False
+    for line in description:
+        stripped = line.strip()
+        if _CONSTRAINTS_HEADER.match(stripped):
+            in_block = True
+        elif in_block and _CONSTRAINTS_END.match(stripped):
+            break
+        elif in_block and stripped:
+            lines.append(stripped)
+    return lines
+
+
+def _normalize(expression: str) -> str:
+    """Return the constraint key of an expression."""
+    return _INDEX.sub("[i]", re.sub(r"\s+", "", expression))
+
+
+def _parse_alphabet(text: str) -> str:
+    """Return the characters described by a "consists of" sentence."""
+    lowered = text.lower()
+    characters = "".join(_QUOTED_CHARACTER.findall(text))
+    if "lowercase" in lowered:
+        characters += string.ascii_lowercase
+    if "uppercase" in lowered:
+        characters += string.ascii_uppercase
+    if "english letters" in lowered and "lowercase" not in lowered and "uppercase" not in lowered:
+        characters += string.ascii_letters
+    if "digit" in lowered:
+        characters += string.digits
+    if "space" in lowered:
+        characters += " "
+    if "symbol" in lowered or "punctuation" in lowered:
+        characters += string.punctuation
+    return "".join(dict.fromkeys(characters))
+
+
+def _evaluate(expression: str, ranges: dict[str, tuple[float, float]], bound: int) -> float | None:
+    """Evaluate a bound such as "-10^9", "2^31 - 1", "5 * 10^4" or "nums.length"
+
+    Args:
+        expression (str): the bound
+        ranges (Dict[str, Tuple[float, float]]): the known ranges
+        bound (int): which end of the range of a referenced name to use, 0 or 1
+
+    Returns:
+        float | None: the value, or None if it depends on an unknown name
+    """
+    try:
+        tree = ast.parse(expression.replace("^", "**").replace("×", "*"), mode="eval")
+    except SyntaxError:
+        return None
+
+    def visit(node: ast.expr) -> float | None:
+        if isinstance(node, ast.Constant) and isinstance(node.value, int | float):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub | ast.UAdd):
+            operand = visit(node.operand)
+            if operand is None:
+                return None
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add | ast.Sub | ast.Mult | ast.Pow):
+            left, right = visit(node.left), visit(node.right)
+            if left is None or right is None or (isinstance(node.op, ast.Pow) and right > 64):
+                return None
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mult):
+                return left * right
+            return left**right
+        if isinstance(node, ast.Name | ast.Attribute | ast.Subscript):
+            known = ranges.get(_normalize(ast.unparse(node)))
+            return None if known is None else known[bound]
+        return None
+
+    return visit(tree.body)
+
+
+def get_parameters(question: QuestionData) -> list[tuple[str, str]]:
+    """Return the parameters of the function of a question, as found in its template
+
+    Args:
+        question (QuestionData): the question data
+
+    Raises:
+        InputGenerationError: if the function cannot be found
+
+    Returns:
+        List[Tuple[str, str]]: the name and annotation of each parameter
+    """
+    if len(question.function_name) != 1:
+        raise InputGenerationError("Inputs can only be generated for single function questions.")
+    template = question.question_template
+    def_lines = analyze_python_source(template).def_lines
+    lines: list[str] = []
+    for line_number, line in enumerate(template.splitlines(), start=1):
+        lines.append(line + "\n")
+        if line_number in def_lines:
+            lines.append("        pass\n")
+    signature = analyze_python_source("".join(lines)).signatures.get(question.function_name[0])
+    if signature is None:
+        raise InputGenerationError(f"Could not find {question.function_name[0]} in the template.")
+    return signature
+
+
+class InputGenerator:
+    """Generates worst-case size inputs of a question from its constraints
+
+    Lengths take the largest allowed value and so do non-negative integer parameters, which
+    are usually sizes or counts. Other values are drawn at random inside their ranges. The
+    inputs only depend on the seed, so a slow input can be generated again.
+
+    Example:
+        generator = InputGenerator(question, seed=1)
+        raw_input = generator.generate()  # e.g. "[5,-3,...], 17"
+    """
+
+    def __init__(self, question: QuestionData, seed: int = 0):
+        self.parameters = get_parameters(question)
+        self.constraints = parse_constraints(question.description)
+        self.random = random.Random(seed)
+
+    def generate(self, scale: float = 1.0) -> str:
+        """Generate one input in the LeetCode format
+
+        Args:
+            scale (float, optional): the fraction of the largest lengths and sizes to use,
+                for smaller inputs of the same shape. Defaults to 1.0.
+
+        Raises:
+            InputGenerationError: if a parameter type is not supported
+
+        Returns:
+            str: the JSON values of the parameters separated by commas
+        """
+        return ", ".join(
+            json.dumps(self._generate_value(name, annotation, scale), separators=(",", ":"))
+            for name, annotation in self.parameters
+        )
+
+    def _generate_value(self, name: str, annotation: str, scale: float) -> object:
+        """Generate the value of one parameter."""
+        value_type = _parse_annotation(annotation)
+        if value_type == ("int",):
+            return self._generate_scalar(name, scale)
+        if value_type == ("float",):
+            low, high = self.constraints.ranges.get(name, DEFAULT_VALUE_RANGE)
+            return self.random.uniform(low, high)
+        if value_type == ("bool",):
+            return self.random.random() < 0.5
+        if value_type == ("str",):
+            return self._generate_string(name, self._length(name, scale))
+        if value_type in (("list", "int"), ("list", "float"), ("list", "str"), ("list", "bool")):
+            return [
+                self._generate_element(f"{name}[i]", value_type[1], scale)
+                for _ in range(self._length(name, scale))
+            ]
+        if len(value_type) == 3 and value_type[:2] == ("list", "list"):
+            rows = self._length(name, scale)
+            columns = self._length(f"{name}[i]", scale)
+            if rows * columns > MAX_GENERATED_VALUES:
+                shrink = (MAX_GENERATED_VALUES / (rows * columns)) ** 0.5
+                rows, columns = max(int(rows * shrink), 1), max(int(columns * shrink), 1)
+            return [
+                [self._generate_element(f"{name}[i][i]", value_type[2], scale) for _ in range(columns)]
+                for _ in range(rows)
+            ]
+        raise InputGenerationError(f"Cannot generate the {annotation or 'untyped'} parameter {name}.")
+
+    def _generate_element(self, key: str, element_type: str, scale: float) -> object:
+        """Generate an element of a list."""
+        if element_type == "str":
+            # the strings of a grid are usually single characters
+            default_length = (1, 1) if key.endswith("[i][i]") else DEFAULT_LENGTH_RANGE
+            return self._generate_string(key, self._length(key, scale, default_length))
+        if element_type == "bool":
+            return self.random.random() < 0.5
+        low, high = self.constraints.ranges.get(key, DEFAULT_VALUE_RANGE)
+        if element_type == "float":
+            return self.random.uniform(low, high)
+        return self.random.randint(int(low), int(high))
+
+    def _generate_scalar(self, name: str, scale: float) -> int:
+        """Generate an integer parameter, the largest allowed one if it cannot be negative."""
+        low, high = self.constraints.ranges.get(name, DEFAULT_VALUE_RANGE)
+        if low >= 0:
+            return int(max(low, round(high * scale)))
+        return self.random.randint(int(low), int(high))
+
+    def _generate_string(self, key: str, length: int) -> str:
+        """Generate a string from the alphabet of its constraints."""
+        base_name = key.split("[", 1)[0]
+        alphabet = (
+            self.constraints.alphabets.get(key)
+            or self.constraints.alphabets.get(f"{key}[i]")
+            or self.constraints.alphabets.get(base_name)
+            or DEFAULT_ALPHABET
+        )
+        return "".join(self.random.choices(alphabet, k=length))
+
+    def _length(
+        self,
+        name: str,
+        scale: float,
+        default_range: tuple[float, float] = DEFAULT_LENGTH_RANGE,
+    ) -> int:
+        """Return the scaled largest length of a list or string."""
+        low, high = self.constraints.ranges.get(f"{name}.length", default_range)
+        return int(max(low, round(high * scale), 0))
+
+
+def _parse_annotation(annotation: str) -> tuple[str, ...]:
+    """Return the nesting of a type annotation, e.g. ("list", "list", "int") for
+    List[List[int]], or an empty tuple for unsupported types."""
+    try:
+        node: ast.expr = ast.parse(annotation, mode="eval").body
+    except SyntaxError:
+        return ()
+    nesting: list[str] = []
+    while isinstance(node, ast.Subscript):
+        if not isinstance(node.value, ast.Name) or node.value.id not in ("List", "list"):
+            return ()
+        nesting.append("list")
+        node = node.slice
+    if not isinstance(node, ast.Name) or node.id not in ("int", "float", "str", "bool"):
+        return ()
+    return (*nesting, node.id)
@@ -5,27 +5,90 @@ Authors:
 """
 
 import glob
+import hashlib
+import importlib.util
+import json
 import os
+import pstats
+import sys
 import time
-from collections.abc import Mapping
+from collections.abc import Callable, Generator, Iterable, Mapping
+from contextlib import contextmanager
 from multiprocessing import Process
 from multiprocessing.managers import SyncManager
+from types import ModuleType
 
 import click
 from click.core import Context
 from click.exceptions import Abort
 
+from leet2git.batch_session import BatchSession
+from leet2git.benchmark import (
+    REGRESSION_THRESHOLD,
+    BenchmarkRun,
+    BenchmarkStats,
+    BenchmarkStore,
+    benchmark_inputs,
+    format_duration,
+    hash_inputs,
+    relative_change,
+)
 from leet2git.cli_helpers import (
     get_question_id,
     mgr_init,
     reset_config,
     wait_to_finish_download,
 )
-from leet2git.config_manager import ConfigManager, ConfigOverrides
+from leet2git.complexity import (
+    SLOW_COMPLEXITIES,
+    ComplexityError,
+    estimate_complexity,
+    input_size,
+    measure_growth,
+)
+from leet2git.config_manager import AppConfig, ConfigManager, ConfigOverrides
+from leet2git.cpu_profile import (
+    SORT_KEYS,
+    ProfileStore,
+    StoredProfile,
+    diff_function_stats,
+    function_stats,
+    profile_calls,
+)
 from leet2git.file_handler import create_file_handler, generate_files
-from leet2git.leetcode_client import LeetcodeAPIError, LeetcodeAuthError, LeetcodeClient
-from leet2git.question_db import QuestionData, QuestionDB
+from leet2git.format_cache import FormatCache
+from leet2git.input_generator import InputGenerationError, InputGenerator
+from leet2git.leetcode_client import (
+    LeetcodeAPIError,
+    LeetcodeAuthError,
+    LeetcodeClient,
+    display_submission_result,
+)
+from leet2git.local_judge import DEFAULT_MEMORY_LIMIT, DEFAULT_TIME_LIMIT, LocalJudge
+from leet2git.local_tests import NO_TESTS, PASSED, TIMEOUT, LocalTestRunner, render_results
+from leet2git.memory_profile import (
+    MemoryProfileRun,
+    MemoryProfileStore,
+    format_size,
+    profile_memory,
+    sizes_by_line,
+)
+from leet2git.question_db import SECONDS_PER_DAY, QuestionData, QuestionDB
 from leet2git.readme_handler import ReadmeHandler
+from leet2git.ruff_formatter import FormatQueue
+from leet2git.run_cache import RunCache, run_key
+from leet2git.solution_runner import (
+    SolutionError,
+    SolutionVariant,
+    load_solution_module,
+    load_variant,
+    main_class_name,
+    normalize_output,
+    parse_input,
+    parse_inputs,
+    prepare_call,
+    same_value,
+)
 from leet2git.version import version_info
 
 # pylint: disable=broad-except
@@ -69,52 +132,61 @@ def leet2git(
 
 
 @leet2git.command()
-@click.argument("question-id", type=int)
+@click.argument("question-ids", type=int, nargs=-1)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="also read question ids from stdin, saving the database and README only once",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="generate the files of imported questions again, keeping the files edited since "
+    "they were generated",
+)
+@click.option(
+    "--overwrite",
+    is_flag=True,
+    help="with --force, also replace the generated files edited since they were generated",
+)
 @click.pass_obj
-def get(cm: ConfigManager, question_id: int) -> None:
-    """Generates all the files for a question
+def get(
+    cm: ConfigManager, question_ids: tuple[int, ...], batch: bool, force: bool, overwrite: bool
+) -> None:
+    """Generates all the files for the questions
+    \f
 
     Args:
-        question_id (int): the question question_id
+        question_ids (Tuple[int, ...]): the question ids
+        batch (bool): also read question ids from stdin
+        force (bool): generate the files of imported questions again
+        overwrite (bool): replace the generated files that were edited
     """
+    if overwrite and not force:
+        raise click.UsageError("--overwrite can only be used with --force")
+    question_ids = _collect_question_ids(question_ids, batch)
     qdb: QuestionDB = QuestionDB(cm.config)
     qdb.load()
-    if qdb.check_if_exists(question_id):
-        click.secho("Question already imported")
-        return
-
-    try:
-        lc = LeetcodeClient()
-        if not qdb.check_if_slug_is_known(question_id):
-            qdb.set_id_title_map(lc.get_id_title_map())
-            qdb.save()
-
-        # get question data
-        args: dict[int, QuestionData] = {}
-        title_slug = qdb.get_title_from_id(question_id) or ""
-        generate_files(args, question_id, title_slug, lc, time.time(), cm.config)
-    except (LeetcodeAPIError, LeetcodeAuthError) as e:
-        click.secho(str(e), fg="red")
-        return
-
-    if question_id in args:
-        # store data
-        qdb.add_question(args[question_id])
-        qdb.save()
-
-        # update readme
-        rh = ReadmeHandler(cm.config)
-        rh.build_readme(qdb.get_questions_sorted_by_creation_time())
+    with _open_session(cm.config, qdb) as session:
+        _get_questions(
+            cm.config, session, qdb, question_ids, force=force, overwrite_local_changes=overwrite
+        )
 
 
 @leet2git.command()
 @click.argument("question-id", type=int)
+@click.option(
+    "--no-verify",
+    is_flag=True,
+    help="do not run the local tests first, even if verify_before_submit is set",
+)
 @click.pass_obj
-def submit(cm: ConfigManager, question_id: int) -> None:
+def submit(cm: ConfigManager, question_id: int, no_verify: bool) -> None:
     """Submit a question to Leetcode
-
+    \f
     Args:
         question_id (int): the question question_id
+        no_verify (bool): skip the local tests
     """
     qdb: QuestionDB = QuestionDB(cm.config)
     qdb.load()
@@ -123,6 +195,8 @@ def submit(cm: ConfigManager, question_id: int) -> None:
     if not question_data:
         click.secho(f"Could not find the question with id {question_id}")
         return
+    if cm.config.test_code.verify_before_submit and not no_verify:
+        _verify_before_submit(cm.config, question_data)
 
     file_handler = create_file_handler(question_data, cm.config)
     code = file_handler.generate_submission_file()
@@ -135,14 +209,85 @@ def submit(cm: ConfigManager, question_id: int) -> None:
         click.secho(str(e), fg="red")
 
 
+def _verify_before_submit(config: AppConfig, question: QuestionData) -> None:
+    """Run the local tests of a question and abort the submission if they fail
+
+    A pass is stored with the hash of the source and test files, so submitting the same
+    code again does not run the tests again.
+
+    Args:
+        config (AppConfig): the configuration
+        question (QuestionData): the question to submit
+
+    Raises:
+        click.ClickException: if the tests fail or cannot run
+    """
+    test_file_path = os.path.join(config.source_path, question.test_file_path)
+    if not question.test_file_path or not os.path.isfile(test_file_path):
+        click.secho(f"The question {question.id} has no local tests to verify.", fg="yellow")
+        return
+    if importlib.util.find_spec("pytest") is None:
+        raise click.ClickException(
+            "pytest must be installed to verify the solution. Use --no-verify to skip it."
+        )
+
+    runner = LocalTestRunner(config.source_path, jobs=1, timeout=config.test_code.verify_timeout)
+    result = runner.verify(question)
+    if result is None:
+        click.secho("The local tests already passed on this code.", fg="green")
+    elif result.outcome == PASSED:
+        click.secho(f"The local tests passed in {result.duration:.2f}s.", fg="green")
+    elif result.outcome == NO_TESTS:
+        click.secho(f"The question {question.id} has no local tests to verify.", fg="yellow")
+    else:
+        click.echo(result.output.rstrip())
+        raise click.ClickException(
+            f"The local tests {'timed out' if result.outcome == TIMEOUT else 'failed'}, "
+            "the solution was not submitted. Use --no-verify to submit it anyway."
+        )
+
+
 @leet2git.command()
 @click.argument("question-id", type=int)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="judge a Python solution on the stored examples locally instead of on LeetCode",
+)
+@click.option(
+    "--time-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_TIME_LIMIT,
+    show_default=True,
+    help="the CPU seconds of each example when judging locally",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MEMORY_LIMIT,
+    show_default=True,
+    help="the MiB of address space of each example when judging locally",
+)
+@click.option(
+    "--force", is_flag=True, help="run on LeetCode even if the same code already ran on the same inputs"
+)
 @click.pass_obj
-def run(cm: ConfigManager, question_id: int) -> None:
-    """Run a question on Leetcode Servers
-
+def run(
+    cm: ConfigManager,
+    question_id: int,
+    local: bool,
+    time_limit: float,
+    memory_limit: int,
+    force: bool,
+) -> None:
+    """Run a question on Leetcode Servers, or locally
+    \f
     Args:
         question_id (int): the question question_id
+        local (bool): judge the solution locally
+        time_limit (float): the CPU seconds of each example when judging locally
+        memory_limit (int): the MiB of address space of each example when judging locally
+        force (bool): do not use the cached result of the same run
     """
     qdb: QuestionDB = QuestionDB(cm.config)
     qdb.load()
@@ -152,14 +297,32 @@ def run(cm: ConfigManager, question_id: int) -> None:
         click.secho(f"Could not find the question with id {question_id}")
         return
 
+    if local:
+        try:
+            result = LocalJudge(cm.config.source_path, time_limit, memory_limit).judge(question_data)
+        except SolutionError as e:
+            raise click.ClickException(str(e)) from e
+        display_submission_result(result, is_test=True, clear=False)
+        return
+
     file_handler = create_file_handler(question_data, cm.config)
     code = file_handler.generate_submission_file()
 
+    raw_inputs = question_data.to_wire_inputs()
+    run_cache = RunCache(cm.config.source_path)
+    key = run_key(cm.config.language, code, raw_inputs)
+    cached = None if force else run_cache.get(question_id, key)
+    if cached is not None:
+        display_submission_result(cached.result, is_test=True)
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(cached.timestamp))
+        click.secho(f"Cached result of the same code and inputs from {when}.", fg="yellow")
+        click.secho("Use --force to run it again.")
+        return
+
     try:
         lc = LeetcodeClient()
         title_slug = question_data.title_slug or qdb.get_title_from_id(question_id) or ""
-        raw_inputs = question_data.to_wire_inputs()
-        lc.submit_question(
+        result = lc.submit_question(
             code,
             question_data.internal_id,
             title_slug,
@@ -169,6 +332,9 @@ def run(cm: ConfigManager, question_id: int) -> None:
         )
     except (LeetcodeAPIError, LeetcodeAuthError) as e:
         click.secho(str(e), fg="red")
+        return
+    if result is not None:
+        run_cache.add(question_id, key, result)
 
 
 @leet2git.command()
@@ -185,93 +351,1020 @@ def import_all(cm: ConfigManager) -> None:
     jobs: list[Process] = []
     ret_dict: Mapping[object, QuestionData] | None = None
 
-    try:
-        lc = LeetcodeClient()
-        while has_next:
-            jobs = []
-            manager = SyncManager()
-            manager.start(mgr_init)
-            ret_dict = manager.dict()
-            submissions = lc.get_submission_list(last_key, offset)
-            for submission in submissions.submissions_dump:
-                qid = get_question_id(submission.title_slug, qdb, lc)
-                if (
-                    qid is not None
-                    and submission.status_display == "Accepted"
-                    and submission.lang == cm.config.language
-                    and not qdb.check_if_exists(qid)
-                ):
-                    # pre-store the question
-                    data = QuestionData(id=qid)
-                    qdb.add_question(data)
-                    p = Process(
-                        target=generate_files,
-                        args=(
-                            ret_dict,
-                            qid,
-                            submission.title_slug,
-                            lc,
-                            submission.timestamp,
-                            cm.config,
-                            submission.code,
-                        ),
-                    )
-                    jobs.append(p)
-                    p.start()
-
-            imported_cnt += wait_to_finish_download(jobs, ret_dict, qdb)
-
-            has_next = submissions.has_next
-            last_key = submissions.last_key
-            offset += 20
-            qdb.save()
-            if has_next:
-                time.sleep(1)
-    except KeyboardInterrupt:
-        click.secho("Stopping the process...")
-        if ret_dict is not None:
-            imported_cnt += wait_to_finish_download(jobs, ret_dict, qdb)
-    except (LeetcodeAPIError, LeetcodeAuthError, ValueError) as e:
-        click.secho(str(e), fg="red")
-    finally:
-        if manager is not None:
-            manager.shutdown()
+    # the database is saved and the readme updated once, also if the import stops midway
+    with _open_session(cm.config, qdb) as session:
+        try:
+            lc = LeetcodeClient()
+            while has_next:
+                jobs = []
+                manager = SyncManager()
+                manager.start(mgr_init)
+                ret_dict = manager.dict()
+                submissions = lc.get_submission_list(last_key, offset)
+                for submission in submissions.submissions_dump:
+                    qid = get_question_id(submission.title_slug, qdb, lc)
+                    if (
+                        qid is not None
+                        and submission.status_display == "Accepted"
+                        and submission.lang == cm.config.language
+                        and not qdb.check_if_exists(qid)
+                    ):
+                        # pre-store the question
+                        data = QuestionData(id=qid)
+                        qdb.add_question(data)
+                        session.mark_changed(qid)
+                        p = Process(
+                            target=generate_files,
+                            args=(
+                                ret_dict,
+                                qid,
+                                submission.title_slug,
+                                lc,
+                                submission.timestamp,
+                                cm.config,
+                                submission.code,
+                                session.format_queue is not None,
+                            ),
+                        )
+                        jobs.append(p)
+                        p.start()
+
+                imported_cnt += wait_to_finish_download(jobs, ret_dict, qdb, session)
 
-    qdb.save()
-    # update readme
-    rh = ReadmeHandler(cm.config)
-    rh.build_readme(qdb.get_questions_sorted_by_creation_time())
+                has_next = submissions.has_next
+                last_key = submissions.last_key
+                offset += 20
+                if has_next:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            click.secho("Stopping the process...")
+            if ret_dict is not None:
+                imported_cnt += wait_to_finish_download(jobs, ret_dict, qdb, session)
+        except (LeetcodeAPIError, LeetcodeAuthError, ValueError) as e:
+            click.secho(str(e), fg="red")
+        finally:
+            if manager is not None:
+                manager.shutdown()
 
     click.secho(f"In total, {imported_cnt} questions were imported!")
 
 
+@leet2git.command()
+@click.argument("question-ids", type=int, nargs=-1)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="also read question ids from stdin, saving the database and README only once",
+)
+@click.pass_obj
+def delete(cm: ConfigManager, question_ids: tuple[int, ...], batch: bool) -> None:
+    """Delete questions and their files
+    \f
+
+    Args:
+        question_ids (Tuple[int, ...]): the question ids
+        batch (bool): also read question ids from stdin
+    """
+    question_ids = _collect_question_ids(question_ids, batch)
+    qdb: QuestionDB = QuestionDB(cm.config)
+    qdb.load()
+    with _open_session(cm.config, qdb) as session:
+        _delete_questions(cm.config, session, qdb, question_ids)
+
+
+@leet2git.command()
+@click.pass_obj
+def batch(cm: ConfigManager) -> None:
+    """Run get and delete commands read from stdin, one per line (e.g. "get 1 2" or "delete 3")
+
+    The database and the README are saved only once, after every command ran.
+    """
+    operations: list[tuple[str, tuple[int, ...]]] = []
+    for line_number, line in enumerate(sys.stdin, start=1):
+        words = line.split("#", 1)[0].split()
+        if not words:
+            continue
+        if words[0] not in ("get", "delete") or len(words) < 2:
+            raise click.UsageError(f'line {line_number}: expected "get IDS..." or "delete IDS..."')
+        operations.append((words[0], _parse_question_ids(words[1:], f"line {line_number}")))
+
+    qdb: QuestionDB = QuestionDB(cm.config)
+    qdb.load()
+    with _open_session(cm.config, qdb) as session:
+        for command, question_ids in operations:
+            if command == "get":
+                _get_questions(cm.config, session, qdb, question_ids)
+            else:
+                _delete_questions(cm.config, session, qdb, question_ids)
+
+
+@leet2git.command("test")
+@click.argument("question-ids", type=int, nargs=-1)
+@click.option("--all", "test_all", is_flag=True, help="test every question with generated tests")
+@click.option(
+    "--changed",
+    is_flag=True,
+    help="test the questions whose files changed or whose tests did not pass in the last run",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="how many questions to test at the same time  [default: the CPU count]",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60.0,
+    show_default=True,
+    help="seconds before the tests of a question are stopped",
+)
+@click.option("--verbose", "-v", is_flag=True, help="print the pytest output of failed questions")
+@click.pass_obj
+def run_tests(
+    cm: ConfigManager,
+    question_ids: tuple[int, ...],
+    test_all: bool,
+    changed: bool,
+    jobs: int | None,
+    timeout: float,
+    verbose: bool,
+) -> None:
+    """Run the generated tests of questions in parallel, slowest questions first
+    \f
+    Args:
+        question_ids (Tuple[int, ...]): the question ids
+        test_all (bool): test every question
+        changed (bool): test the questions that changed since their last run
+        jobs (int, optional): how many questions to test at the same time
+        timeout (float): the timeout for the tests of each question, in seconds
+        verbose (bool): print the pytest output of failed questions
+    """
+    if not question_ids and not test_all and not changed:
+        raise click.UsageError("Pass question ids, --all or --changed.")
+    if importlib.util.find_spec("pytest") is None:
+        raise click.ClickException("pytest must be installed to run the local tests.")
+
+    qdb: QuestionDB = QuestionDB(cm.config)
+    qdb.load()
+    if question_ids:
+        questions: list[QuestionData] = []
+        for question_id in question_ids:
+            question = qdb.get_question(question_id)
+            if question is None:
+                click.secho(f"The question {question_id} could not be found!")
+            elif not question.test_file_path:
+                click.secho(f"The question {question_id} has no generated tests.", fg="yellow")
+            else:
+                questions.append(question)
+    else:
+        questions = [
+            question
+            for question in qdb.get_questions_sorted_by_creation_time()
+            if question.test_file_path
+        ]
+
+    runner = LocalTestRunner(cm.config.source_path, jobs, timeout)
+    if changed:
+        questions = runner.select_changed(questions)
+    if not questions:
+        click.secho("No questions to test.")
+        return
+
+    start = time.perf_counter()
+    results = runner.run(questions)
+    elapsed = time.perf_counter() - start
+    for line, color in render_results(results):
+        click.secho(line, fg=color)
+    failures = [result for result in results if result.outcome not in (PASSED, NO_TESTS)]
+    if verbose:
+        for result in failures:
+            click.secho(f"\n{result.question_id}. {result.title}", bold=True)
+            click.echo(result.output.rstrip())
+    click.secho(f"{len(results) - len(failures)}/{len(results)} questions passed in {elapsed:.2f}s.")
+    if failures:
+        raise click.ClickException(f"The tests of {len(failures)} questions did not pass.")
+
+
+_seed_option = click.option(
+    "--seed", type=int, default=0, show_default=True, help="the seed of the generated inputs"
+)
+
+
+def _solution_input_options(command: Callable[..., None]) -> Callable[..., None]:
+    """Add the --input, --generated and --seed options, which choose the inputs to run on
+
+    Args:
+        command (Callable[..., None]): the command function
+
+    Returns:
+        Callable[..., None]: the command function with the options
+    """
+    input_option = click.option(
+        "--input",
+        "-i",
+        "extra_inputs",
+        multiple=True,
+        help='an extra input in the LeetCode format, e.g. "[1,2,3], 4". Can be repeated.',
+    )
+    generated_option = click.option(
+        "--generated",
+        "-g",
+        type=click.IntRange(min=0),
+        default=0,
+        help="how many inputs of the largest sizes allowed by the constraints to add",
+    )
+    return input_option(generated_option(_seed_option(command)))
+
+
+@contextmanager
+def _solution_errors(solution_name: str = "The solution") -> Generator[None]:
+    """Turn the errors of loading and running a solution into readable command errors
+
+    Args:
+        solution_name (str, optional): the name of the solution in the messages.
+            Defaults to "The solution".
+
+    Raises:
+        click.ClickException: if the solution, its inputs or its analysis fail
+    """
+    try:
+        yield
+    except click.ClickException:
+        raise
+    except (SolutionError, InputGenerationError, ComplexityError) as e:
+        raise click.ClickException(str(e)) from e
+    except Exception as e:
+        raise click.ClickException(f"{solution_name} raised {type(e).__name__}: {e}") from e
+
+
+def _report_change(
+    measure: str, worse: str, better: str, current: float, previous: float, timestamp: float
+) -> None:
+    """Report how a measure changed since a stored run, and whether it regressed
+
+    Args:
+        measure (str): what is compared, e.g. "the median"
+        worse (str): how an increase is described, e.g. "slower"
+        better (str): how a decrease is described, e.g. "faster"
+        current (float): the measure of this run
+        previous (float): the measure of the stored run
+        timestamp (float): when the stored run was made
+    """
+    change = relative_change(current, previous)
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+    if change > REGRESSION_THRESHOLD:
+        click.secho(f"Regression: {measure} is {change:.1%} {worse} than on {when}.", fg="red")
+    elif change < -REGRESSION_THRESHOLD:
+        click.secho(f"{measure.capitalize()} is {-change:.1%} {better} than on {when}.", fg="green")
+    else:
+        click.secho(f"{measure.capitalize()} changed {change:+.1%} since {when}.")
+
+
 @leet2git.command()
 @click.argument("question-id", type=int)
+@_solution_input_options
+@click.option(
+    "--repeat",
+    "-r",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="timed calls for each input",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="untimed calls for each input before timing",
+)
+@click.option(
+    "--variant",
+    "-V",
+    "variants",
+    multiple=True,
+    help="another solution to compare with: a class of the solution file, a Python file, "
+    'or both, e.g. "SolutionHeap" or "drafts/two_sum.py:SolutionDP". Can be repeated.',
+)
+@click.option("--no-save", is_flag=True, help="do not store the results for later comparisons")
 @click.pass_obj
-def delete(cm: ConfigManager, question_id: int) -> None:
-    """Delete a question and its files
+def bench(
+    cm: ConfigManager,
+    question_id: int,
+    extra_inputs: tuple[str, ...],
+    repeat: int,
+    warmup: int,
+    generated: int,
+    seed: int,
+    variants: tuple[str, ...],
+    no_save: bool,
+) -> None:
+    """Benchmark a solution locally on the question examples and extra inputs
+    \f
+    Args:
+        question_id (int): the question id
+        extra_inputs (Tuple[str, ...]): more inputs in the LeetCode format
+        repeat (int): the timed calls for each input
+        warmup (int): the untimed calls for each input before timing
+        generated (int): how many worst-case size inputs to generate
+        seed (int): the seed of the generated inputs
+        variants (Tuple[str, ...]): other solutions to compare with the main one
+        no_save (bool): do not store the results
+    """
+    question, module, inputs, labels = _load_solution_inputs(
+        cm.config, question_id, extra_inputs, generated, seed
+    )
+    if variants:
+        with _solution_errors():
+            solutions = [
+                SolutionVariant(main_class_name(question), module, main_class_name(question)),
+                *(
+                    load_variant(cm.config.source_path, question, module, variant)
+                    for variant in variants
+                ),
+            ]
+        _bench_variants(question, solutions, inputs, labels, repeat, warmup)
+        return
+
+    with _solution_errors():
+        input_stats, total = benchmark_inputs(
+            lambda arguments: prepare_call(module, question, arguments), inputs, repeat, warmup
+        )
+    rows = list(zip(labels, input_stats, strict=True))
+    if len(rows) > 1:
+        rows.append(("total", total))
 
+    click.secho(f"{question.id}. {question.title}: {repeat} timed calls per input", bold=True)
+    click.secho(f"{'':<12}{'min':>12}{'median':>12}{'p95':>12}{'peak memory':>14}")
+    for label, stats in rows:
+        click.secho(
+            f"{label:<12}{format_duration(stats.min):>12}{format_duration(stats.median):>12}"
+            f"{format_duration(stats.p95):>12}{stats.peak_memory / 1024:>10.1f} KiB"
+        )
+
+    store = BenchmarkStore(cm.config.source_path)
+    inputs_hash = hash_inputs(inputs)
+    previous = store.previous_run(question.id, inputs_hash)
+    if previous is not None:
+        _report_change(
+            "the median", "slower", "faster", total.median, previous.median, previous.timestamp
+        )
+    if not no_save:
+        code_hash = _hash_file(os.path.join(cm.config.source_path, question.file_path))
+        store.add_run(
+            question.id,
+            BenchmarkRun(
+                timestamp=time.time(),
+                code_hash=code_hash,
+                inputs_hash=inputs_hash,
+                repeat=repeat,
+                min=total.min,
+                median=total.median,
+                p95=total.p95,
+                peak_memory=total.peak_memory,
+            ),
+        )
+
+
+@leet2git.command()
+@click.argument("question-id", type=int)
+@click.option(
+    "--steps",
+    type=click.IntRange(min=4),
+    default=10,
+    show_default=True,
+    help="how many input sizes to try, each one twice the previous size",
+)
+@click.option(
+    "--repeat",
+    "-r",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="timed calls for each size, the fastest one is kept",
+)
+@click.option(
+    "--time-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="stop growing the inputs once a call takes this many seconds",
+)
+@_seed_option
+@click.pass_obj
+def complexity(
+    cm: ConfigManager, question_id: int, steps: int, repeat: int, time_limit: float, seed: int
+) -> None:
+    """Estimate the time complexity of a solution on growing generated inputs
+    \f
     Args:
-        question_id (int): the question question_id
+        question_id (int): the question id
+        steps (int): how many input sizes to try
+        repeat (int): the timed calls for each size
+        time_limit (float): the longest call before the inputs stop growing
+        seed (int): the seed of the generated inputs
     """
     qdb: QuestionDB = QuestionDB(cm.config)
     qdb.load()
-    if qdb.check_if_exists(question_id):
+    question = qdb.get_question(question_id)
+    if not question:
+        raise click.ClickException(f"Could not find the question with id {question_id}")
+
+    with _solution_errors():
+        module = load_solution_module(cm.config.source_path, question)
+        generator = InputGenerator(question, seed)
+        points, stopped = measure_growth(
+            lambda arguments: prepare_call(module, question, arguments),
+            lambda scale: parse_input(generator.generate(scale)),
+            steps,
+            repeat,
+            time_limit,
+        )
+        estimate = estimate_complexity(points)
+        largest_size = input_size(parse_input(generator.generate())) if stopped else points[-1][0]
+
+    click.secho(f"{question.id}. {question.title}: fastest of {repeat} calls per size", bold=True)
+    click.secho(f"{'n':>10}{'time':>14}")
+    for size, timing in points:
+        click.secho(f"{size:>10}{format_duration(timing):>14}")
+    if stopped:
+        click.secho(f"Stopped growing the inputs after a call took over {time_limit:g} s.")
+
+    best = estimate.best
+    click.secho(
+        f"Best fit: {best.name} (R² {best.r_squared:.3f}), {estimate.confidence:.0%} confidence",
+        fg="yellow" if best.name in SLOW_COMPLEXITIES else "green",
+        bold=True,
+    )
+    click.secho(
+        "Other fits: " + ", ".join(f"{fit.name} (R² {fit.r_squared:.3f})" for fit in estimate.fits[1:])
+    )
+    click.secho(
+        f"Estimated time on the largest input (n = {largest_size}): "
+        f"{format_duration(best.predict(largest_size))}"
+    )
+
+
+def _bench_variants(
+    question: QuestionData,
+    solutions: list[SolutionVariant],
+    inputs: list[list[object]],
+    labels: list[str],
+    repeat: int,
+    warmup: int,
+) -> None:
+    """Check that the solutions agree on every input and rank them by their median time
+
+    Args:
+        question (QuestionData): the question data
+        solutions (List[SolutionVariant]): the main solution first, then the variants
+        inputs (List[List[object]]): the parsed inputs
+        labels (List[str]): the label of each input
+        repeat (int): the timed calls for each input
+        warmup (int): the untimed calls for each input before timing
+
+    Raises:
+        click.ClickException: if a solution fails or the solutions disagree
+    """
+    disagreements: list[str] = []
+    totals: list[BenchmarkStats] = []
+    for solution in solutions:
+
+        def make_call(
+            arguments: list[object], solution: SolutionVariant = solution
+        ) -> Callable[[], object]:
+            return prepare_call(solution.module, question, arguments, solution.class_name)
+
+        with _solution_errors(solution.name):
+            outputs = [normalize_output(make_call(arguments)()) for arguments in inputs]
+            if solution is solutions[0]:
+                reference = outputs
+            disagreements += [
+                f"{solution.name} disagrees with {solutions[0].name} on {label}: "
+                f"{json.dumps(output)} != {json.dumps(expected)}"
+                for label, output, expected in zip(labels, outputs, reference, strict=True)
+                if not same_value(output, expected)
+            ]
+            totals.append(benchmark_inputs(make_call, inputs, repeat, warmup)[1])
+
+    baseline = totals[0].median
+    click.secho(
+        f"{question.id}. {question.title}: {repeat} timed calls per input, {len(inputs)} inputs",
+        bold=True,
+    )
+    width = max(len(solution.name) for solution in solutions) + 2
+    click.secho(
+        f"{'#':>3}  {'variant':<{width}}{'median':>12}{'min':>12}{'p95':>12}"
+        f"{'peak memory':>14}{'speedup':>10}"
+    )
+    ranking = sorted(zip(solutions, totals, strict=True), key=lambda row: row[1].median)
+    for rank, (solution, stats) in enumerate(ranking, start=1):
+        speedup = baseline / stats.median if stats.median > 0 else float("inf")
+        click.secho(
+            f"{rank:>3}  {solution.name:<{width}}{format_duration(stats.median):>12}"
+            f"{format_duration(stats.min):>12}{format_duration(stats.p95):>12}"
+            f"{stats.peak_memory / 1024:>10.1f} KiB{speedup:>9.2f}x",
+            fg="green" if rank == 1 else None,
+        )
+    click.secho(f"The speedups are relative to {solutions[0].name}.")
+    if disagreements:
+        for disagreement in disagreements:
+            click.secho(disagreement, fg="red")
+        raise click.ClickException("The solutions do not agree on every input.")
+    click.secho(f"All solutions agree on the {len(inputs)} inputs.", fg="green")
+
+
+@leet2git.command()
+@click.argument("question-id", type=int)
+@_solution_input_options
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="how many allocation sites to show",
+)
+@click.option("--no-save", is_flag=True, help="do not store the profile for later comparisons")
+@click.pass_obj
+def memprofile(
+    cm: ConfigManager,
+    question_id: int,
+    extra_inputs: tuple[str, ...],
+    generated: int,
+    seed: int,
+    top: int,
+    no_save: bool,
+) -> None:
+    """Profile the memory of a solution locally with tracemalloc
+    \f
+    Args:
+        question_id (int): the question id
+        extra_inputs (Tuple[str, ...]): more inputs in the LeetCode format
+        generated (int): how many worst-case size inputs to generate
+        seed (int): the seed of the generated inputs
+        top (int): how many allocation sites to show
+        no_save (bool): do not store the profile
+    """
+    question, module, inputs, labels = _load_solution_inputs(
+        cm.config, question_id, extra_inputs, generated, seed
+    )
+    source_file = module.__file__ or ""
+    with _solution_errors():
+        profiles = [
+            profile_memory(prepare_call(module, question, arguments), source_file)
+            for arguments in inputs
+        ]
+
+    store = MemoryProfileStore(cm.config.source_path)
+    inputs_hash = hash_inputs(inputs)
+    previous = store.previous_run(question.id, inputs_hash)
+    largest_label, largest = max(zip(labels, profiles, strict=True), key=lambda row: row[1].peak_memory)
+
+    click.secho(f"{question.id}. {question.title}: peak memory of each input", bold=True)
+    for label, profile in zip(labels, profiles, strict=True):
+        click.secho(f"{label:<14}{format_size(profile.peak_memory):>12}")
+    click.secho(f"\nAllocation sites near the peak of {largest_label}", bold=True)
+    click.secho(f"{'line':>6}{'size':>12}{'blocks':>10}{'change':>12}  code")
+    site_sizes = sizes_by_line(largest.sites)
+    for site in largest.sites[:top]:
+        change = ""
+        if previous is not None:
+            delta = site_sizes[site.line] - previous.sites.get(site.line, 0)
+            change = ("+" if delta > 0 else "") + format_size(delta)
+        click.secho(
+            f"{site.line_number:>6}{format_size(site.size):>12}{site.count:>10}{change:>12}  {site.line}"
+        )
+
+    if previous is not None:
+        _report_change(
+            "the peak memory",
+            "higher",
+            "lower",
+            largest.peak_memory,
+            previous.peak_memory,
+            previous.timestamp,
+        )
+    if not no_save:
+        store.add_run(
+            question.id,
+            MemoryProfileRun(
+                timestamp=time.time(),
+                code_hash=_hash_file(source_file),
+                inputs_hash=inputs_hash,
+                peak_memory=largest.peak_memory,
+                sites=site_sizes,
+            ),
+        )
+
+
+@leet2git.command()
+@click.argument("question-id", type=int)
+@_solution_input_options
+@click.option(
+    "--repeat",
+    "-r",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="profiled calls for each input",
+)
+@click.option(
+    "--sort",
+    "sort_key",
+    type=click.Choice(SORT_KEYS),
+    default="tottime",
+    show_default=True,
+    help="sort by the time in the function itself or including the functions it calls",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=15,
+    show_default=True,
+    help="how many functions to show",
+)
+@click.option(
+    "--diff",
+    is_flag=True,
+    help="compare with the last stored profile of the same inputs and repeat count",
+)
+@click.option("--no-save", is_flag=True, help="do not store the profile")
+@click.pass_obj
+def profile(
+    cm: ConfigManager,
+    question_id: int,
+    extra_inputs: tuple[str, ...],
+    generated: int,
+    seed: int,
+    repeat: int,
+    sort_key: str,
+    top: int,
+    diff: bool,
+    no_save: bool,
+) -> None:
+    """Profile the CPU time of a solution locally with cProfile
+    \f
+    Args:
+        question_id (int): the question id
+        extra_inputs (Tuple[str, ...]): more inputs in the LeetCode format
+        generated (int): how many worst-case size inputs to generate
+        seed (int): the seed of the generated inputs
+        repeat (int): the profiled calls for each input
+        sort_key (str): "tottime" or "cumtime"
+        top (int): how many functions to show
+        diff (bool): compare with the last stored profile of the same inputs and repeat count
+        no_save (bool): do not store the profile
+    """
+    question, module, inputs, _ = _load_solution_inputs(
+        cm.config, question_id, extra_inputs, generated, seed
+    )
+    with _solution_errors():
+        stats = profile_calls(
+            [
+                lambda arguments=arguments: prepare_call(module, question, arguments)
+                for arguments in inputs
+            ],
+            repeat,
+        )
+
+    store = ProfileStore(cm.config.source_path)
+    inputs_hash = hash_inputs(inputs)
+    rows = function_stats(stats, sort_key)
+    changes: dict[str, float] = {}
+    previous_path = store.previous_profile(question.id, inputs_hash, repeat) if diff else None
+    previous_rows = function_stats(pstats.Stats(previous_path)) if previous_path else []
+    if previous_path is not None:
+        changes = diff_function_stats(rows, previous_rows)
+    elif diff:
+        click.secho(
+            f"There is no stored profile of these inputs with {repeat} calls per input to "
+            "compare with.",
+            fg="yellow",
+        )
+
+    total = sum(row.total_time for row in rows)
+    click.secho(
+        f"{question.id}. {question.title}: {repeat} profiled calls per input, "
+        f"{format_duration(total)} in total",
+        bold=True,
+    )
+    header = f"{'calls':>10}{'tottime':>12}{'cumtime':>12}"
+    click.secho(header + (f"{'change':>12}" if changes else "") + "  function")
+    for row in rows[:top]:
+        line = (
+            f"{row.calls:>10}{format_duration(row.total_time):>12}"
+            f"{format_duration(row.cumulative_time):>12}"
+        )
+        if changes:
+            change = changes.get(row.location, 0.0)
+            line += f"{('-' if change < 0 else '+') + format_duration(abs(change)):>12}"
+        click.secho(f"{line}  {row.location}")
+
+    if previous_path is not None:
+        previous_total = sum(row.total_time for row in previous_rows)
+        change = relative_change(total, previous_total)
+        click.secho(
+            f"The total time changed {change:+.1%} since the last profile of these inputs.",
+            fg="red" if change > REGRESSION_THRESHOLD else None,
+        )
+    if not no_save:
+        file_path = store.add_profile(
+            question.id,
+            stats,
+            StoredProfile(
+                timestamp=time.time(),
+                code_hash=_hash_file(os.path.join(cm.config.source_path, question.file_path)),
+                inputs_hash=inputs_hash,
+                repeat=repeat,
+            ),
+        )
+        click.secho(f"Profile stored in {file_path}")
+
+
+def _load_solution_inputs(
+    config: AppConfig,
+    question_id: int,
+    extra_inputs: tuple[str, ...],
+    generated: int,
+    seed: int,
+) -> tuple[QuestionData, ModuleType, list[list[object]], list[str]]:
+    """Import a solution and parse the inputs to run it on
+
+    Args:
+        config (AppConfig): the configuration
+        question_id (int): the question id
+        extra_inputs (Tuple[str, ...]): more inputs in the LeetCode format
+        generated (int): how many worst-case size inputs to generate
+        seed (int): the seed of the generated inputs
+
+    Raises:
+        click.ClickException: if the solution or the inputs cannot be loaded
+
+    Returns:
+        Tuple[QuestionData, ModuleType, List[List[object]], List[str]]: the question, the
+            solution module, the parsed examples, extra and generated inputs, and their labels
+    """
+    qdb: QuestionDB = QuestionDB(config)
+    qdb.load()
+    question = qdb.get_question(question_id)
+    if not question:
+        raise click.ClickException(f"Could not find the question with id {question_id}")
+
+    with _solution_errors():
+        module = load_solution_module(config.source_path, question)
+        generated_inputs = _generate_inputs(question, generated, seed)
+        inputs = parse_inputs(question, [*extra_inputs, *generated_inputs])
+    if not inputs:
+        raise click.ClickException("The question has no inputs, pass some with --input.")
+    labels = (
+        [f"example {index}" for index in range(1, len(question.inputs) + 1)]
+        + [f"input {index}" for index in range(1, len(extra_inputs) + 1)]
+        + [f"generated {index}" for index in range(1, generated + 1)]
+    )
+    return question, module, inputs, labels
+
+
+def _hash_file(file_path: str) -> str:
+    """Return the SHA-256 digest of a file."""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@leet2git.command("generate-input")
+@click.argument("question-id", type=int)
+@click.option(
+    "--count",
+    "-n",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="how many inputs to print",
+)
+@_seed_option
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="the fraction of the largest sizes allowed by the constraints",
+)
+@click.pass_obj
+def generate_input(cm: ConfigManager, question_id: int, count: int, seed: int, scale: float) -> None:
+    """Print large inputs that respect the question constraints, one per line
+    \f
+    Args:
+        question_id (int): the question id
+        count (int): how many inputs to print
+        seed (int): the seed of the generated inputs
+        scale (float): the fraction of the largest sizes
+    """
+    qdb: QuestionDB = QuestionDB(cm.config)
+    qdb.load()
+    question = qdb.get_question(question_id)
+    if not question:
+        raise click.ClickException(f"Could not find the question with id {question_id}")
+    for raw_input in _generate_inputs(question, count, seed, scale):
+        click.echo(raw_input)
+
+
+def _generate_inputs(question: QuestionData, count: int, seed: int, scale: float = 1.0) -> list[str]:
+    """Generate inputs from the question constraints, failing with a readable message."""
+    if not count:
+        return []
+    try:
+        generator = InputGenerator(question, seed)
+        return [generator.generate(scale) for _ in range(count)]
+    except InputGenerationError as e:
+        raise click.ClickException(str(e)) from e
+
+
+def _open_session(config: AppConfig, qdb: QuestionDB) -> BatchSession:
+    """Create the batch session of a command, deferring the formatting unless disabled."""
+    format_queue = FormatQueue(config.source_path) if config.source_code.defer_formatting else None
+    return BatchSession(qdb, ReadmeHandler(config), format_queue, FormatCache(config.source_path))
+
+
+def _collect_question_ids(question_ids: tuple[int, ...], batch: bool) -> tuple[int, ...]:
+    """Append the ids read from stdin in batch mode, failing if no id was given."""
+    if batch:
+        words = sys.stdin.read().split()
+        question_ids += _parse_question_ids(words, "stdin")
+    if not question_ids:
+        raise click.UsageError("Missing argument 'QUESTION_IDS...'.")
+    return question_ids
+
+
+def _parse_question_ids(words: list[str], source: str) -> tuple[int, ...]:
+    """Convert the question ids read from a text stream."""
+    try:
+        return tuple(int(word) for word in words)
+    except ValueError as e:
+        raise click.UsageError(f"{source}: invalid question id ({e})") from e
+
+
+def _get_questions(
+    config: AppConfig,
+    session: BatchSession,
+    qdb: QuestionDB,
+    question_ids: Iterable[int],
+    force: bool = False,
+    overwrite_local_changes: bool = False,
+) -> None:
+    """Generates the files of each question and records them in the batch session
+
+    Args:
+        config (AppConfig): the user configuration
+        session (BatchSession): the session that saves the changes
+        qdb (QuestionDB): the question database
+        question_ids (Iterable[int]): the question ids
+        force (bool, optional): generate the files of imported questions again, keeping
+            their creation time and solution. Defaults to False.
+        overwrite_local_changes (bool, optional): replace the generated files that were
+            edited since they were generated. Defaults to False.
+    """
+    lc: LeetcodeClient | None = None
+    for question_id in question_ids:
+        previous: QuestionData | None = None
+        if qdb.check_if_exists(question_id):
+            if not force:
+                click.secho("Question already imported")
+                continue
+            previous = qdb.get_question(question_id)
+
+        try:
+            if lc is None:
+                lc = LeetcodeClient()
+            if not qdb.check_if_slug_is_known(question_id):
+                qdb.set_id_title_map(lc.get_id_title_map())
+                qdb.save_catalog()
+
+            # get question data
+            args: dict[int, QuestionData] = {}
+            title_slug = qdb.get_title_from_id(question_id) or ""
+            generate_files(
+                args,
+                question_id,
+                title_slug,
+                lc,
+                time.time() if previous is None else previous.creation_time,
+                config,
+                "" if previous is None else previous.raw_code,
+                defer_formatting=session.format_queue is not None,
+                previous=previous,
+                overwrite_local_changes=overwrite_local_changes,
+            )
+        except LeetcodeAuthError as e:
+            click.secho(str(e), fg="red")
+            return
+        except LeetcodeAPIError as e:
+            click.secho(str(e), fg="red")
+            continue
+
+        if question_id in args:
+            qdb.add_question(args[question_id])
+            session.add_generated(args[question_id])
+
+
+def _delete_questions(
+    config: AppConfig, session: BatchSession, qdb: QuestionDB, question_ids: Iterable[int]
+) -> None:
+    """Deletes the files of each question and records them in the batch session
+
+    Args:
+        config (AppConfig): the user configuration
+        session (BatchSession): the session that saves the changes
+        qdb (QuestionDB): the question database
+        question_ids (Iterable[int]): the question ids
+    """
+    for question_id in question_ids:
+        if not qdb.check_if_exists(question_id):
+            click.secho(f"The question {question_id} could not be found!")
+            continue
+
         data = qdb.get_data()[question_id]
         try:
-            os.remove(os.path.join(cm.config.source_path, data.file_path))
+            os.remove(os.path.join(config.source_path, data.file_path))
             if data.test_file_path:
-                os.remove(os.path.join(cm.config.source_path, data.test_file_path))
+                os.remove(os.path.join(config.source_path, data.test_file_path))
         except FileNotFoundError as e:
             click.secho(str(e), fg="red")
         qdb.delete_question(question_id)
-        qdb.save()
-        # update readme
-        rh = ReadmeHandler(cm.config)
-        rh.build_readme(qdb.get_questions_sorted_by_creation_time())
+        session.mark_changed(question_id)
         click.secho(f"The question {question_id} was removed.")
-    else:
-        click.secho(f"The question {question_id} could not be found!")
+
+
+@leet2git.command("list")
+@click.option(
+    "--difficulty",
+    "-d",
+    type=click.Choice(["Easy", "Medium", "Hard"], case_sensitive=False),
+    help="only list questions with this difficulty",
+)
+@click.option("--tag", "-t", help="only list questions with this topic tag slug (e.g. two-pointers)")
+@click.option("--lang", help="only list questions solved in this language")
+@click.option("--file-path", help="only list the question stored in this source file")
+@click.option(
+    "--since-days", type=click.FloatRange(min=0), help="only list questions from the last days"
+)
+@click.option("--json", "as_json", is_flag=True, help="print the questions as JSON")
+@click.pass_obj
+def list_questions(
+    cm: ConfigManager,
+    difficulty: str | None,
+    tag: str | None,
+    lang: str | None,
+    file_path: str | None,
+    since_days: float | None,
+    as_json: bool,
+) -> None:
+    """List the imported questions
+    \f
+    Args:
+        difficulty (str, optional): the difficulty filter
+        tag (str, optional): the topic tag slug filter
+        lang (str, optional): the language filter
+        file_path (str, optional): the source file path filter
+        since_days (float, optional): only questions created in the last days
+        as_json (bool): print JSON instead of a table
+    """
+    qdb: QuestionDB = QuestionDB(cm.config)
+    qdb.load()
+    questions = qdb.query(
+        difficulty=difficulty,
+        tag=tag,
+        language=lang,
+        file_path=file_path,
+        created_after=None if since_days is None else time.time() - since_days * SECONDS_PER_DAY,
+    )
+
+    if as_json:
+        click.echo(
+            json.dumps(
+                [
+                    {
+                        "id": question.id,
+                        "title": question.title,
+                        "title_slug": question.title_slug,
+                        "difficulty": question.difficulty,
+                        "language": question.language,
+                        "categories": [category.slug for category in question.categories],
+                        "file_path": question.file_path,
+                        "test_file_path": question.test_file_path,
+                        "creation_time": question.creation_time,
+                        "url": question.url,
+                    }
+                    for question in questions
+                ],
+                indent=2,
+            )
+        )
+        return
+
+    for question in questions:
+        created = time.strftime("%Y-%m-%d", time.localtime(question.creation_time))
+        click.secho(f"{question.id:>5}  {created}  {question.difficulty:<6}  {question.title}")
+    click.secho(f"{len(questions)} questions found.")
 
 
 @leet2git.command()
@@ -95,6 +95,48 @@ class LeetcodeAPIError(RuntimeError):
     """Raised when LeetCode returns an unexpected response or request failure."""
 
 
+def display_submission_result(
+    submission_result: SubmissionResultResponse, is_test: bool, clear: bool = True
+) -> None:
+    """Display the formatted result of a run or a submission
+
+    Args:
+        submission_result (SubmissionResultResponse): the result
+        is_test (bool): whether it is the result of a run, which has no percentiles
+        clear (bool, optional): clear the screen first. Defaults to True.
+    """
+    status_code = submission_result.status_code
+    if clear:
+        click.clear()
+    click.secho(f"Result: {submission_result.status_msg or 'Unknown'}")
+    if status_code is None:
+        click.secho("Submission status code unavailable.", fg="yellow")
+        return
+    if status_code == 10:
+        click.secho(
+            f"Total Runtime: {submission_result.status_runtime or 'unknown'} "
+            + ("" if is_test else f"(Better than {submission_result.runtime_percentile or 0:.2f}%)")
+        )
+        click.secho(
+            f"Total Memory: {submission_result.status_memory or 'unknown'} "
+            + ("" if is_test else f"(Better than {submission_result.memory_percentile or 0:.2f}%)")
+        )
+    elif status_code == 11:
+        click.secho(f"Last Input: {submission_result.input_formatted or 'unknown'}")
+        click.secho(f"Expected Output: {submission_result.expected_output or 'unknown'}")
+        click.secho(f"Code Output: {submission_result.code_output or 'unknown'}")
+    elif status_code in (12, 14):
+        nl = "\n"
+        last_testcase = (submission_result.last_testcase or "unknown").replace(nl, " ")
+        click.secho(f"Last Input: {last_testcase}")
+        click.secho(f"Expected Output: {submission_result.expected_output or 'unknown'}")
+        click.secho(f"Code Output: {submission_result.code_output or 'unknown'}")
+    elif status_code == 15:
+        click.secho(f"Runtime Error: {submission_result.runtime_error or 'unknown'}")
+    elif status_code == 20:
+        click.secho(f"Compile Error: {submission_result.compile_error or 'unknown'}")
+
+
 class LeetcodeClient:
     """Handles getting data from leetcode"""
 
@@ -270,7 +312,7 @@ class LeetcodeClient:
         language: str,
         is_test: bool = False,
         test_input: str = "",
-    ) -> None:
+    ) -> SubmissionResultResponse:
         """Submit question to Leetcode
 
         Args:
@@ -280,8 +322,11 @@ class LeetcodeClient:
              language (str): the language of the code
              is_test (bool): if true, do not submit, only test on leetcode servers
              test_input (str): input to test. Only used if is_test is True
+
+        Returns:
+             SubmissionResultResponse: the result, already displayed
         """
-        self._run_async(
+        return self._run_async(
             self.async_submit_question(code, internal_id, title_slug, language, is_test, test_input)
         )
 
@@ -293,7 +338,7 @@ class LeetcodeClient:
         language: str,
         is_test: bool = False,
         test_input: str = "",
-    ) -> None:
+    ) -> SubmissionResultResponse:
         """Submit or test a question asynchronously."""
         if not self.csrftoken:
             raise LeetcodeAuthError(
@@ -333,40 +378,8 @@ class LeetcodeClient:
             submission_result = await self._request_json("GET", url, SubmissionResultResponse)
             status = submission_result.state
 
-        self._display_submission_result(submission_result, submission_result.status_code, is_test)
-
-    def _display_submission_result(
-        self, submission_result: SubmissionResultResponse, status_code: int | None, is_test: bool
-    ) -> None:
-        """Display the formatted submission result to the user."""
-        click.clear()
-        click.secho(f"Result: {submission_result.status_msg or 'Unknown'}")
-        if status_code is None:
-            click.secho("Submission status code unavailable.", fg="yellow")
-            return
-        if status_code == 10:
-            click.secho(
-                f"Total Runtime: {submission_result.status_runtime or 'unknown'} "
-                + ("" if is_test else f"(Better than {submission_result.runtime_percentile or 0:.2f}%)")
-            )
-            click.secho(
-                f"Total Memory: {submission_result.status_memory or 'unknown'} "
-                + ("" if is_test else f"(Better than {submission_result.memory_percentile or 0:.2f}%)")
-            )
-        elif status_code == 11:
-            click.secho(f"Last Input: {submission_result.input_formatted or 'unknown'}")
-            click.secho(f"Expected Output: {submission_result.expected_output or 'unknown'}")
-            click.secho(f"Code Output: {submission_result.code_output or 'unknown'}")
-        elif status_code == 14:
-            nl = "\n"
-            last_testcase = (submission_result.last_testcase or "unknown").replace(nl, " ")
-            click.secho(f"Last Input: {last_testcase}")
-            click.secho(f"Expected Output: {submission_result.expected_output or 'unknown'}")
-            click.secho(f"Code Output: {submission_result.code_output or 'unknown'}")
-        elif status_code == 15:
-            click.secho(f"Runtime Error: {submission_result.runtime_error or 'unknown'}")
-        elif status_code == 20:
-            click.secho(f"Compile Error: {submission_result.compile_error or 'unknown'}")
+        display_submission_result(submission_result, is_test)
+        return submission_result
 
     def get_submission_list(self, last_key: str = "", offset: int = 0) -> SubmissionListResponse:
         """Get a list with 20 submissions using the async HTTP implementation."""
@@ -0,0 +1,276 @@
+"""
+Judges the generated Python solutions locally, with time and memory limits
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import contextlib
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from leet2git.leetcode_models import SubmissionResultResponse
+from leet2git.question_db import QuestionData
+from leet2git.solution_runner import (
+    SolutionError,
+    check_local_support,
+    load_solution_module,
+    parse_input,
+    prepare_call,
+    same_value,
+)
+
+try:
+    import resource
+except ImportError:  # Windows has no rlimits, only the wall-clock timeout applies
+    resource = None
+
+# the status codes of LeetCode results
+ACCEPTED = 10
+WRONG_ANSWER = 11
+MEMORY_LIMIT_EXCEEDED = 12
+TIME_LIMIT_EXCEEDED = 14
+RUNTIME_ERROR = 15
+COMPILE_ERROR = 20
+STATUS_MESSAGES = {
+    ACCEPTED: "Accepted",
+    WRONG_ANSWER: "Wrong Answer",
+    MEMORY_LIMIT_EXCEEDED: "Memory Limit Exceeded",
+    TIME_LIMIT_EXCEEDED: "Time Limit Exceeded",
+    RUNTIME_ERROR: "Runtime Error",
+    COMPILE_ERROR: "Compile Error",
+}
+DEFAULT_TIME_LIMIT = 2.0
+DEFAULT_MEMORY_LIMIT = 512
+# the interpreter start and the solution import are not timed, but the timeout covers them
+_STARTUP_ALLOWANCE = 5.0
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# the worker exit codes
+_RUNTIME_ERROR_EXIT = 1
+_MEMORY_ERROR_EXIT = 2
+_IMPORT_ERROR_EXIT = 3
+
+
+@dataclass
+class CaseResult:
+    """The outcome of running the solution on one example"""
+
+    status_code: int
+    output: object = None
+    runtime: float = 0.0
+    memory: int = 0
+    error: str = ""
+
+
+class LocalJudge:
+    """Runs a solution on the examples of its question, each one in a separate process
+
+    Each worker process limits its own CPU time and address space with rlimits before
+    importing the solution, so a slow or memory hungry solution is stopped like on
+    LeetCode instead of freezing the machine. The verdict has the shape of the LeetCode
+    result, to be displayed the same way.
+
+    Example:
+        judge = LocalJudge(config.source_path, time_limit=1.0)
+        result = judge.judge(question)
+        result.status_msg  # e.g. "Wrong Answer"
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        time_limit: float = DEFAULT_TIME_LIMIT,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        jobs: int | None = None,
+    ):
+        self.source_path = source_path
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def judge(self, question: QuestionData) -> SubmissionResultResponse:
+        """Run the solution on every example and compare it with the expected outputs
+
+        Args:
+            question (QuestionData): the question data
+
+        Raises:
+            SolutionError: if the question cannot run locally or has no expected outputs
+
+        Returns:
+            SubmissionResultResponse: the verdict of the first failing example in order, or
+                Accepted with the total runtime and the peak memory
+        """
+        check_local_support(question)
+        if not question.inputs or len(question.inputs) != len(question.outputs):
+            raise SolutionError(f"The question {question.id} has no expected outputs to judge.")
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(lambda raw: self.run_case(question, raw), question.inputs))
+
+        for raw_input, raw_output, result in zip(
+            question.inputs, question.outputs, results, strict=True
+        ):
+            if result.status_code == ACCEPTED and not same_output(result.output, raw_output):
+                result.status_code = WRONG_ANSWER
+            if result.status_code != ACCEPTED:
+                return self._failure(result, raw_input, raw_output)
+
+        return SubmissionResultResponse(
+            state="SUCCESS",
+            status_code=ACCEPTED,
+            status_msg=STATUS_MESSAGES[ACCEPTED],
+            status_runtime=f"{sum(result.runtime for result in results) * 1e3:.0f} ms",
+            status_memory=f"{max(result.memory for result in results) / 2**20:.1f} MB",
+        )
+
+    def run_case(self, question: QuestionData, raw_input: str) -> CaseResult:
+        """Run the solution on one input in a worker process
+
+        Args:
+            question (QuestionData): the question data
+            raw_input (str): the input in the LeetCode format
+
+        Returns:
+            CaseResult: the verdict, without comparing the output
+        """
+        request = {
+            "source_path": self.source_path,
+            "question": question.model_dump(mode="json"),
+            "input": raw_input,
+            "time_limit": self.time_limit,
+            "memory_limit": self.memory_limit,
+        }
+        try:
+            process = subprocess.run(
+                [sys.executable, "-m", "leet2git.local_judge"],
+                input=json.dumps(request),
+                capture_output=True,
+                encoding="UTF8",
+                errors="replace",
+                timeout=self.time_limit + _STARTUP_ALLOWANCE,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return CaseResult(TIME_LIMIT_EXCEEDED, runtime=self.time_limit)
+
+        if process.returncode == 0:
+            try:
+                report = json.loads(process.stdout)
+            except json.JSONDecodeError:
+                # e.g. the solution wrote to the file descriptor of stdout directly
+                return CaseResult(RUNTIME_ERROR, error=f"Unexpected output: {process.stdout.strip()}")
+            status_code = TIME_LIMIT_EXCEEDED if report["runtime"] > self.time_limit else ACCEPTED
+            return CaseResult(status_code, report["output"], report["runtime"], report["memory"])
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else ""
+        if process.returncode == _MEMORY_ERROR_EXIT:
+            return CaseResult(MEMORY_LIMIT_EXCEEDED, error=error)
+        if process.returncode == _IMPORT_ERROR_EXIT:
+            return CaseResult(COMPILE_ERROR, error=error)
+        if process.returncode == _RUNTIME_ERROR_EXIT:
+            return CaseResult(RUNTIME_ERROR, error=process.stderr.strip())
+        # killed by a signal, e.g. SIGXCPU or SIGKILL once the CPU time limit is reached
+        return CaseResult(TIME_LIMIT_EXCEEDED, runtime=self.time_limit, error=error)
+
+    @staticmethod
+    def _failure(result: CaseResult, raw_input: str, raw_output: str) -> SubmissionResultResponse:
+        """Build the verdict of a failing example."""
+        return SubmissionResultResponse(
+            state="SUCCESS",
+            status_code=result.status_code,
+            status_msg=STATUS_MESSAGES[result.status_code],
+            input_formatted=raw_input,
+            last_testcase=raw_input,
+            expected_output=raw_output,
+            code_output=(
+                json.dumps(result.output, separators=(",", ":"))
+                if result.status_code == WRONG_ANSWER
+                else None
+            ),
+            runtime_error=result.error if result.status_code == RUNTIME_ERROR else None,
+            compile_error=result.error if result.status_code == COMPILE_ERROR else None,
+        )
+
+
+def same_output(output: object, raw_expected: str) -> bool:
+    """Compare an output with the expected output of an example
+
+    Floats are equal within 1e-5, as on LeetCode.
+
+    Args:
+        output (object): the output, after a JSON round trip
+        raw_expected (str): the expected output in the LeetCode format
+
+    Returns:
+        bool: whether they are equal
+    """
+    try:
+        expected = json.loads(raw_expected)
+    except json.JSONDecodeError:
+        return json.dumps(output, separators=(",", ":")) == raw_expected.strip()
+    return same_value(output, expected)
+
+
+def _limit_resources(time_limit: float, memory_limit: int) -> None:
+    """Limit the CPU time left to this process and its address space, in MiB."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_limit = math.ceil(usage.ru_utime + usage.ru_stime + time_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    memory_bytes = memory_limit * 2**20
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def _peak_memory() -> int:
+    """Return the peak resident memory of this process in bytes, or 0 if unknown."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_worker() -> int:
+    """Run one example read from stdin and print the output and the runtime as JSON."""
+    request = json.loads(sys.stdin.read())
+    question = QuestionData.model_validate(request["question"])
+    _limit_resources(request["time_limit"], request["memory_limit"])
+    # anything the solution prints, even at import time, must not be mixed with the report
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            module = load_solution_module(request["source_path"], question)
+        except SolutionError as e:
+            print(e, file=sys.stderr)
+            return _MEMORY_ERROR_EXIT if isinstance(e.__cause__, MemoryError) else _IMPORT_ERROR_EXIT
+
+        try:
+            call = prepare_call(module, question, parse_input(request["input"]))
+            start = time.perf_counter()
+            output = call()
+            runtime = time.perf_counter() - start
+            report = json.dumps(
+                {"output": output, "runtime": runtime, "memory": _peak_memory()}, default=repr
+            )
+        except MemoryError:
+            print("MemoryError", file=sys.stderr)
+            return _MEMORY_ERROR_EXIT
+        except Exception as e:
+            # only the frames of the solution, not the ones of the judge
+            frame = e.__traceback__
+            while frame is not None and frame.tb_frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+                frame = frame.tb_next
+            traceback.print_exception(type(e), e, frame, file=sys.stderr)
+            return _RUNTIME_ERROR_EXIT
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_run_worker())
@@ -0,0 +1,271 @@
+"""
+Runs the generated tests of many questions in parallel
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from leet2git.question_db import QuestionData
+from leet2git.state_store import JsonStateStore
+
+LOCAL_TESTS_DIR_NAME = "local_tests"
+# the runs of every question are stored together, in history.json
+HISTORY_KEY = "history"
+HISTORY_VERSION = 1
+PASSED = "passed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+# pytest exits with 5 when it collects no test
+_NO_TESTS_COLLECTED = 5
+NO_TESTS = "no tests"
+
+
+class LocalTestRecord(BaseModel):
+    """The last local test run of a question"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    outcome: str = ""
+    duration: float = 0.0
+    # size and modification time of the source and test files when they were tested
+    file_stats: dict[str, tuple[int, int]] = Field(default_factory=dict)
+    # hash of the content of the source and test files when they were tested
+    content_hash: str = ""
+
+
+class LocalTestHistory(BaseModel):
+    """Versioned persisted local test runs"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    version: int = HISTORY_VERSION
+    questions: dict[int, LocalTestRecord] = Field(default_factory=dict)
+
+
+class LocalTestStore(JsonStateStore[LocalTestHistory]):
+    """Stores the local test runs in the local state directory"""
+
+    dir_name = LOCAL_TESTS_DIR_NAME
+    state_type = LocalTestHistory
+
+
+@dataclass
+class LocalTestResult:
+    """The outcome of running the tests of one question"""
+
+    question_id: int
+    title: str
+    outcome: str
+    duration: float
+    output: str = ""
+
+
+class LocalTestRunner:
+    """Runs the generated pytest files of the questions, several at a time
+
+    The questions that took longest in the previous runs are started first, so a slow
+    question does not start last and hold up the whole run. The outcome, duration and
+    file status of every run are stored, to schedule the next runs and find the
+    questions that changed since they were tested.
+    """
+
+    def __init__(self, source_path: str, jobs: int | None = None, timeout: float = 60.0):
+        self.source_path = source_path
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.store = LocalTestStore(source_path)
+        self._history: LocalTestHistory | None = None
+
+    @property
+    def history(self) -> LocalTestHistory:
+        """The previous runs, loaded from disk on first access
+
+        Returns:
+            LocalTestHistory: the last run of each question
+        """
+        if self._history is None:
+            self._history = self.store.load(HISTORY_KEY)
+        return self._history
+
+    def select_changed(self, questions: Iterable[QuestionData]) -> list[QuestionData]:
+        """Return the questions whose last run did not pass or whose files changed since
+
+        Args:
+            questions (Iterable[QuestionData]): the questions with tests
+
+        Returns:
+            List[QuestionData]: the questions that should be tested again
+        """
+        changed: list[QuestionData] = []
+        for question in questions:
+            record = self.history.questions.get(question.id)
+            if (
+                record is None
+                or record.outcome != PASSED
+                or record.file_stats != self._file_stats(question)
+            ):
+                changed.append(question)
+        return changed
+
+    def schedule(self, questions: Iterable[QuestionData]) -> list[QuestionData]:
+        """Sort the questions longest first, starting with the ones never tested
+
+        Args:
+            questions (Iterable[QuestionData]): the questions to test
+
+        Returns:
+            List[QuestionData]: the questions in the order they should be started
+        """
+
+        def expected_duration(question: QuestionData) -> float:
+            record = self.history.questions.get(question.id)
+            return float("inf") if record is None else record.duration
+
+        return sorted(questions, key=expected_duration, reverse=True)
+
+    def run(self, questions: Iterable[QuestionData]) -> list[LocalTestResult]:
+        """Run the tests of the questions in parallel and store the results
+
+        Args:
+            questions (Iterable[QuestionData]): the questions to test
+
+        Returns:
+            List[LocalTestResult]: the result of each question, sorted by question id
+        """
+        scheduled = self.schedule(questions)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(self.run_question, scheduled))
+
+        for question, result in zip(scheduled, results, strict=True):
+            self.history.questions[question.id] = LocalTestRecord(
+                outcome=result.outcome,
+                duration=result.duration,
+                file_stats=self._file_stats(question),
+                content_hash=self._content_hash(question),
+            )
+        self.save_history()
+        return sorted(results, key=lambda result: result.question_id)
+
+    def verify(self, question: QuestionData) -> LocalTestResult | None:
+        """Run the tests of a question, unless they already passed on the same files
+
+        Args:
+            question (QuestionData): the question data
+
+        Returns:
+            LocalTestResult | None: the result, or None if a previous run passed on files
+                with the same content
+        """
+        content_hash = self._content_hash(question)
+        record = self.history.questions.get(question.id)
+        if record is not None and record.outcome == PASSED and record.content_hash == content_hash:
+            return None
+
+        file_stats = self._file_stats(question)
+        result = self.run_question(question)
+        self.history.questions[question.id] = LocalTestRecord(
+            outcome=result.outcome,
+            duration=result.duration,
+            file_stats=file_stats,
+            content_hash=content_hash,
+        )
+        self.save_history()
+        return result
+
+    def run_question(self, question: QuestionData) -> LocalTestResult:
+        """Run the tests of one question in a pytest process
+
+        Args:
+            question (QuestionData): the question data
+
+        Returns:
+            LocalTestResult: the outcome, the wall-clock duration and the pytest output
+        """
+        start = time.perf_counter()
+        try:
+            process = subprocess.run(
+                [sys.executable, "-m", "pytest", "-q", question.test_file_path],
+                cwd=self.source_path or None,
+                capture_output=True,
+                encoding="UTF8",
+                errors="replace",
+                timeout=self.timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return LocalTestResult(
+                question.id,
+                question.title,
+                TIMEOUT,
+                time.perf_counter() - start,
+                f"The tests did not finish in {self.timeout:g} seconds.",
+            )
+        duration = time.perf_counter() - start
+        if process.returncode == 0:
+            outcome = PASSED
+        elif process.returncode == _NO_TESTS_COLLECTED:
+            outcome = NO_TESTS
+        else:
+            outcome = FAILED
+        return LocalTestResult(
+            question.id, question.title, outcome, duration, process.stdout + process.stderr
+        )
+
+    def save_history(self) -> None:
+        """Store the last run of each question"""
+        self.store.save(HISTORY_KEY, self.history)
+
+    def _file_stats(self, question: QuestionData) -> dict[str, tuple[int, int]]:
+        """Return the size and modification time of the source and test files."""
+        file_stats: dict[str, tuple[int, int]] = {}
+        for file_path in (question.file_path, question.test_file_path):
+            try:
+                stat = os.stat(os.path.join(self.source_path, file_path))
+            except OSError:
+                continue
+            file_stats[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return file_stats
+
+    def _content_hash(self, question: QuestionData) -> str:
+        """Return the hash of the content of the source and test files."""
+        content_hash = hashlib.sha256()
+        for file_path in (question.file_path, question.test_file_path):
+            content_hash.update(file_path.encode("UTF8") + b"\0")
+            try:
+                with open(os.path.join(self.source_path, file_path), "rb") as f:
+                    content_hash.update(f.read())
+            except OSError:
+                content_hash.update(b"\0missing")
+        return content_hash.hexdigest()
+
+
+def render_results(results: Iterable[LocalTestResult]) -> list[tuple[str, str | None]]:
+    """Render the results table
+
+    Args:
+        results (Iterable[LocalTestResult]): the test results
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: each line of the table and its color
+    """
+    colors = {PASSED: "green", FAILED: "red", TIMEOUT: "red", NO_TESTS: "yellow"}
+    lines: list[tuple[str, str | None]] = [(f"{'ID':>5}  {'Result':<8}  {'Time':>8}  Title", None)]
+    for result in results:
+        lines.append(
+            (
+                f"{result.question_id:>5}  {result.outcome:<8}  {result.duration:>7.2f}s  "
+                f"{result.title}",
+                colors.get(result.outcome),
+            )
+        )
+    return lines
@@ -0,0 +1,163 @@
+"""
+Profiles the memory of the generated Python solutions and keeps their history
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import linecache
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import FrameType
+
+from pydantic import Field
+
+from leet2git.state_store import RunHistory, RunHistoryStore, StoredRun
+
+MEMORY_PROFILES_DIR_NAME = "memory_profiles"
+MEMORY_PROFILE_HISTORY_VERSION = 2
+MAX_STORED_PROFILES = 50
+# frames kept for each allocation, to find the solution line behind library allocations
+TRACEBACK_FRAMES = 25
+# a new snapshot is taken when the traced memory grew this much since the last one
+_SNAPSHOT_GROWTH = 0.1
+
+
+@dataclass
+class AllocationSite:
+    """The memory allocated by one line of the solution and still alive at the snapshot"""
+
+    line_number: int
+    line: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryProfile:
+    """The peak memory of a call in bytes and the allocation sites near that peak"""
+
+    peak_memory: int
+    sites: list[AllocationSite]
+
+
+class MemoryProfileRun(StoredRun):
+    """A stored memory profile of a question"""
+
+    peak_memory: int = 0
+    # bytes allocated by each line of the solution, by its code, so a line still matches
+    # after the lines above it moved
+    sites: dict[str, int] = Field(default_factory=dict)
+
+
+class MemoryProfileHistory(RunHistory[MemoryProfileRun]):
+    """Versioned persisted memory profiles of a question"""
+
+    version: int = MEMORY_PROFILE_HISTORY_VERSION
+
+
+def profile_memory(call: Callable[[], object], source_file: str) -> MemoryProfile:
+    """Run a call under tracemalloc and find the solution lines holding memory near its peak
+
+    tracemalloc cannot take a snapshot at the exact peak, so a snapshot is taken whenever a
+    function of the solution returns with more memory traced than at the last snapshot,
+    while its local variables are still alive.
+
+    Args:
+        call (Callable[[], object]): runs the solution once
+        source_file (str): the path of the solution file
+
+    Returns:
+        MemoryProfile: the peak memory of the call and the allocation sites of the solution
+            at the largest snapshot, largest first
+    """
+    snapshot: tracemalloc.Snapshot | None = None
+    largest = 0
+
+    def take_snapshot(frame: FrameType, event: str, arg: object) -> None:
+        nonlocal snapshot, largest
+        if event != "return" or frame.f_code.co_filename != source_file:
+            return
+        current = tracemalloc.get_traced_memory()[0] - baseline
+        if current > largest * (1 + _SNAPSHOT_GROWTH):
+            largest = current
+            snapshot = tracemalloc.take_snapshot()
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACEBACK_FRAMES)
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        previous_profiler = sys.getprofile()
+        sys.setprofile(take_snapshot)
+        try:
+            # kept alive until the last snapshot, like the locals of the solution
+            output = call()
+        finally:
+            sys.setprofile(previous_profiler)
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        if snapshot is None:
+            snapshot = tracemalloc.take_snapshot()
+        del output
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return MemoryProfile(max(peak_memory, 0), _allocation_sites(snapshot, source_file))
+
+
+def _allocation_sites(snapshot: tracemalloc.Snapshot, source_file: str) -> list[AllocationSite]:
+    """Group the traced memory by the most recent solution line of each allocation."""
+    solution_traces = snapshot.filter_traces([tracemalloc.Filter(True, source_file, all_frames=True)])
+    sizes: dict[int, list[int]] = {}
+    for statistic in solution_traces.statistics("traceback"):
+        # frames are sorted from the oldest to the most recent
+        frame = next(frame for frame in reversed(statistic.traceback) if frame.filename == source_file)
+        size_and_count = sizes.setdefault(frame.lineno, [0, 0])
+        size_and_count[0] += statistic.size
+        size_and_count[1] += statistic.count
+    sites = [
+        AllocationSite(line_number, linecache.getline(source_file, line_number).strip(), size, count)
+        for line_number, (size, count) in sizes.items()
+    ]
+    return sorted(sites, key=lambda site: site.size, reverse=True)
+
+
+def sizes_by_line(sites: list[AllocationSite]) -> dict[str, int]:
+    """Sum the memory of the allocation sites by their code
+
+    Args:
+        sites (List[AllocationSite]): the allocation sites
+
+    Returns:
+        Dict[str, int]: the bytes allocated by each line of code. Identical lines are summed.
+    """
+    sizes: dict[str, int] = {}
+    for site in sites:
+        sizes[site.line] = sizes.get(site.line, 0) + site.size
+    return sizes
+
+
+class MemoryProfileStore(RunHistoryStore[MemoryProfileRun]):
+    """Stores the memory profiles of each question in the local state directory"""
+
+    dir_name = MEMORY_PROFILES_DIR_NAME
+    state_type = MemoryProfileHistory
+    max_runs = MAX_STORED_PROFILES
+
+
+def format_size(size: int) -> str:
+    """Format a memory size with a unit that keeps it readable
+
+    Args:
+        size (int): the size in bytes, which can be negative for a delta
+
+    Returns:
+        str: the size in B, KiB or MiB
+    """
+    if abs(size) >= 2**20:
+        return f"{size / 2**20:.1f} MiB"
+    if abs(size) >= 2**10:
+        return f"{size / 2**10:.1f} KiB"
+    return f"{size} B"
@@ -0,0 +1,158 @@
+"""
+Analyzes Python sources once for the Python file handler
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import ast
+import functools
+import io
+import tokenize
+
+
+class PythonSourceAnalysis:
+    """The facts the Python handler needs about a source
+
+    The source is tokenized at most once and parsed at most once, and only when a fact
+    that needs it is first read. Use analyze_python_source to share one analysis between
+    every step that looks at the same source.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+
+    @functools.cached_property
+    def tree(self) -> ast.Module | None:
+        """The syntax tree of the source, or None if it is not valid Python."""
+        try:
+            return ast.parse(self.source)
+        except SyntaxError:
+            return None
+
+    @property
+    def callables(self) -> list[str]:
+        """The function names of a LeetCode template, with constructors named after their
+        class."""
+        return self._definitions[0]
+
+    @property
+    def def_lines(self) -> set[int]:
+        """The line numbers of every function definition."""
+        return self._definitions[1]
+
+    @functools.cached_property
+    def _definitions(self) -> tuple[list[str], set[int]]:
+        """Find the callables and the definition lines in one pass over the tokens."""
+        functions: list[str] = []
+        def_lines: set[int] = set()
+        class_stack: list[tuple[int, str]] = []
+        tokens = tokenize.generate_tokens(io.StringIO(self.source).readline)
+        for token in tokens:
+            if token.type == tokenize.NAME and token.string == "class":
+                class_token = next(tokens, None)
+                if class_token and class_token.type == tokenize.NAME:
+                    class_stack.append((token.start[1], class_token.string))
+            elif token.type == tokenize.NAME and token.string == "def":
+                function_token = next(tokens, None)
+                if not function_token or function_token.type != tokenize.NAME:
+                    continue
+                def_lines.add(token.start[0])
+                if function_token.string == "__init__" and class_stack:
+                    functions.append(class_stack[-1][1])
+                else:
+                    functions.append(function_token.string)
+        return functions, def_lines
+
+    @functools.cached_property
+    def signatures(self) -> dict[str, list[tuple[str, str]]]:
+        """The parameters of every function, without self and cls, with their annotations as
+        written ("" when missing)."""
+        signatures: dict[str, list[tuple[str, str]]] = {}
+        if self.tree is None:
+            return signatures
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                signatures[node.name] = [
+                    (argument.arg, ast.unparse(argument.annotation) if argument.annotation else "")
+                    for argument in (*node.args.posonlyargs, *node.args.args)
+                    if argument.arg not in ("self", "cls")
+                ]
+        return signatures
+
+    @functools.cached_property
+    def has_future_annotations(self) -> bool:
+        """Whether the source already has from __future__ import annotations."""
+        return self.tree is not None and any(
+            isinstance(node, ast.ImportFrom)
+            and node.module == "__future__"
+            and any(name.name == "annotations" for name in node.names)
+            for node in self.tree.body
+        )
+
+    @functools.cached_property
+    def future_insertion_line(self) -> int:
+        """The line after the module docstring and the existing future imports, or 0."""
+        if self.tree is None:
+            return 0
+        body = self.tree.body
+        insertion_line = 0
+        body_index = 0
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            insertion_line = body[0].end_lineno or body[0].lineno
+            body_index = 1
+
+        for node in body[body_index:]:
+            if not isinstance(node, ast.ImportFrom) or node.module != "__future__":
+                break
+            insertion_line = node.end_lineno or node.lineno
+        return insertion_line
+
+    @functools.cached_property
+    def main_block_line(self) -> int | None:
+        """The line number of the if __name__ == "__main__" block, if present."""
+        if self.tree is None:
+            return None
+        for node in self.tree.body:
+            if not isinstance(node, ast.If):
+                continue
+            compare = node.test
+            if not isinstance(compare, ast.Compare):
+                continue
+            if not isinstance(compare.left, ast.Name) or compare.left.id != "__name__":
+                continue
+            if len(compare.ops) != 1 or not isinstance(compare.ops[0], ast.Eq):
+                continue
+            if len(compare.comparators) != 1:
+                continue
+            comparator = compare.comparators[0]
+            if isinstance(comparator, ast.Constant) and comparator.value == "__main__":
+                return node.lineno
+        return None
+
+    def without_main_block(self) -> str:
+        """Return the source without the __main__ block and everything after it.
+
+        Returns:
+            str: the source up to the __main__ block, or the whole source if there is none
+        """
+        if self.main_block_line is None:
+            return self.source
+        return "".join(self.source.splitlines(keepends=True)[: self.main_block_line - 1])
+
+
+@functools.lru_cache(maxsize=32)
+def analyze_python_source(source: str) -> PythonSourceAnalysis:
+    """Return the shared analysis of a Python source
+
+    Args:
+        source (str): the Python code
+
+    Returns:
+        PythonSourceAnalysis: the analysis, reused for every call with the same source
+    """
+    return PythonSourceAnalysis(source)
@@ -9,15 +9,18 @@ import io
 import os
 import shutil
 import subprocess
-import tokenize
+import time
 from pathlib import Path
 
 import click
-from autoimport import fix_files
 
 from leet2git.config_manager import AppConfig
 from leet2git.file_handler import FileHandler
+from leet2git.format_cache import AUTOIMPORT, RUFF, FormatCache
+from leet2git.import_resolver import add_missing_imports
+from leet2git.python_analysis import analyze_python_source
 from leet2git.question_db import QuestionData
+from leet2git.ruff_formatter import RUFF_FIX_COMMAND, RUFF_FORMAT_COMMAND
 
 
 class PythonHandler(FileHandler):
@@ -29,6 +32,7 @@ class PythonHandler(FileHandler):
         super().__init__()
         self.question_data: QuestionData = QuestionData()
         self.config: AppConfig = AppConfig()
+        self.source_timings: dict[str, float] = {}
 
     def get_function_name(self) -> list[str]:
         """Returns the function name
@@ -36,7 +40,7 @@ class PythonHandler(FileHandler):
         Returns:
             List[str]: a list with all function names
         """
-        functions = self._get_template_callables(self.question_data.question_template)
+        functions = analyze_python_source(self.question_data.question_template).callables
         if not functions:
             raise ValueError("Could not find a Python function in the LeetCode code template.")
         return functions
@@ -44,10 +48,25 @@ class PythonHandler(FileHandler):
     def generate_source(self) -> Path:
         """Generates the source file
 
+        The header, code, imports, test entrypoint and formatting are applied in memory and
+        the file is written once, if its content changed. The duration of each stage is
+        stored in source_timings.
+
         Returns:
             Path: the path to the generated source file
         """
+        self.source_timings = {}
+        stage_start = time.perf_counter()
+
+        def end_stage(stage: str) -> None:
+            nonlocal stage_start
+            now = time.perf_counter()
+            self.source_timings[stage] = now - stage_start
+            stage_start = now
+
         comment, extension, lines = self._build_source_header()
+        end_stage("header")
+
         code, is_solution = (
             (self.question_data.raw_code, True)
             if self.question_data.raw_code
@@ -57,31 +76,34 @@ class PythonHandler(FileHandler):
         if self.question_data.language == "python3":
             code_lines = self._ensure_future_annotations(code_lines)
         lines.extend(code_lines)
-        file_path = self.question_data.file_path + extension
-
-        full_path: str = os.path.join(self.config.source_path, file_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
-        with open(full_path, "w", encoding="UTF8") as f:
-            f.writelines(lines)
+        end_stage("code")
 
         # fix imports
-        with open(full_path, "r+", encoding="UTF8") as f:
-            fix_files((f,))
+        source, unresolved_names = add_missing_imports("".join(lines))
+        if unresolved_names:
+            source = self._fix_imports_with_autoimport(source)
+        end_stage("imports")
 
+        file_path = self.question_data.file_path + extension
         if self.config.test_code.generate_tests and not self.question_data.requires_custom_test_harness:
-            with open(full_path, "a", encoding="UTF8") as f:
-                f.write("\n")
-                f.write("\n")
-                f.write('if __name__ == "__main__":\n')
-                f.write("    import pytest\n")
-                f.write("    import os\n")
-                f.write(
-                    f"    pytest.main([os.path.join('tests', 'test_{self.question_data.id}{extension}')])\n"
-                )
-                f.write("")
+            source += (
+                "\n"
+                "\n"
+                'if __name__ == "__main__":\n'
+                "    import pytest\n"
+                "    import os\n"
+                f"    pytest.main([os.path.join('tests', 'test_{self.question_data.id}{extension}')])\n"
+            )
+        end_stage("entrypoint")
+
+        def format_source(source: str, full_path: str) -> str:
+            formatted = self.format_source(source, full_path)
+            end_stage("format")
+            return formatted
 
-        self.run_formatter(full_path)
+        # an unchanged file is neither formatted nor written again
+        self._write_generated_file(file_path, source, None if self.defer_formatting else format_source)
+        end_stage("write")
 
         return Path(file_path)
 
@@ -90,19 +112,24 @@ class PythonHandler(FileHandler):
         full_path = os.path.join(self.config.source_path, self.question_data.file_path)
         try:
             with open(full_path, encoding="UTF8") as file:
-                source = file.read()
-            tree = ast.parse(source)
-            main_line = self._find_main_block_line(tree)
-            if main_line is None:
+                analysis = analyze_python_source(file.read())
+            if analysis.main_block_line is None:
+                if analysis.tree is None:
+                    click.secho(
+                        "Could not remove the local test entrypoint: the source is not valid Python.",
+                        fg="yellow",
+                    )
                 return
-            with open(full_path, "w", encoding="UTF8") as file:
-                file.write("".join(source.splitlines(keepends=True)[: main_line - 1]))
-        except (OSError, SyntaxError) as error:
+            # keeps the generated file record up to date
+            self._write_generated_file(self.question_data.file_path, analysis.without_main_block())
+        except OSError as error:
             click.secho(f"Could not remove the local test entrypoint: {error}", fg="yellow")
 
     def generate_tests(self) -> str:
         """Generates the test file
 
+        The file is built and formatted in memory and only written if its content changed.
+
         Returns:
             str: the path to the test file
         """
@@ -123,15 +150,8 @@ class PythonHandler(FileHandler):
                 design_cases.append(self._parse_design_case(q_input, q_output))
         elif not self.question_data.function_name:
             raise ValueError("No function name")
-        full_path: str = os.path.join(
-            self.config.source_path, "tests", f"test_{self.question_data.id}{extension}"
-        )
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(
-            full_path,
-            "a",
-            encoding="UTF8",
-        ) as f:
+        test_file_path = os.path.join("tests", f"test_{self.question_data.id}{extension}")
+        with io.StringIO() as f:
             f.write("#!/usr/bin/env python\n")
             f.write("\n")
             f.write("import pytest\n")
@@ -194,10 +214,12 @@ class PythonHandler(FileHandler):
                         arguments = ", ".join(repr(value) for value in input_val)
                         call = f"solution.{input_func}({arguments})"
                         f.write("        " + self._build_assertion(call, output) + "\n")
+            content = f.getvalue()
 
-        self.run_formatter(full_path)
-
-        return os.path.join("tests", f"test_{self.question_data.id}{extension}")
+        self._write_generated_file(
+            test_file_path, content, None if self.defer_formatting else self.format_source
+        )
+        return test_file_path
 
     def _parse_design_case(
         self, raw_input: str, raw_output: str
@@ -249,16 +271,7 @@ class PythonHandler(FileHandler):
         except OSError as e:
             raise click.ClickException(f"Failed to read source file: {e}") from e
 
-        try:
-            tree = ast.parse(source)
-        except SyntaxError:
-            return source
-
-        main_line = self._find_main_block_line(tree)
-        if main_line is None:
-            return source
-
-        return "".join(source.splitlines(keepends=True)[: main_line - 1])
+        return analyze_python_source(source).without_main_block()
 
     def generate_repo(self, folder_path: str) -> None:
         """Generates a git repository
@@ -284,7 +297,7 @@ class PythonHandler(FileHandler):
             List[str]: a list of lines of code
         """
         lines = []
-        pass_after_lines = self._template_function_lines(raw_code) if not is_solution else set()
+        pass_after_lines = analyze_python_source(raw_code).def_lines if not is_solution else set()
         for line_number, line in enumerate(raw_code.splitlines(), start=1):
             lines.append(line + "\n")
             if line_number in pass_after_lines:
@@ -297,113 +310,82 @@ class PythonHandler(FileHandler):
     @staticmethod
     def _ensure_future_annotations(code_lines: list[str]) -> list[str]:
         """Defer Python 3 annotations while preserving docstrings and existing future imports."""
-        try:
-            tree = ast.parse("".join(code_lines))
-        except SyntaxError:
-            return code_lines
-
-        if any(
-            isinstance(node, ast.ImportFrom)
-            and node.module == "__future__"
-            and any(name.name == "annotations" for name in node.names)
-            for node in tree.body
-        ):
+        analysis = analyze_python_source("".join(code_lines))
+        if analysis.tree is None or analysis.has_future_annotations:
             return code_lines
 
-        insertion_line = 0
-        body_index = 0
-        if (
-            tree.body
-            and isinstance(tree.body[0], ast.Expr)
-            and isinstance(tree.body[0].value, ast.Constant)
-            and isinstance(tree.body[0].value.value, str)
-        ):
-            insertion_line = tree.body[0].end_lineno or tree.body[0].lineno
-            body_index = 1
-
-        for node in tree.body[body_index:]:
-            if not isinstance(node, ast.ImportFrom) or node.module != "__future__":
-                break
-            insertion_line = node.end_lineno or node.lineno
-
+        insertion_line = analysis.future_insertion_line
         future_lines = ["from __future__ import annotations\n"]
         if insertion_line >= len(code_lines) or code_lines[insertion_line].strip():
             future_lines.append("\n")
         return code_lines[:insertion_line] + future_lines + code_lines[insertion_line:]
 
-    def _get_template_callables(self, source: str) -> list[str]:
-        """Return callable names from a Python LeetCode template."""
-        functions: list[str] = []
-        class_stack: list[tuple[int, str]] = []
-        tokens = tokenize.generate_tokens(io.StringIO(source).readline)
-        for token in tokens:
-            if token.type == tokenize.NAME and token.string == "class":
-                class_token = next(tokens, None)
-                if class_token and class_token.type == tokenize.NAME:
-                    class_stack.append((token.start[1], class_token.string))
-            elif token.type == tokenize.NAME and token.string == "def":
-                function_token = next(tokens, None)
-                if not function_token or function_token.type != tokenize.NAME:
-                    continue
-                if function_token.string == "__init__" and class_stack:
-                    functions.append(class_stack[-1][1])
-                else:
-                    functions.append(function_token.string)
+    def _fix_imports_with_autoimport(self, source: str) -> str:
+        """Let autoimport resolve the names the built-in import table does not know
 
-        return functions
+        autoimport is slow to import and to run, so it is only loaded here and its output is
+        cached. The code is returned unchanged if autoimport is not installed.
 
-    def _template_function_lines(self, source: str) -> set[int]:
-        """Return template function line numbers that need placeholder bodies."""
-        lines: set[int] = set()
-        tokens = tokenize.generate_tokens(io.StringIO(source).readline)
-        for token in tokens:
-            if token.type != tokenize.NAME or token.string != "def":
-                continue
-            function_token = next(tokens, None)
-            if function_token and function_token.type == tokenize.NAME:
-                lines.add(token.start[0])
-        return lines
+        Args:
+            source (str): the Python code
+
+        Returns:
+            str: the code with the imports fixed by autoimport
+        """
+        format_cache = FormatCache(self.config.source_path)
+        cached = format_cache.get(AUTOIMPORT, source)
+        if cached is not None:
+            return cached
+        try:
+            from autoimport import fix_code
+        except ImportError:
+            return source
+        fixed = fix_code(source)
+        format_cache.put(AUTOIMPORT, source, fixed)
+        return fixed
 
-    def _find_main_block_line(self, tree: ast.Module) -> int | None:
-        """Return the line number of a generated __main__ block, if present."""
-        for node in tree.body:
-            if not isinstance(node, ast.If):
-                continue
-            compare = node.test
-            if not isinstance(compare, ast.Compare):
-                continue
-            if not isinstance(compare.left, ast.Name) or compare.left.id != "__name__":
-                continue
-            if len(compare.ops) != 1 or not isinstance(compare.ops[0], ast.Eq):
-                continue
-            if len(compare.comparators) != 1:
-                continue
-            comparator = compare.comparators[0]
-            if isinstance(comparator, ast.Constant) and comparator.value == "__main__":
-                return node.lineno
-        return None
-
-    def run_formatter(self, file_path: str) -> None:
-        """Run Ruff formatter if it is available.
+    def format_source(self, source: str, file_path: str) -> str:
+        """Format Python code with Ruff if it is available, without touching the disk.
+
+        The output is cached, so formatting the same code again does not run Ruff.
 
         Args:
-            file_path (str): the path to the file
+            source (str): the code to format
+            file_path (str): the path the code will be written to, used to find the Ruff
+                configuration and in messages
+
+        Returns:
+            str: the formatted code, or the original code if Ruff is missing or fails
         """
+        format_cache = FormatCache(self.config.source_path)
+        cached = format_cache.get(RUFF, source)
+        if cached is not None:
+            return cached
         if not shutil.which("ruff"):
             click.secho(f"Skipping formatting for {file_path}: ruff is not installed.", fg="yellow")
-            return
-        try:
-            subprocess.run(
-                ["ruff", "check", "--fix", "--select", "I,UP,F401", file_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-            subprocess.run(
-                ["ruff", "format", file_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            click.secho(f"Could not format {file_path}: {e}", fg="red")
+            return source
+        # ruff check exits with 1 if some issue could not be fixed, which is not an error here
+        fixed = subprocess.run(
+            [*RUFF_FIX_COMMAND, "--stdin-filename", file_path, "-"],
+            input=source,
+            capture_output=True,
+            encoding="UTF8",
+            check=False,
+        )
+        if fixed.returncode > 1:
+            click.secho(f"Could not format {file_path}: {fixed.stderr.strip()}", fg="red")
+            return source
+        formatted_run = subprocess.run(
+            [*RUFF_FORMAT_COMMAND, "--stdin-filename", file_path, "-"],
+            input=fixed.stdout,
+            capture_output=True,
+            encoding="UTF8",
+            check=False,
+        )
+        if formatted_run.returncode != 0:
+            click.secho(f"Could not format {file_path}: {formatted_run.stderr.strip()}", fg="red")
+            return source
+        formatted = formatted_run.stdout
+        format_cache.put(RUFF, source, formatted)
+        format_cache.put(RUFF, formatted, formatted)
+        return formatted
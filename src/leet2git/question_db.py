@@ -4,23 +4,53 @@ Authors:
     - Yuri Rocha (yurirocha15@gmail.com)
 """
 
+import bisect
 import json
-import operator
 import os
 import pickle
+import time
 from pickle import UnpicklingError
 
 import click
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from leet2git.config_manager import AppConfig
+from leet2git.file_lock import atomic_write, file_lock
 from leet2git.leetcode_models import TopicTag
 
 DB_DIR_NAME = ".leet2git"
 DB_FILE_NAME = "database.json"
+CATALOG_FILE_NAME = "catalog.json"
+LOCK_FILE_NAME = ".lock"
+# local state that should not be committed with the solutions
+DB_GITIGNORE_ENTRIES = [LOCK_FILE_NAME]
 LEGACY_QUESTION_DB_FILE = ".question_data.pkl"
 LEGACY_ID_TITLE_MAP_FILE = ".id_title_map.pkl"
-DB_VERSION = 1
+DB_VERSION = 2
+CATALOG_VERSION = 1
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class GeneratedFile(BaseModel):
+    """Identifies the last version of a file written by leet2git"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    # hash of the generated content, before it is formatted
+    content_hash: str = ""
+    mtime_ns: int = 0
+    size: int = 0
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Check if a file was left untouched since it was generated
+
+        Args:
+            stat (os.stat_result): the current status of the file
+
+        Returns:
+            bool: true if the file has the recorded size and modification time
+        """
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
 
 
 class QuestionData(BaseModel):
@@ -46,6 +76,8 @@ class QuestionData(BaseModel):
     outputs: list[str] = Field(default_factory=list)
     categories: list[TopicTag] = Field(default_factory=list)
     requires_custom_test_harness: bool = False
+    # generated files, by path relative to the source repository
+    generated_files: dict[str, GeneratedFile] = Field(default_factory=dict)
 
     def to_wire_inputs(self) -> str:
         """Return inputs formatted for LeetCode's test/run wire protocol."""
@@ -92,6 +124,38 @@ class DatabaseState(BaseModel):
 
     version: int = DB_VERSION
     questions: dict[int, QuestionData] = Field(default_factory=dict)
+    # only read from version 1 files, which embedded the catalog
+    id_title_map: IdTitleMap | None = Field(default=None, exclude=True)
+
+
+def local_state_dir(source_path: str, name: str) -> str:
+    """Return a directory for machine-local state, creating it if needed
+
+    The directory ignores its whole content, so caches and measurements are never
+    committed with the solutions.
+
+    Args:
+        source_path (str): the path to the source repository
+        name (str): the directory name inside the database directory
+
+    Returns:
+        str: the path to the directory
+    """
+    directory = os.path.join(source_path, DB_DIR_NAME, name)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".gitignore"), "w", encoding="UTF8") as f:
+            f.write("*\n")
+    return directory
+
+
+class CatalogState(BaseModel):
+    """Versioned persisted id/title catalog."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    version: int = CATALOG_VERSION
+    fetched_at: float = 0.0
     id_title_map: IdTitleMap = Field(default_factory=IdTitleMap)
 
 
@@ -101,27 +165,65 @@ class QuestionDB:
     def __init__(self, config: AppConfig):
         self.db_dir = os.path.join(config.source_path, DB_DIR_NAME)
         self.db_file = os.path.join(self.db_dir, DB_FILE_NAME)
+        self.catalog_file = os.path.join(self.db_dir, CATALOG_FILE_NAME)
+        self.lock_file = os.path.join(self.db_dir, LOCK_FILE_NAME)
         self.legacy_db_file = os.path.join(config.legacy_data_path, LEGACY_QUESTION_DB_FILE)
         self.legacy_id_title_map_file = os.path.join(
             config.legacy_data_path,
             LEGACY_ID_TITLE_MAP_FILE,
         )
         self.question_data_dict: dict[int, QuestionData] = {}
-        self.id_title_map: IdTitleMap = IdTitleMap()
+        self.catalog_fetched_at: float = 0.0
         self.migrated_from_legacy = False
+        self._id_title_map: IdTitleMap | None = None
+        self._catalog_dirty = False
+        self._changed_ids: set[int] = set()
+        self._deleted_ids: set[int] = set()
+        self._replace_on_save = False
+        # identity of the database file last read or written, to skip merging it unchanged
+        self._disk_stat: tuple[int, int, int] | None = None
+        # built on the first query, so commands that never query do not pay for them
+        self._indexes_built = False
+        self._creation_index: list[tuple[float, int]] = []
+        self._field_indexes: dict[str, dict[str, set[int]]] = {
+            "difficulty": {},
+            "tag": {},
+            "language": {},
+        }
+        self._file_path_index: dict[str, int] = {}
+
+    @property
+    def id_title_map(self) -> IdTitleMap:
+        """The id/title catalog, loaded from disk on first access
+
+        Returns:
+            IdTitleMap: a dictionary mapping the question id to the title slug and vice-versa
+        """
+        if self._id_title_map is None:
+            self._id_title_map = self._load_catalog()
+        return self._id_title_map
+
+    @id_title_map.setter
+    def id_title_map(self, id_title_map: IdTitleMap) -> None:
+        self._id_title_map = id_title_map
+        self._catalog_dirty = True
 
     def load(self) -> None:
         """Load the question data from disk"""
         if os.path.isfile(self.db_file):
             try:
-                with open(self.db_file, encoding="UTF8") as f:
-                    self._load_state(DatabaseState.model_validate_json(f.read()))
+                # taken before reading, so a concurrent save in between is merged later
+                disk_stat = self._db_file_stat()
+                self._load_state(self._read_database())
+                self._disk_stat = disk_stat
             except (ValidationError, json.JSONDecodeError, OSError) as e:
                 click.secho(
                     f"Warning: Failed to load database: {e}. Starting with empty database.",
                     fg="yellow",
                 )
                 raise
+            if self._catalog_dirty:
+                self.save()
 
         if os.path.isfile(self.legacy_db_file) or os.path.isfile(self.legacy_id_title_map_file):
             self._load_legacy_pickles()
@@ -133,18 +235,43 @@ class QuestionDB:
             )
 
     def save(self) -> None:
-        """Save the question data to disk"""
+        """Save the question data to disk, and the catalog if it changed
+
+        The database is locked while saving and the questions added or deleted since the
+        last load/save are merged into the current file content, so concurrent leet2git
+        processes do not overwrite each other's changes.
+        """
+        try:
+            with file_lock(self.lock_file):
+                if not self._replace_on_save:
+                    self._merge_from_disk()
+                state = DatabaseState(version=DB_VERSION, questions=self.question_data_dict)
+                content = state.model_dump_json(indent=2, by_alias=True)
+                atomic_write(self.db_file, content)
+                self._ensure_gitignore()
+                self._disk_stat = self._db_file_stat()
+                if self._catalog_dirty:
+                    self.save_catalog()
+        except OSError as e:
+            click.secho(f"Error: Failed to save database: {e}", fg="red")
+            raise
+        self._changed_ids.clear()
+        self._deleted_ids.clear()
+        self._replace_on_save = False
+
+    def save_catalog(self) -> None:
+        """Save the id/title catalog to disk"""
         try:
-            os.makedirs(self.db_dir, exist_ok=True)
-            state = DatabaseState(
-                version=DB_VERSION,
-                questions=self.question_data_dict,
+            state = CatalogState(
+                version=CATALOG_VERSION,
+                fetched_at=self.catalog_fetched_at,
                 id_title_map=self.id_title_map,
             )
-            with open(self.db_file, "w", encoding="UTF8") as f:
-                f.write(state.model_dump_json(indent=2, by_alias=True))
+            with file_lock(self.lock_file):
+                atomic_write(self.catalog_file, state.model_dump_json(by_alias=True))
+            self._catalog_dirty = False
         except OSError as e:
-            click.secho(f"Error: Failed to save database: {e}", fg="red")
+            click.secho(f"Error: Failed to save catalog: {e}", fg="red")
             raise
 
     def get_data(self) -> dict[int, QuestionData]:
@@ -174,7 +301,14 @@ class QuestionDB:
         Args:
              qd (QuestionData): The question data
         """
+        previous = self.question_data_dict.get(qd.id)
+        if previous is not None and self._indexes_built:
+            self._unindex_question(previous)
         self.question_data_dict[qd.id] = qd
+        if self._indexes_built:
+            self._index_question(qd)
+        self._changed_ids.add(qd.id)
+        self._deleted_ids.discard(qd.id)
 
     def delete_question(self, question_id: int) -> None:
         """Removes a question from the dictionary
@@ -183,7 +317,11 @@ class QuestionDB:
              question_id (int): the question id
         """
         if question_id in self.question_data_dict:
-            self.question_data_dict.pop(question_id)
+            deleted = self.question_data_dict.pop(question_id)
+            if self._indexes_built:
+                self._unindex_question(deleted)
+            self._changed_ids.discard(question_id)
+            self._deleted_ids.add(question_id)
 
     def get_questions_sorted_by_creation_time(self) -> list[QuestionData]:
         """Returns a sorted list with all the questions sorted by creation time.
@@ -191,7 +329,88 @@ class QuestionDB:
         Returns:
             List[QuestionData]: questions sorted by creation_time
         """
-        return sorted(self.question_data_dict.values(), key=operator.attrgetter("creation_time"))
+        self._build_indexes()
+        return [self.question_data_dict[question_id] for _, question_id in self._creation_index]
+
+    def get_questions_created_between(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[QuestionData]:
+        """Returns the questions created inside a time range, sorted by creation time.
+
+        Args:
+            start (float | None): inclusive lower bound timestamp. Defaults to no bound.
+            end (float | None): exclusive upper bound timestamp. Defaults to no bound.
+
+        Returns:
+            List[QuestionData]: questions with start <= creation_time < end
+        """
+        self._build_indexes()
+        low = 0 if start is None else bisect.bisect_left(self._creation_index, (start,))
+        high = (
+            len(self._creation_index)
+            if end is None
+            else bisect.bisect_left(self._creation_index, (end,))
+        )
+        return [
+            self.question_data_dict[question_id] for _, question_id in self._creation_index[low:high]
+        ]
+
+    def get_questions_created_since(self, days: float, now: float | None = None) -> list[QuestionData]:
+        """Returns the questions created in the last days, sorted by creation time.
+
+        Args:
+            days (float): how many days to look back
+            now (float | None): the reference timestamp. Defaults to the current time.
+
+        Returns:
+            List[QuestionData]: questions created in the last days
+        """
+        reference = time.time() if now is None else now
+        return self.get_questions_created_between(reference - days * SECONDS_PER_DAY)
+
+    def query(
+        self,
+        difficulty: str | None = None,
+        tag: str | None = None,
+        language: str | None = None,
+        file_path: str | None = None,
+        created_after: float | None = None,
+        created_before: float | None = None,
+    ) -> list[QuestionData]:
+        """Find the questions matching every given filter, using the secondary indexes.
+
+        Args:
+            difficulty (str | None): the difficulty, case insensitive
+            tag (str | None): a topic tag slug
+            language (str | None): the solution language
+            file_path (str | None): the source file path, relative to the source repository
+            created_after (float | None): inclusive lower bound for the creation timestamp
+            created_before (float | None): exclusive upper bound for the creation timestamp
+
+        Returns:
+            List[QuestionData]: the matching questions sorted by creation time
+        """
+        self._build_indexes()
+        candidates: list[set[int]] = []
+        for index_name, value in (("difficulty", difficulty), ("tag", tag), ("language", language)):
+            if value is not None:
+                candidates.append(self._field_indexes[index_name].get(value.lower(), set()))
+        if file_path is not None:
+            question_id = self._file_path_index.get(os.path.normpath(file_path))
+            candidates.append(set() if question_id is None else {question_id})
+
+        if not candidates:
+            return self.get_questions_created_between(created_after, created_before)
+
+        matches = set.intersection(*sorted(candidates, key=len))
+        low = float("-inf") if created_after is None else created_after
+        high = float("inf") if created_before is None else created_before
+        selected = [
+            self.question_data_dict[question_id]
+            for question_id in matches
+            if low <= self.question_data_dict[question_id].creation_time < high
+        ]
+        return sorted(selected, key=lambda qd: (qd.creation_time, qd.id))
 
     def check_if_exists(self, question_id: int) -> bool:
         """Checks if a question exists in the database
@@ -260,13 +479,70 @@ class QuestionDB:
                  a dictionary mapping the question id to the title slug and vice-versa
         """
         self.id_title_map = id_title_map
+        self.catalog_fetched_at = time.time()
 
     def reset(self) -> None:
         """Delete database"""
         self.question_data_dict: dict[int, QuestionData] = {}
-        self.id_title_map: IdTitleMap = IdTitleMap()
+        self.id_title_map = IdTitleMap()
+        self.catalog_fetched_at = 0.0
+        self._invalidate_indexes()
+        self._replace_on_save = True
         self.save()
 
+    def _index_question(self, qd: QuestionData) -> None:
+        """Insert a question into the creation time and secondary indexes."""
+        bisect.insort(self._creation_index, (qd.creation_time, qd.id))
+        for index_name, value in self._index_keys(qd):
+            self._field_indexes[index_name].setdefault(value, set()).add(qd.id)
+        if qd.file_path:
+            self._file_path_index[os.path.normpath(qd.file_path)] = qd.id
+
+    def _unindex_question(self, qd: QuestionData) -> None:
+        """Remove a question from the creation time and secondary indexes."""
+        position = bisect.bisect_left(self._creation_index, (qd.creation_time, qd.id))
+        if position < len(self._creation_index) and self._creation_index[position] == (
+            qd.creation_time,
+            qd.id,
+        ):
+            del self._creation_index[position]
+        for index_name, value in self._index_keys(qd):
+            question_ids = self._field_indexes[index_name].get(value)
+            if question_ids is not None:
+                question_ids.discard(qd.id)
+                if not question_ids:
+                    del self._field_indexes[index_name][value]
+        if qd.file_path and self._file_path_index.get(os.path.normpath(qd.file_path)) == qd.id:
+            del self._file_path_index[os.path.normpath(qd.file_path)]
+
+    @staticmethod
+    def _index_keys(qd: QuestionData) -> list[tuple[str, str]]:
+        """Return the (index name, key) pairs a question is stored under."""
+        keys = [("difficulty", qd.difficulty.lower()), ("language", qd.language.lower())]
+        keys.extend(("tag", c.slug.lower()) for c in qd.categories if c.slug)
+        return keys
+
+    def _build_indexes(self) -> None:
+        """Build every index from the question dictionary, unless they are up to date."""
+        if self._indexes_built:
+            return
+        for qd in self.question_data_dict.values():
+            for index_name, value in self._index_keys(qd):
+                self._field_indexes[index_name].setdefault(value, set()).add(qd.id)
+            if qd.file_path:
+                self._file_path_index[os.path.normpath(qd.file_path)] = qd.id
+        self._creation_index = sorted(
+            (qd.creation_time, question_id) for question_id, qd in self.question_data_dict.items()
+        )
+        self._indexes_built = True
+
+    def _invalidate_indexes(self) -> None:
+        """Drop the indexes after the question dictionary was replaced."""
+        self._indexes_built = False
+        self._creation_index = []
+        self._field_indexes = {index_name: {} for index_name in self._field_indexes}
+        self._file_path_index = {}
+
     def _load_question_data(self, raw_data: object) -> dict[int, QuestionData]:
         """Normalize legacy pickle payloads into Pydantic models."""
         if not isinstance(raw_data, dict):
@@ -292,7 +568,78 @@ class QuestionDB:
     def _load_state(self, state: DatabaseState) -> None:
         """Copy a versioned database state into this instance."""
         self.question_data_dict = state.questions
-        self.id_title_map = state.id_title_map
+        self._changed_ids.clear()
+        self._deleted_ids.clear()
+        self._invalidate_indexes()
+        if state.id_title_map is not None:
+            # version 1 embedded the catalog, it is moved to its own file on the next save
+            self.id_title_map = state.id_title_map
+
+    def _read_database(self) -> DatabaseState:
+        """Read and validate the database file."""
+        with open(self.db_file, encoding="UTF8") as f:
+            return DatabaseState.model_validate_json(f.read())
+
+    def _ensure_gitignore(self) -> None:
+        """Keep local-only database files out of the solutions repository."""
+        gitignore_file = os.path.join(self.db_dir, ".gitignore")
+        try:
+            with open(gitignore_file, encoding="UTF8") as f:
+                ignored = set(f.read().splitlines())
+        except FileNotFoundError:
+            ignored = set()
+        missing = [entry for entry in DB_GITIGNORE_ENTRIES if entry not in ignored]
+        if missing:
+            with open(gitignore_file, "a", encoding="UTF8") as f:
+                f.write("".join(entry + "\n" for entry in missing))
+
+    def _db_file_stat(self) -> tuple[int, int, int] | None:
+        """Return the inode, modification time and size of the database file, if it exists."""
+        try:
+            stat = os.stat(self.db_file)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _merge_from_disk(self) -> None:
+        """Apply the pending additions and deletions on top of the database stored on disk.
+
+        Nothing is read if the file was not replaced since this instance last read or wrote
+        it, as the questions in memory already include its content.
+        """
+        disk_stat = self._db_file_stat()
+        if disk_stat is None or disk_stat == self._disk_stat:
+            return
+        try:
+            state = self._read_database()
+        except (ValidationError, json.JSONDecodeError, OSError) as e:
+            click.secho(
+                f"Warning: Failed to read database before saving: {e}. Overwriting it.",
+                fg="yellow",
+            )
+            return
+
+        merged = state.questions
+        for question_id in self._deleted_ids:
+            merged.pop(question_id, None)
+        for question_id in self._changed_ids:
+            if question_id in self.question_data_dict:
+                merged[question_id] = self.question_data_dict[question_id]
+        self.question_data_dict = merged
+        self._invalidate_indexes()
+
+    def _load_catalog(self) -> IdTitleMap:
+        """Load the id/title catalog from disk, starting empty if it is unavailable."""
+        if not os.path.isfile(self.catalog_file):
+            return IdTitleMap()
+        try:
+            with open(self.catalog_file, encoding="UTF8") as f:
+                state = CatalogState.model_validate_json(f.read())
+        except (ValidationError, OSError) as e:
+            click.secho(f"Warning: Failed to load catalog: {e}. It will be fetched again.", fg="yellow")
+            return IdTitleMap()
+        self.catalog_fetched_at = state.fetched_at
+        return state.id_title_map
 
     def _load_legacy_pickles(self) -> None:
         """Load legacy platform-path pickle files for one-way migration."""
@@ -300,6 +647,8 @@ class QuestionDB:
             try:
                 with open(self.legacy_db_file, "rb") as f:
                     self.question_data_dict = self._load_question_data(pickle.load(f))
+                    self._invalidate_indexes()
+                    self._changed_ids.update(self.question_data_dict)
             except (UnpicklingError, EOFError) as e:
                 click.secho(
                     f"Warning: Failed to load legacy question database: {e}",
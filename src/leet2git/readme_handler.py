@@ -4,12 +4,21 @@ Authors:
     - Yuri Rocha (yurirocha15@gmail.com)
 """
 
+import hashlib
 import os
+from collections import Counter
 from dataclasses import dataclass, field
 
 from leet2git.config_manager import AppConfig
+from leet2git.file_lock import atomic_write
 from leet2git.question_db import QuestionData, QuestionDB
 
+README_PAGES_DIR = "readme"
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+_PAGE_ROOT = "../../"
+_FOOTER = "Automatically generated using \
+                    [Leet2Git](https://github.com/yurirocha15/leetcode2github).\n"
+
 
 @dataclass
 class ReadmeTable:
@@ -27,6 +36,7 @@ class ReadmeHandler:
         self.readme_file: str = os.path.join(config.source_path, "README.md")
         self.print_categories: bool = config.readme.show_category
         self.print_difficulty: bool = config.readme.show_difficulty
+        self.multi_page: bool = config.readme.multi_page
 
     def build_readme(self, question_list: list[QuestionData]) -> None:
         """Updates the README file
@@ -34,136 +44,377 @@ class ReadmeHandler:
         Args:
             question_list (List[QuestionData]): a sorted list with the question data
         """
+        main_table, category_tables, difficulty_tables = self._new_tables()
+        for question in question_list:
+            self._add_rows(question, main_table, category_tables, difficulty_tables)
 
-        category_tables: dict[str, ReadmeTable] = {}
+        if self.multi_page:
+            self.dump_pages(main_table, category_tables, difficulty_tables, question_list)
+        else:
+            self.dump_tables(main_table, category_tables, difficulty_tables)
+
+    def _new_tables(
+        self,
+    ) -> tuple[ReadmeTable, dict[str, ReadmeTable], dict[str, ReadmeTable]]:
+        """Create the empty summary, category and difficulty tables."""
         difficulty_tables: dict[str, ReadmeTable] = {
-            "Easy": ReadmeTable(
-                title='<a name="Easy"></a>Easy Questions',
-                fields=["ID", "Problem", "Leetcode ID", "Categories"],
-            ),
-            "Medium": ReadmeTable(
-                title='<a name="Medium"></a>Medium Questions',
+            difficulty: ReadmeTable(
+                title=f'<a name="{difficulty}"></a>{difficulty} Questions',
                 fields=["ID", "Problem", "Leetcode ID", "Categories"],
-            ),
-            "Hard": ReadmeTable(
-                title='<a name="Hard"></a>Hard Questions',
-                fields=["ID", "Problem", "Leetcode ID", "Categories"],
-            ),
+            )
+            for difficulty in DIFFICULTIES
         }
         main_table = ReadmeTable(
             title="Solution Summary",
             fields=["ID", "Problem", "Leetcode ID", "Categories", "Difficulty"],
         )
-        for question in question_list:
-            if self.print_difficulty:
-                difficulty_str = f"[{question.difficulty}](#{question.difficulty})"
-            else:
-                difficulty_str = question.difficulty
-            categories_str = ""
+        return main_table, {}, difficulty_tables
+
+    def _add_rows(
+        self,
+        question: QuestionData,
+        main_table: ReadmeTable,
+        category_tables: dict[str, ReadmeTable],
+        difficulty_tables: dict[str, ReadmeTable],
+    ) -> None:
+        """Add the rows of a question to every table it belongs to
+
+        Args:
+            question (QuestionData): the question data
+            main_table (ReadmeTable): the table containing all questions
+            category_tables (Dict[str, ReadmeTable]): the tables separated by category
+            difficulty_tables (Dict[str, ReadmeTable]): the tables separated by difficulty
+        """
+        problem_cell, difficulty_str, categories_str = self._question_cells(question, "")
+        if self.multi_page:
+            page_problem_cell, page_difficulty_str, page_categories_str = self._question_cells(
+                question, _PAGE_ROOT
+            )
+        else:
+            page_problem_cell, page_difficulty_str, page_categories_str = (
+                problem_cell,
+                difficulty_str,
+                categories_str,
+            )
+        id_cell = f"[{question.id}]({question.url})"
+        if self.print_categories:
             for c in question.categories:
-                if self.print_categories:
-                    categories_str += f"[{c.name}](#{c.slug}), "
-                    if c.slug not in category_tables:
-                        category_tables[c.slug] = ReadmeTable(
-                            title=f"""<a name="{c.slug}"></a>{c.name}""",
-                            fields=["ID", "Problem", "Leetcode ID", "Difficulty"],
-                        )
-                    category_tables[c.slug].values.append(
-                        [
-                            str(len(category_tables[c.slug].values) + 1),
-                            f"[{question.title}]({question.file_path})",
-                            f"[{question.id}]({question.url})",
-                            difficulty_str,
-                        ]
+                if c.slug not in category_tables:
+                    category_tables[c.slug] = ReadmeTable(
+                        title=f"""<a name="{c.slug}"></a>{c.name}""",
+                        fields=["ID", "Problem", "Leetcode ID", "Difficulty"],
                     )
-                else:
-                    categories_str += c.name + ", "
-
-            categories_str = categories_str[:-2]
-            effective_difficulty = question.difficulty or "Easy"
-            difficulty_tables[effective_difficulty].values.append(
-                [
-                    str(len(difficulty_tables[effective_difficulty].values) + 1),
-                    f"[{question.title}]({question.file_path})",
-                    f"[{question.id}]({question.url})",
-                    categories_str,
-                ]
-            )
-            main_table.values.append(
-                [
-                    str(len(main_table.values) + 1),
-                    f"[{question.title}]({question.file_path})",
-                    f"[{question.id}]({question.url})",
-                    categories_str,
-                    difficulty_str,
-                ]
+                category_tables[c.slug].values.append(
+                    [
+                        str(len(category_tables[c.slug].values) + 1),
+                        page_problem_cell,
+                        id_cell,
+                        page_difficulty_str,
+                    ]
+                )
+
+        effective_difficulty = question.difficulty or "Easy"
+        difficulty_tables[effective_difficulty].values.append(
+            [
+                str(len(difficulty_tables[effective_difficulty].values) + 1),
+                page_problem_cell,
+                id_cell,
+                page_categories_str,
+            ]
+        )
+        main_table.values.append(
+            [
+                str(len(main_table.values) + 1),
+                problem_cell,
+                id_cell,
+                categories_str,
+                difficulty_str,
+            ]
+        )
+
+    def _question_cells(self, question: QuestionData, root: str) -> tuple[str, str, str]:
+        """Build the problem, difficulty and categories cells of a question
+
+        Args:
+            question (QuestionData): the question data
+            root (str): the relative path from the file holding the table to the repository root
+
+        Returns:
+            Tuple[str, str, str]: the problem, difficulty and categories cells
+        """
+        problem_cell = f"[{question.title}]({root}{question.file_path})"
+        if self.print_difficulty:
+            difficulty_link = self._difficulty_link(question.difficulty, root)
+            difficulty_str = f"[{question.difficulty}]({difficulty_link})"
+        else:
+            difficulty_str = question.difficulty
+        if self.print_categories:
+            categories_str = ", ".join(
+                f"[{c.name}]({self._category_link(c.slug, root)})" for c in question.categories
             )
+        else:
+            categories_str = ", ".join(c.name for c in question.categories)
+        return problem_cell, difficulty_str, categories_str
+
+    def _difficulty_link(self, difficulty: str, root: str = "") -> str:
+        """Return the link to the table of a difficulty."""
+        if self.multi_page:
+            return root + _difficulty_page(difficulty or "Easy")
+        return f"#{difficulty}"
+
+    def _category_link(self, slug: str, root: str = "") -> str:
+        """Return the link to the table of a category."""
+        if self.multi_page:
+            return root + _category_page(slug)
+        return f"#{slug}"
+
+    def render_tables(
+        self,
+        main_table: ReadmeTable,
+        category_tables: dict[str, ReadmeTable],
+        difficulty_tables: dict[str, ReadmeTable],
+    ) -> str:
+        """Renders the README content
+
+        Args:
+            main_table (ReadmeTable): the table containing all questions
+            category_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by category
+            difficulty_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by difficulty
+
+        Returns:
+            str: the README content
+        """
+        parts = [
+            "# Table of Contents\n",
+            f"[{main_table.title}](#summary)  \n",
+        ]
+        if self.print_difficulty:
+            parts.append("[Difficulty](#difficulty)  \n")
+        if self.print_categories:
+            parts.append("[Categories](#categories)  \n")
+
+        parts.append(f"# <a name='summary'></a>{main_table.title}\n")
+        parts.append("\n")
+        _render_rows(parts, main_table)
+        parts.append("\n")
+        if self.print_difficulty:
+            parts.append("# <a name='difficulty'></a>Difficulty\n")
+            for difficulty in DIFFICULTIES:
+                parts.append(f"## {difficulty_tables[difficulty].title}\n")
+                parts.append("\n")
+                _render_rows(parts, difficulty_tables[difficulty])
+            parts.append("\n")
+        if self.print_categories:
+            parts.append("# <a name='categories'></a>Categories\n")
+            for _, table in sorted(category_tables.items()):
+                parts.append(f"## {table.title}\n")
+                parts.append("\n")
+                _render_rows(parts, table)
+
+        parts.append("\n")
+        parts.append("\n")
+        parts.append(_FOOTER)
+        return "".join(parts)
+
+    def render_index(self, main_table: ReadmeTable, question_list: list[QuestionData]) -> str:
+        """Renders the README content in multi-page mode
+
+        The README keeps the summary table and links to one page per difficulty and category.
+
+        Args:
+            main_table (ReadmeTable): the table containing all questions
+            question_list (List[QuestionData]): a sorted list with the question data
+
+        Returns:
+            str: the README content
+        """
+        parts = [
+            "# Table of Contents\n",
+            f"[{main_table.title}](#summary)  \n",
+        ]
+        if self.print_difficulty:
+            parts.append("[Difficulty](#difficulty)  \n")
+        if self.print_categories:
+            parts.append("[Categories](#categories)  \n")
+
+        parts.append(f"# <a name='summary'></a>{main_table.title}\n")
+        parts.append("\n")
+        _render_rows(parts, main_table)
+        parts.append("\n")
+        if self.print_difficulty:
+            difficulty_counts = Counter(question.difficulty or "Easy" for question in question_list)
+            parts.append("# <a name='difficulty'></a>Difficulty\n")
+            parts.append("\n")
+            for difficulty in DIFFICULTIES:
+                parts.append(
+                    f"- [{difficulty} Questions]({_difficulty_page(difficulty)}) "
+                    f"({difficulty_counts[difficulty]})\n"
+                )
+            parts.append("\n")
+        if self.print_categories:
+            category_names: dict[str, str] = {}
+            category_counts: Counter[str] = Counter()
+            for question in question_list:
+                for c in question.categories:
+                    category_names.setdefault(c.slug, c.name)
+                    category_counts[c.slug] += 1
+            parts.append("# <a name='categories'></a>Categories\n")
+            parts.append("\n")
+            for slug in sorted(category_names):
+                parts.append(
+                    f"- [{category_names[slug]}]({_category_page(slug)}) ({category_counts[slug]})\n"
+                )
 
-        self.dump_tables(main_table, category_tables, difficulty_tables)
+        parts.append("\n")
+        parts.append("\n")
+        parts.append(_FOOTER)
+        return "".join(parts)
+
+    def render_page(self, table: ReadmeTable) -> str:
+        """Renders a difficulty or category page in multi-page mode
+
+        Args:
+            table (ReadmeTable): the table listed in the page
+
+        Returns:
+            str: the page content
+        """
+        parts = [f"# {table.title}\n", "\n", "[Back to the summary](../../README.md)\n", "\n"]
+        _render_rows(parts, table)
+        parts.append("\n")
+        parts.append("\n")
+        parts.append(_FOOTER)
+        return "".join(parts)
 
     def dump_tables(
         self,
         main_table: ReadmeTable,
         category_tables: dict[str, ReadmeTable],
         difficulty_tables: dict[str, ReadmeTable],
-    ):
+    ) -> bool:
         """Generates the README file
 
+        The file is only replaced if its content changed, so an unchanged README keeps its
+        modification time and does not show up in git.
+
         Args:
             main_table (ReadmeTable): the table containing all questions
             category_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by category
             difficulty_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by difficulty
+
+        Pages left by the multi-page mode are removed, as the README lists every table.
+
+        Returns:
+            bool: whether the README file was written or a page was removed
         """
-        with open(self.readme_file, "w", encoding="UTF8") as f:
-            f.write("# Table of Contents\n")
-            f.write(f"[{main_table.title}](#summary)  \n")
-            if self.print_difficulty:
-                f.write("[Difficulty](#difficulty)  \n")
-            if self.print_categories:
-                f.write("[Categories](#categories)  \n")
-
-            f.write(f"# <a name='summary'></a>{main_table.title}\n")
-            f.write("\n")
-            f.write("|" + "|".join(main_table.fields) + "|\n")
-            f.write("|:--:|" + "|".join(["--" for _ in range(len(main_table.fields) - 1)]) + "|\n")
-
-            for value in main_table.values:
-                f.write("|" + "|".join(value) + "|\n")
-
-            f.write("\n")
-            if self.print_difficulty:
-                f.write("# <a name='difficulty'></a>Difficulty\n")
-                for difficulty in ("Easy", "Medium", "Hard"):
-                    f.write(f"## {difficulty_tables[difficulty].title}\n")
-                    f.write("\n")
-                    f.write("|" + "|".join(difficulty_tables[difficulty].fields) + "|\n")
-                    f.write(
-                        "|:--:|"
-                        + "|".join(["--" for _ in range(len(difficulty_tables[difficulty].fields) - 1)])
-                        + "|\n"
-                    )
-                    for value in difficulty_tables[difficulty].values:
-                        f.write("|" + "|".join(value) + "|\n")
-
-                f.write("\n")
-            if self.print_categories:
-                f.write("# <a name='categories'></a>Categories\n")
-                for table in sorted(category_tables.items()):
-                    f.write(f"## {table[1].title}\n")
-                    f.write("\n")
-                    f.write("|" + "|".join(table[1].fields) + "|\n")
-                    f.write(
-                        "|:--:|" + "|".join(["--" for _ in range(len(table[1].fields) - 1)]) + "|\n"
-                    )
-                    for value in table[1].values:
-                        f.write("|" + "|".join(value) + "|\n")
+        content = self.render_tables(main_table, category_tables, difficulty_tables)
+        written = write_if_changed(self.readme_file, content.encode("UTF8"))
+        return self._remove_stale_pages(set()) or written
 
-            f.write("\n")
-            f.write("\n")
-            f.write(
-                "Automatically generated using \
-                    [Leet2Git](https://github.com/yurirocha15/leetcode2github).\n"
-            )
+    def dump_pages(
+        self,
+        main_table: ReadmeTable,
+        category_tables: dict[str, ReadmeTable],
+        difficulty_tables: dict[str, ReadmeTable],
+        question_list: list[QuestionData],
+    ) -> bool:
+        """Generates the README index and its difficulty and category pages
+
+        Args:
+            main_table (ReadmeTable): the table containing all questions
+            category_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by category
+            difficulty_tables (Dict[str, ReadmeTable]): a dictionary with tables separated by difficulty
+            question_list (List[QuestionData]): a sorted list with the question data
+
+        Returns:
+            bool: whether any file was written or removed
+        """
+        source_path = os.path.dirname(self.readme_file)
+        written = write_if_changed(
+            self.readme_file, self.render_index(main_table, question_list).encode("UTF8")
+        )
+
+        pages: dict[str, ReadmeTable] = {}
+        if self.print_difficulty:
+            for difficulty in DIFFICULTIES:
+                pages[_difficulty_page(difficulty)] = difficulty_tables[difficulty]
+        if self.print_categories:
+            for slug, table in category_tables.items():
+                pages[_category_page(slug)] = table
+        for page, table in pages.items():
+            content = self.render_page(table).encode("UTF8")
+            written |= write_if_changed(os.path.join(source_path, page), content)
+        return self._remove_stale_pages(set(pages)) or written
+
+    def _remove_stale_pages(self, pages: set[str]) -> bool:
+        """Remove the difficulty and category pages that are no longer generated
+
+        The page directories are removed once they are empty.
+
+        Args:
+            pages (Set[str]): the generated pages, relative to the repository root
+
+        Returns:
+            bool: whether any page was removed
+        """
+        source_path = os.path.dirname(self.readme_file)
+        removed = False
+        for kind in ("difficulty", "categories"):
+            directory = os.path.join(source_path, README_PAGES_DIR, kind)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(".md") and f"{README_PAGES_DIR}/{kind}/{name}" not in pages:
+                    try:
+                        os.remove(os.path.join(directory, name))
+                        removed = True
+                    except FileNotFoundError:
+                        pass
+            if not os.listdir(directory):
+                os.rmdir(directory)
+        pages_dir = os.path.join(source_path, README_PAGES_DIR)
+        if os.path.isdir(pages_dir) and not os.listdir(pages_dir):
+            os.rmdir(pages_dir)
+        return removed
+
+
+def write_if_changed(file_path: str, content: bytes) -> bool:
+    """Atomically replace a file, unless it already has the given content
+
+    Args:
+        file_path (str): the path to the file
+        content (bytes): the new file content
+
+    Returns:
+        bool: whether the file was written
+    """
+    try:
+        if os.path.getsize(file_path) == len(content):
+            with open(file_path, "rb") as f:
+                current_digest = hashlib.sha256(f.read()).digest()
+            if current_digest == hashlib.sha256(content).digest():
+                return False
+    except OSError:
+        pass
+    atomic_write(file_path, content)
+    return True
+
+
+def _difficulty_page(difficulty: str) -> str:
+    """Return the path of a difficulty page, relative to the repository root."""
+    return f"{README_PAGES_DIR}/difficulty/{difficulty}.md"
+
+
+def _category_page(slug: str) -> str:
+    """Return the path of a category page, relative to the repository root."""
+    return f"{README_PAGES_DIR}/categories/{slug}.md"
+
+
+def _render_rows(parts: list[str], table: ReadmeTable) -> None:
+    """Append the header, alignment row and rows of a table to the output parts."""
+    parts.append("|" + "|".join(table.fields) + "|\n")
+    parts.append("|:--:|" + "|".join(["--" for _ in range(len(table.fields) - 1)]) + "|\n")
+    parts.extend("|" + "|".join(value) + "|\n" for value in table.values)
 
 
 if __name__ == "__main__":
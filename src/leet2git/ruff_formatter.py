@@ -0,0 +1,145 @@
+"""
+Formats the generated Python files with a few Ruff runs
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import os
+import shutil
+import subprocess
+from collections.abc import Sequence
+
+import click
+
+from leet2git.file_lock import atomic_write
+from leet2git.format_cache import RUFF, FormatCache
+from leet2git.question_db import QuestionData
+
+RUFF_FIX_COMMAND = ["ruff", "check", "--fix", "--select", "I,UP,F401"]
+RUFF_FORMAT_COMMAND = ["ruff", "format"]
+# keeps every command line far below the Windows limit of 32k characters
+FORMAT_CHUNK_SIZE = 100
+
+
+def format_files(file_paths: Sequence[str]) -> bool:
+    """Fix the imports and format Python files, running Ruff once per chunk of files
+
+    Args:
+        file_paths (Sequence[str]): the paths to the files
+
+    Returns:
+        bool: whether every file was formatted
+    """
+    if not file_paths:
+        return True
+    if not shutil.which("ruff"):
+        click.secho(
+            f"Skipping formatting for {len(file_paths)} files: ruff is not installed.", fg="yellow"
+        )
+        return False
+    success = True
+    for start in range(0, len(file_paths), FORMAT_CHUNK_SIZE):
+        chunk = list(file_paths[start : start + FORMAT_CHUNK_SIZE])
+        # ruff check exits with 1 if some issue could not be fixed, which is not an error here.
+        # A file Ruff cannot parse is reported and the others are still formatted.
+        fix_result = _run_ruff(RUFF_FIX_COMMAND, chunk)
+        format_result = _run_ruff(RUFF_FORMAT_COMMAND, chunk)
+        for result in (fix_result, format_result):
+            if result.returncode > (1 if result is fix_result else 0):
+                click.secho(f"Could not format every file: {result.stderr.strip()}", fg="red")
+                success = False
+    return success
+
+
+def _run_ruff(command: list[str], file_paths: list[str]) -> subprocess.CompletedProcess[str]:
+    """Run a Ruff command on some files, capturing its error output."""
+    return subprocess.run(
+        [*command, *file_paths],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="UTF8",
+        check=False,
+    )
+
+
+class FormatQueue:
+    """Collects the generated Python files to format them all at once"""
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        self.file_paths: list[str] = []
+        self.format_cache = FormatCache(source_path)
+        self._generated_files: list[tuple[QuestionData, str]] = []
+
+    def add_question(self, question: QuestionData) -> None:
+        """Queue the Python source and test files of a question
+
+        Generated files that were edited since they were generated are kept as they are,
+        so they are not queued.
+
+        Args:
+            question (QuestionData): the question data
+        """
+        for file_path in (question.file_path, question.test_file_path):
+            if not file_path.endswith(".py"):
+                continue
+            full_path = os.path.join(self.source_path, file_path)
+            record = question.generated_files.get(file_path)
+            try:
+                if record is not None and not record.matches(os.stat(full_path)):
+                    continue
+            except OSError:
+                continue
+            self.file_paths.append(full_path)
+            self._generated_files.append((question, file_path))
+
+    def flush(self) -> None:
+        """Format the queued files that still exist
+
+        Files whose formatted version is cached are rewritten from the cache, the others
+        are formatted by Ruff and added to the cache. The generated file records of the
+        questions are updated, so formatted files are not taken for local edits.
+        """
+        pending: dict[str, str] = {}
+        for file_path in dict.fromkeys(self.file_paths):
+            source = _read_text(file_path)
+            if source is None:
+                continue
+            cached = self.format_cache.get(RUFF, source)
+            if cached is None:
+                pending[file_path] = source
+            elif cached != source:
+                atomic_write(file_path, cached)
+        self.file_paths.clear()
+
+        if format_files(list(pending)):
+            for file_path, source in pending.items():
+                formatted = _read_text(file_path)
+                if formatted is not None:
+                    self.format_cache.put(RUFF, source, formatted)
+                    # formatting is idempotent, so an unchanged file is not formatted again
+                    self.format_cache.put(RUFF, formatted, formatted)
+        self._update_generated_files()
+
+    def _update_generated_files(self) -> None:
+        """Record the size and modification time of the formatted files."""
+        for question, file_path in self._generated_files:
+            record = question.generated_files.get(file_path)
+            if record is None:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.source_path, file_path))
+            except OSError:
+                continue
+            record.mtime_ns = stat.st_mtime_ns
+            record.size = stat.st_size
+        self._generated_files.clear()
+
+
+def _read_text(file_path: str) -> str | None:
+    """Read a text file, or return None if it cannot be read."""
+    try:
+        with open(file_path, encoding="UTF8", newline="") as f:
+            return f.read()
+    except OSError:
+        return None
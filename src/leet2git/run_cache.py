@@ -0,0 +1,103 @@
+"""
+Caches the results of the runs on LeetCode servers
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import hashlib
+import time
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from leet2git.leetcode_models import SubmissionResultResponse
+from leet2git.local_judge import ACCEPTED, COMPILE_ERROR, RUNTIME_ERROR, WRONG_ANSWER
+from leet2git.state_store import JsonStateStore
+
+RUN_CACHE_DIR_NAME = "run_cache"
+RUN_CACHE_VERSION = 1
+# results kept for each question
+MAX_CACHED_RUNS = 20
+# the verdicts that the same code always gets on the same inputs. Time and memory limits
+# depend on the load of the servers, and the other codes are internal or unknown errors.
+CACHED_STATUS_CODES = frozenset({ACCEPTED, WRONG_ANSWER, RUNTIME_ERROR, COMPILE_ERROR})
+
+
+class CachedRun(BaseModel):
+    """The result of a run on LeetCode servers"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    timestamp: float = 0.0
+    result: SubmissionResultResponse
+
+
+class RunCacheFile(BaseModel):
+    """Versioned cached runs of a question, by run key"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    version: int = RUN_CACHE_VERSION
+    runs: dict[str, CachedRun] = Field(default_factory=dict)
+
+
+def run_key(language: str, code: str, test_input: str) -> str:
+    """Return the key of a run, which changes with the code or the inputs
+
+    Args:
+        language (str): the language of the code
+        code (str): the submitted code
+        test_input (str): the inputs in the LeetCode wire format
+
+    Returns:
+        str: the key
+    """
+    code_hash = hashlib.sha256(code.encode("UTF8")).hexdigest()
+    input_hash = hashlib.sha256(test_input.encode("UTF8")).hexdigest()
+    return f"{language}:{code_hash}:{input_hash}"
+
+
+class RunCache(JsonStateStore[RunCacheFile]):
+    """Stores the results of the runs of each question in the local state directory
+
+    A run of the same code on the same inputs gives the same result, so it does not need
+    another round trip to LeetCode. Only the results with a verdict in CACHED_STATUS_CODES
+    are cached.
+    """
+
+    dir_name = RUN_CACHE_DIR_NAME
+    state_type = RunCacheFile
+
+    def get(self, question_id: int, key: str) -> CachedRun | None:
+        """Return the cached result of a run
+
+        Args:
+            question_id (int): the question id
+            key (str): the run key
+
+        Returns:
+            CachedRun | None: the cached result, or None
+        """
+        cached = self.load(question_id).runs.get(key)
+        if cached is None or cached.result.status_code not in CACHED_STATUS_CODES:
+            return None
+        return cached
+
+    def add(self, question_id: int, key: str, result: SubmissionResultResponse) -> bool:
+        """Cache the result of a run, dropping the oldest results beyond the limit
+
+        Args:
+            question_id (int): the question id
+            key (str): the run key
+            result (SubmissionResultResponse): the finished run
+
+        Returns:
+            bool: whether the result was cached, which it is not if its verdict may change
+        """
+        if result.status_code not in CACHED_STATUS_CODES:
+            return False
+        cache = self.load(question_id)
+        runs = {**cache.runs, key: CachedRun(timestamp=time.time(), result=result)}
+        newest = sorted(runs, key=lambda run: runs[run].timestamp)[-MAX_CACHED_RUNS:]
+        cache.runs = {run: runs[run] for run in newest}
+        self.save(question_id, cache)
+        return True
@@ -0,0 +1,251 @@
+"""
+Loads the generated Python solutions and calls them on LeetCode inputs
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import copy
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from types import ModuleType
+
+from leet2git.question_db import QuestionData
+from leet2git.test_harness import get_local_test_limitation
+
+PYTHON_LANGUAGES = ("python", "python3")
+FLOAT_TOLERANCE = 1e-5
+
+
+class SolutionError(Exception):
+    """Raised when a solution cannot be loaded or called locally"""
+
+
+@dataclass
+class SolutionVariant:
+    """A solution of a question, called through one of its classes"""
+
+    name: str
+    module: ModuleType
+    class_name: str
+
+
+def parse_input(raw_input: str) -> list[object]:
+    """Parse the arguments of one LeetCode example input
+
+    Args:
+        raw_input (str): the arguments as JSON values separated by commas, e.g. "[2,7], 9"
+
+    Raises:
+        SolutionError: if the input is not valid JSON
+
+    Returns:
+        List[object]: the arguments
+    """
+    try:
+        arguments = json.loads(f"[{raw_input}]")
+    except json.JSONDecodeError as e:
+        raise SolutionError(f"Could not parse the input {raw_input!r}: {e}") from e
+    return arguments
+
+
+def parse_inputs(question: QuestionData, extra_inputs: Iterable[str] = ()) -> list[list[object]]:
+    """Parse the example inputs of a question followed by the extra inputs
+
+    Args:
+        question (QuestionData): the question data
+        extra_inputs (Iterable[str], optional): more inputs in the LeetCode format
+
+    Returns:
+        List[List[object]]: the arguments of each input
+    """
+    return [parse_input(raw_input) for raw_input in [*question.inputs, *extra_inputs]]
+
+
+def check_local_support(question: QuestionData) -> None:
+    """Check that the solution of a question can run locally
+
+    Args:
+        question (QuestionData): the question data
+
+    Raises:
+        SolutionError: if the question cannot run locally
+    """
+    if question.language not in PYTHON_LANGUAGES:
+        raise SolutionError(f"Only Python solutions can run locally, not {question.language}.")
+    limitation = get_local_test_limitation(question)
+    if limitation:
+        raise SolutionError(f"The question {question.id} cannot run locally: {limitation}.")
+    if not question.function_name:
+        raise SolutionError(f"The question {question.id} has no known function name.")
+
+
+def load_solution_module(source_path: str, question: QuestionData) -> ModuleType:
+    """Import the source file of a question
+
+    Args:
+        source_path (str): the path to the source repository
+        question (QuestionData): the question data
+
+    Raises:
+        SolutionError: if the question cannot run locally or its source cannot be imported
+
+    Returns:
+        ModuleType: the imported source file
+    """
+    check_local_support(question)
+    return _import_file(
+        os.path.join(source_path, question.file_path), f"leet2git_solution_{question.id}"
+    )
+
+
+def load_variant(
+    source_path: str, question: QuestionData, module: ModuleType, variant: str
+) -> SolutionVariant:
+    """Find another solution of a question, to compare it with the main one
+
+    Args:
+        source_path (str): the path to the source repository
+        question (QuestionData): the question data
+        module (ModuleType): the imported source file of the question
+        variant (str): a class of the source file, e.g. "SolutionHeap", a Python file with
+            a class named as the main one, or both, e.g. "drafts/two_sum.py:SolutionDP".
+            Relative file paths start at the source repository.
+
+    Raises:
+        SolutionError: if the file cannot be imported or the class does not exist
+
+    Returns:
+        SolutionVariant: the variant
+    """
+    if variant.endswith(".py"):
+        file_path, class_name = variant, ""
+    else:
+        file_path, _, class_name = variant.rpartition(":")
+    class_name = class_name or main_class_name(question)
+    if file_path:
+        full_path = os.path.join(source_path, os.path.expanduser(file_path))
+        digest = hashlib.sha256(os.path.abspath(full_path).encode("UTF8")).hexdigest()[:12]
+        module = _import_file(full_path, f"leet2git_variant_{question.id}_{digest}")
+    _get_attribute(module, class_name)
+    return SolutionVariant(variant, module, class_name)
+
+
+def main_class_name(question: QuestionData) -> str:
+    """Return the class LeetCode calls, Solution or the class of a design problem
+
+    Args:
+        question (QuestionData): the question data
+
+    Returns:
+        str: the class name
+    """
+    return "Solution" if len(question.function_name) == 1 else question.function_name[0]
+
+
+def _import_file(file_path: str, module_name: str) -> ModuleType:
+    """Import a Python file under a module name."""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if spec is None or spec.loader is None:
+        raise SolutionError(f"Could not load {file_path}.")
+    module = importlib.util.module_from_spec(spec)
+    # registered before running, as in a normal import, for dataclasses and pickling
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        del sys.modules[module_name]
+        raise SolutionError(f"Could not import {file_path}: {type(e).__name__}: {e}") from e
+    return module
+
+
+def prepare_call(
+    module: ModuleType,
+    question: QuestionData,
+    arguments: list[object],
+    class_name: str = "",
+) -> Callable[[], object]:
+    """Build a call of the solution on fresh copies of the arguments
+
+    As in LeetCode, every call uses a new Solution instance. Design problems construct
+    their class and call each method in order, returning the list of outputs.
+
+    Args:
+        module (ModuleType): the imported source file
+        question (QuestionData): the question data
+        arguments (List[object]): the parsed input
+        class_name (str, optional): the class to call instead of Solution or the class of
+            the design problem. Defaults to "".
+
+    Raises:
+        SolutionError: if the solution class or method does not exist
+
+    Returns:
+        Callable[[], object]: runs the solution once and returns its output
+    """
+    arguments = copy.deepcopy(arguments)
+    solution_class = _get_attribute(module, class_name or main_class_name(question))
+    if len(question.function_name) == 1:
+        method = _get_attribute(solution_class(), question.function_name[0])
+        return lambda: method(*arguments)
+
+    constructor = solution_class
+    method_names, method_arguments = arguments if len(arguments) == 2 else (None, None)
+    if not isinstance(method_names, list) or not isinstance(method_arguments, list):
+        raise SolutionError("A design problem input must contain method and argument lists.")
+
+    def run_design() -> list[object]:
+        instance = constructor(*method_arguments[0])
+        outputs: list[object] = [None]
+        for method_name, values in zip(method_names[1:], method_arguments[1:], strict=True):
+            outputs.append(getattr(instance, method_name)(*values))
+        return outputs
+
+    return run_design
+
+
+def normalize_output(output: object) -> object:
+    """Convert an output to the JSON values LeetCode compares, e.g. tuples to lists
+
+    Args:
+        output (object): the output of a solution
+
+    Returns:
+        object: the output after a JSON round trip, with unknown objects as their repr
+    """
+    return json.loads(json.dumps(output, default=repr))
+
+
+def same_value(output: object, expected: object) -> bool:
+    """Compare two JSON values, with floats equal within 1e-5 as on LeetCode
+
+    Args:
+        output (object): the output
+        expected (object): the expected output
+
+    Returns:
+        bool: whether they are equal
+    """
+    if isinstance(output, list) and isinstance(expected, list):
+        return len(output) == len(expected) and all(
+            same_value(item, expected_item)
+            for item, expected_item in zip(output, expected, strict=True)
+        )
+    if isinstance(output, bool) or isinstance(expected, bool):
+        return type(output) is type(expected) and output == expected
+    if isinstance(output, (int, float)) and isinstance(expected, (int, float)):
+        return math.isclose(output, expected, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+    return output == expected
+
+
+def _get_attribute(owner: object, name: str) -> Callable[..., object]:
+    """Return a callable attribute, with a clear error if it is missing."""
+    attribute = getattr(owner, name, None)
+    if not callable(attribute):
+        raise SolutionError(f"Could not find {name} in the solution.")
+    return attribute
@@ -0,0 +1,139 @@
+"""
+Stores the local state of the commands, such as benchmark runs or cached results
+Authors:
+    - Yuri Rocha (yurirocha15@gmail.com)
+"""
+
+import os
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from leet2git.file_lock import atomic_write
+from leet2git.question_db import DB_DIR_NAME, local_state_dir
+
+
+class StoredRun(BaseModel):
+    """A stored run of a question, compared with the later runs on the same inputs"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    timestamp: float = 0.0
+    code_hash: str = ""
+    inputs_hash: str = ""
+
+
+RunT = TypeVar("RunT", bound=StoredRun)
+StateT = TypeVar("StateT", bound=BaseModel)
+
+
+class RunHistory(BaseModel, Generic[RunT]):
+    """Versioned persisted runs of a question"""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    version: int = 1
+    runs: list[RunT] = Field(default_factory=list)
+
+
+class LocalStateStore:
+    """Stores files in a directory of the local state, which git ignores
+
+    Subclasses set the name of their directory in dir_name.
+    """
+
+    dir_name = ""
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        self.store_dir = os.path.join(source_path, DB_DIR_NAME, self.dir_name)
+
+    def _write(self, file_name: str, content: str | bytes) -> str:
+        """Write a file of the store atomically, creating the directory if needed
+
+        Args:
+            file_name (str): the path of the file, relative to the store directory
+            content (str | bytes): the new content
+
+        Returns:
+            str: the path of the file
+        """
+        local_state_dir(self.source_path, self.dir_name)
+        file_path = os.path.join(self.store_dir, file_name)
+        atomic_write(file_path, content)
+        return file_path
+
+
+class JsonStateStore(LocalStateStore, Generic[StateT]):
+    """Stores one versioned model per key, e.g. per question id, as JSON
+
+    Subclasses set the model in state_type. A missing or unreadable file loads as the
+    default model, so a new version of the model only needs a new version number.
+    """
+
+    state_type: type[StateT]
+
+    def load(self, key: int | str) -> StateT:
+        """Load the state of a key
+
+        Args:
+            key (int | str): the key, e.g. a question id
+
+        Returns:
+            StateT: the stored state, or the default one
+        """
+        default = self.state_type()
+        try:
+            with open(self._state_file(key), encoding="UTF8") as f:
+                state = self.state_type.model_validate_json(f.read())
+        except (OSError, ValidationError):
+            return default
+        # the fields of another version may have another meaning
+        if getattr(state, "version", None) != getattr(default, "version", None):
+            return default
+        return state
+
+    def save(self, key: int | str, state: StateT) -> None:
+        """Store the state of a key
+
+        Args:
+            key (int | str): the key, e.g. a question id
+            state (StateT): the new state
+        """
+        self._write(f"{key}.json", state.model_dump_json(indent=2))
+
+    def _state_file(self, key: int | str) -> str:
+        """Return the path of the state of a key."""
+        return os.path.join(self.store_dir, f"{key}.json")
+
+
+class RunHistoryStore(JsonStateStore[RunHistory[RunT]], Generic[RunT]):
+    """Stores the runs of each question, keeping the last max_runs ones"""
+
+    max_runs = 50
+
+    def previous_run(self, question_id: int, inputs_hash: str) -> RunT | None:
+        """Return the last run of a question on the same inputs
+
+        Args:
+            question_id (int): the question id
+            inputs_hash (str): the hash of the inputs
+
+        Returns:
+            RunT | None: the last comparable run, or None
+        """
+        for run in reversed(self.load(question_id).runs):
+            if run.inputs_hash == inputs_hash:
+                return run
+        return None
+
+    def add_run(self, question_id: int, run: RunT) -> None:
+        """Store a new run of a question, dropping the oldest runs beyond the limit
+
+        Args:
+            question_id (int): the question id
+            run (RunT): the new run
+        """
+        history = self.load(question_id)
+        history.runs = [*history.runs, run][-self.max_runs :]
+        self.save(question_id, history)
@@ -0,0 +1,21 @@
+import pytest
+
+from leet2git.question_db import QuestionData
+
+
+@pytest.fixture
+def write_solution(tmp_path):
+    """Write a solution file under tmp_path/src and return the data of its question"""
+
+    def write(code, *function_name, file_name="leetcode_1_sample.py", **fields):
+        (tmp_path / "src").mkdir(exist_ok=True)
+        (tmp_path / "src" / file_name).write_text(code)
+        return QuestionData(
+            id=1,
+            language="python3",
+            file_path=f"src/{file_name}",
+            function_name=list(function_name),
+            **fields,
+        )
+
+    return write
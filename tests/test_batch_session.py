@@ -0,0 +1,72 @@
+import pytest
+
+from leet2git.batch_session import BatchSession
+from leet2git.question_db import QuestionData
+
+
+class FakeQuestionDB:
+    def __init__(self):
+        self.save_count = 0
+
+    def save(self):
+        self.save_count += 1
+
+    def get_questions_sorted_by_creation_time(self):
+        return [QuestionData(id=1)]
+
+
+class FakeReadmeHandler:
+    def __init__(self):
+        self.updates = []
+
+    def build_readme(self, question_list):
+        self.updates.append([question.id for question in question_list])
+
+
+class FakeFormatCache:
+    def __init__(self):
+        self.pruned = []
+
+    def prune(self, questions):
+        self.pruned.append([question.id for question in questions])
+        return 0
+
+
+def test_batch_session_flushes_once_on_exit():
+    qdb = FakeQuestionDB()
+    readme_handler = FakeReadmeHandler()
+    format_cache = FakeFormatCache()
+
+    with BatchSession(qdb, readme_handler, format_cache=format_cache) as session:
+        session.mark_changed(3)
+        session.mark_changed(1)
+        session.mark_changed(3)
+        assert qdb.save_count == 0
+
+    assert qdb.save_count == 1
+    assert readme_handler.updates == [[1]]
+    assert format_cache.pruned == [[1]]
+    assert not session.flush()
+
+
+def test_batch_session_skips_flush_without_changes():
+    qdb = FakeQuestionDB()
+    readme_handler = FakeReadmeHandler()
+
+    with BatchSession(qdb, readme_handler):
+        pass
+
+    assert qdb.save_count == 0
+    assert readme_handler.updates == []
+
+
+def test_batch_session_keeps_completed_changes_on_error():
+    qdb = FakeQuestionDB()
+    readme_handler = FakeReadmeHandler()
+
+    with pytest.raises(RuntimeError), BatchSession(qdb, readme_handler) as session:
+        session.mark_changed(2)
+        raise RuntimeError("interrupted")
+
+    assert qdb.save_count == 1
+    assert readme_handler.updates == [[1]]
@@ -0,0 +1,59 @@
+from leet2git.benchmark import (
+    BenchmarkRun,
+    BenchmarkStore,
+    benchmark_inputs,
+    format_duration,
+    hash_inputs,
+    measure,
+    relative_change,
+    summarize,
+)
+
+
+def test_measure_prepares_each_call_and_reports_peak_memory():
+    prepared = []
+
+    def prepare():
+        prepared.append(True)
+        return lambda: bytearray(1_000_000)
+
+    timings, peak_memory = measure(prepare, repeat=5, warmup=2)
+
+    assert len(timings) == 5
+    assert len(prepared) == 8
+    assert peak_memory >= 1_000_000
+
+
+def test_summarize_and_benchmark_inputs():
+    stats = summarize([float(value) for value in range(20, 0, -1)], 7)
+
+    assert (stats.min, stats.median, stats.p95, stats.peak_memory) == (1.0, 10.5, 19.0, 7)
+    input_stats, total = benchmark_inputs(lambda arguments: lambda: sum(arguments), [[1], [2]], 3, 0)
+    assert len(input_stats) == 2
+    assert total.min >= max(stats.min for stats in input_stats)
+
+
+def test_store_keeps_runs_and_finds_previous_run_on_same_inputs(tmp_path):
+    store = BenchmarkStore(str(tmp_path))
+    store.max_runs = 2
+    inputs_hash = hash_inputs([[[1, 2], 3]])
+
+    assert store.previous_run(1, inputs_hash) is None
+    store.add_run(1, BenchmarkRun(inputs_hash=inputs_hash, median=1.0))
+    store.add_run(1, BenchmarkRun(inputs_hash=inputs_hash, median=2.0))
+    store.add_run(1, BenchmarkRun(inputs_hash="other", median=3.0))
+
+    assert [run.median for run in store.load(1).runs] == [2.0, 3.0]
+    previous = store.previous_run(1, inputs_hash)
+    assert previous is not None and previous.median == 2.0
+    assert (tmp_path / ".leet2git" / "benchmarks" / ".gitignore").exists()
+
+
+def test_relative_change_and_format_duration():
+    assert relative_change(1.5, 1.0) == 0.5
+    assert relative_change(1.0, 0.0) == 0.0
+    assert [format_duration(value) for value in (2.0, 0.0125, 0.0000042)] == [
+        "2.000 s",
+        "12.500 ms",
+        "4.2 us",
+    ]
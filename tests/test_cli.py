@@ -1,10 +1,14 @@
+import json
+import time
+
+import pytest
 from click.testing import CliRunner
 
 from leet2git.config_manager import AppConfig
 from leet2git.leet2git import leet2git
 from leet2git.leetcode_client import LeetcodeAPIError, LeetcodeAuthError
-from leet2git.leetcode_models import SubmissionListResponse
-from leet2git.question_db import IdTitleMap, QuestionData
+from leet2git.leetcode_models import SubmissionListResponse, SubmissionResultResponse
+from leet2git.question_db import IdTitleMap, QuestionData, QuestionDB, TopicTag
 
 
 class FakeConfigManager:
@@ -62,6 +66,51 @@ def test_get_skips_existing_question(monkeypatch):
     assert "Question already imported" in result.output
 
 
+def test_get_force_regenerates_files_and_keeps_local_edits(monkeypatch, tmp_path):
+    templates = ["class Solution:\n    def twoSum(self, nums, target):\n"]
+
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(source_path=str(tmp_path), test_code={"generate_tests": False})
+
+    class FakeClient:
+        def get_id_title_map(self):
+            return IdTitleMap(id_to_title={1: "two-sum"}, title_to_id={"two-sum": 1})
+
+        def get_question_data(self, question_id, title_slug, language, code):
+            return QuestionData(
+                id=question_id,
+                title="Two Sum",
+                title_slug=title_slug,
+                difficulty="Easy",
+                url="https://leetcode.com/problems/two-sum",
+                file_path="src/leetcode_1_two_sum",
+                question_template=templates[-1],
+                raw_code=code,
+            )
+
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FakeClient)
+    source_file = tmp_path / "src" / "leetcode_1_two_sum.py"
+    runner = CliRunner()
+
+    assert runner.invoke(leet2git, ["get", "1"]).exit_code == 0
+    templates.append("class Solution:\n    def twoSum(self, nums: list[int], target: int):\n")
+    result = runner.invoke(leet2git, ["get", "1", "--force"])
+    assert result.exit_code == 0, result.output
+    assert "nums: list[int]" in source_file.read_text(encoding="UTF8")
+
+    source_file.write_text("# my solution\n", encoding="UTF8")
+    result = runner.invoke(leet2git, ["get", "1", "--force"])
+    assert "Keeping the local changes to src/leetcode_1_two_sum.py" in result.output
+    assert source_file.read_text(encoding="UTF8") == "# my solution\n"
+
+    assert runner.invoke(leet2git, ["get", "1", "--overwrite"]).exit_code == 2
+    result = runner.invoke(leet2git, ["get", "1", "--force", "--overwrite"])
+    assert "Overwriting the local changes to src/leetcode_1_two_sum.py" in result.output
+    assert "nums: list[int]" in source_file.read_text(encoding="UTF8")
+
+
 def test_get_imports_question_and_updates_readme(monkeypatch, tmp_path):
     class ConfigManagerWithSource(FakeConfigManager):
         def __init__(self):
@@ -75,6 +124,7 @@ def test_get_imports_question_and_updates_readme(monkeypatch, tmp_path):
             self.questions = {}
             self.id_title_map = IdTitleMap()
             self.save_count = 0
+            self.catalog_save_count = 0
             self.instances.append(self)
 
         def check_if_exists(self, question_id):
@@ -95,6 +145,9 @@ def test_get_imports_question_and_updates_readme(monkeypatch, tmp_path):
         def save(self):
             self.save_count += 1
 
+        def save_catalog(self):
+            self.catalog_save_count += 1
+
         def get_questions_sorted_by_creation_time(self):
             return sorted(self.questions.values(), key=lambda question: question.creation_time)
 
@@ -111,11 +164,27 @@ def test_get_imports_question_and_updates_readme(monkeypatch, tmp_path):
         def build_readme(self, question_list):
             self.built_lists.append(question_list)
 
-    def fake_generate_files(args, question_id, title_slug, lc, timestamp, config, code=""):
+    def fake_generate_files(
+        args,
+        question_id,
+        title_slug,
+        lc,
+        timestamp,
+        config,
+        code="",
+        defer_formatting=False,
+        previous=None,
+        overwrite_local_changes=False,
+    ):
+        assert defer_formatting
+        source_file = tmp_path / "src" / "leetcode_1_two_sum.py"
+        source_file.parent.mkdir()
+        source_file.write_text("x=1\n")
         args[question_id] = QuestionData(
             id=question_id,
             title="Two Sum",
             title_slug=title_slug,
+            file_path="src/leetcode_1_two_sum.py",
             creation_time=timestamp,
         )
 
@@ -124,14 +193,18 @@ def test_get_imports_question_and_updates_readme(monkeypatch, tmp_path):
     monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FakeClient)
     monkeypatch.setattr("leet2git.leet2git.ReadmeHandler", FakeReadmeHandler)
     monkeypatch.setattr("leet2git.leet2git.generate_files", fake_generate_files)
+    formatted = []
+    monkeypatch.setattr("leet2git.ruff_formatter.format_files", formatted.append)
 
     result = CliRunner().invoke(leet2git, ["get", "1"])
 
     imported_db = ImportOneQuestionDB.instances[-1]
     assert result.exit_code == 0
     assert imported_db.questions[1].title == "Two Sum"
-    assert imported_db.save_count == 2
+    assert imported_db.save_count == 1
+    assert imported_db.catalog_save_count == 1
     assert [question.id for question in FakeReadmeHandler.built_lists[-1]] == [1]
+    assert formatted == [[str(tmp_path / "src" / "leetcode_1_two_sum.py")]]
 
 
 def test_submit_reports_api_error_without_traceback(monkeypatch):
@@ -159,6 +232,57 @@ def test_submit_reports_api_error_without_traceback(monkeypatch):
     assert "Traceback" not in result.output
 
 
+def test_submit_runs_the_local_tests_first_when_configured(monkeypatch, tmp_path):
+    config = AppConfig(language="python3", source_path=str(tmp_path))
+    config.test_code.verify_before_submit = True
+
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = config
+
+    class SubmitQuestionDB(EmptyQuestionDB):
+        def get_question(self, question_id):
+            return QuestionData(
+                id=question_id,
+                internal_id=1,
+                title_slug="two-sum",
+                file_path="src/leetcode_1_two_sum.py",
+                test_file_path="tests/test_1.py",
+            )
+
+    class FakeHandler:
+        def generate_submission_file(self):
+            return "class Solution: ..."
+
+    class FakeClient:
+        calls = []
+
+        def submit_question(self, *args):
+            self.calls.append(args)
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text("VALUE = 1\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_1.py").write_text("def test_solution():\n    assert False\n")
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", SubmitQuestionDB)
+    monkeypatch.setattr("leet2git.leet2git.create_file_handler", lambda *_: FakeHandler())
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FakeClient)
+
+    failed = CliRunner().invoke(leet2git, ["submit", "1"])
+    forced = CliRunner().invoke(leet2git, ["submit", "1", "--no-verify"])
+    (tmp_path / "tests" / "test_1.py").write_text("def test_solution():\n    assert True\n")
+    passed = CliRunner().invoke(leet2git, ["submit", "1"])
+    cached = CliRunner().invoke(leet2git, ["submit", "1"])
+
+    assert failed.exit_code == 1
+    assert "the solution was not submitted" in failed.output
+    assert forced.exit_code == 0
+    assert "The local tests passed" in passed.output
+    assert "already passed on this code" in cached.output
+    assert len(FakeClient.calls) == 3
+
+
 def test_submit_reports_missing_question(monkeypatch):
     class SubmitQuestionDB(EmptyQuestionDB):
         def get_question(self, question_id):
@@ -282,6 +406,121 @@ def test_run_submits_generated_code_with_question_inputs(monkeypatch, tmp_path):
     ]
 
 
+def test_run_reuses_the_cached_result_of_the_same_code_and_inputs(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(language="python3", source_path=str(tmp_path))
+
+    class RunQuestionDB(EmptyQuestionDB):
+        inputs = ["[2,7,11,15], 9"]
+
+        def get_question(self, question_id):
+            return QuestionData(id=question_id, internal_id=1, title_slug="two-sum", inputs=self.inputs)
+
+    class FakeHandler:
+        def generate_submission_file(self):
+            return "class Solution: ..."
+
+    class FakeClient:
+        calls = 0
+
+        def submit_question(self, *args):
+            FakeClient.calls += 1
+            return SubmissionResultResponse(
+                state="SUCCESS", status_msg="Accepted", status_code=10, status_runtime="1 ms"
+            )
+
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", RunQuestionDB)
+    monkeypatch.setattr("leet2git.leet2git.create_file_handler", lambda *_: FakeHandler())
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FakeClient)
+    monkeypatch.setattr("leet2git.leetcode_client.click.clear", lambda: None)
+
+    CliRunner().invoke(leet2git, ["run", "1"])
+    cached = CliRunner().invoke(leet2git, ["run", "1"])
+    forced = CliRunner().invoke(leet2git, ["run", "1", "--force"])
+    RunQuestionDB.inputs = ["[3,3], 6"]
+    new_inputs = CliRunner().invoke(leet2git, ["run", "1"])
+
+    assert cached.exit_code == 0
+    assert "Result: Accepted" in cached.output
+    assert "Cached result" in cached.output
+    assert "Cached result" not in forced.output
+    assert "Cached result" not in new_inputs.output
+    assert FakeClient.calls == 3
+
+
+def test_run_does_not_cache_time_limit_exceeded(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(language="python3", source_path=str(tmp_path))
+
+    class RunQuestionDB(EmptyQuestionDB):
+        def get_question(self, question_id):
+            return QuestionData(id=question_id, internal_id=1, title_slug="a", inputs=["[1], 1"])
+
+    class FakeHandler:
+        def generate_submission_file(self):
+            return "class Solution: ..."
+
+    class FakeClient:
+        calls = 0
+
+        def submit_question(self, *args):
+            FakeClient.calls += 1
+            return SubmissionResultResponse(
+                state="SUCCESS", status_msg="Time Limit Exceeded", status_code=14
+            )
+
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", RunQuestionDB)
+    monkeypatch.setattr("leet2git.leet2git.create_file_handler", lambda *_: FakeHandler())
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FakeClient)
+
+    CliRunner().invoke(leet2git, ["run", "1"])
+    again = CliRunner().invoke(leet2git, ["run", "1"])
+
+    assert again.exit_code == 0
+    assert "Cached result" not in again.output
+    assert FakeClient.calls == 2
+
+
+def test_run_local_judges_without_the_network(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(language="python3", source_path=str(tmp_path))
+
+    class RunQuestionDB(EmptyQuestionDB):
+        def get_question(self, question_id):
+            return QuestionData(
+                id=question_id,
+                language="python3",
+                file_path="src/leetcode_1_two_sum.py",
+                function_name=["twoSum"],
+                inputs=["[2,7,11,15], 9", "[3,2,4], 6"],
+                outputs=["[0,1]", "[1,2]"],
+            )
+
+    class FailingClient:
+        def __init__(self):
+            raise AssertionError("LeetCode should not be called")
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return [0, 1]\n"
+    )
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", RunQuestionDB)
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", FailingClient)
+
+    result = CliRunner().invoke(leet2git, ["run", "1", "--local"])
+
+    assert result.exit_code == 0
+    assert "Result: Wrong Answer" in result.output
+    assert "Last Input: [3,2,4], 6" in result.output
+    assert "Code Output: [0,1]" in result.output
+
+
 def test_run_reports_missing_question(monkeypatch):
     class RunQuestionDB(EmptyQuestionDB):
         def get_question(self, question_id):
@@ -323,6 +562,8 @@ def test_import_all_filters_pages_and_updates_readme(monkeypatch, tmp_path):
             return sorted(self.questions.values(), key=lambda question: question.id)
 
     class FakeClient:
+        fail_on_next_page = False
+
         def __init__(self):
             self.pages = [
                 SubmissionListResponse.model_validate(
@@ -373,6 +614,8 @@ def test_import_all_filters_pages_and_updates_readme(monkeypatch, tmp_path):
 
         def get_submission_list(self, last_key="", offset=0):
             assert (last_key, offset) in {("", 0), ("next-page", 20)}
+            if offset and self.fail_on_next_page:
+                raise RuntimeError("connection reset")
             return self.pages[offset // 20]
 
     class FakeProcess:
@@ -406,7 +649,9 @@ def test_import_all_filters_pages_and_updates_readme(monkeypatch, tmp_path):
         def build_readme(self, question_list):
             self.built_lists.append(question_list)
 
-    def fake_generate_files(ret_dict, qid, title_slug, lc, timestamp, config, code=""):
+    def fake_generate_files(
+        ret_dict, qid, title_slug, lc, timestamp, config, code="", defer_formatting=False
+    ):
         ret_dict[qid] = QuestionData(
             id=qid,
             title=title_slug,
@@ -443,8 +688,18 @@ def test_import_all_filters_pages_and_updates_readme(monkeypatch, tmp_path):
     assert sorted(imported_db.questions) == [1, 2]
     assert imported_db.questions[1].raw_code == "code one"
     assert imported_db.questions[2].raw_code == "code two"
-    assert imported_db.save_count == 3
+    assert imported_db.save_count == 1
     assert [question.id for question in FakeReadmeHandler.built_lists[-1]] == [1, 2]
+    assert len(FakeReadmeHandler.built_lists) == 1
+
+    FakeClient.fail_on_next_page = True
+    interrupted = CliRunner().invoke(leet2git, ["import-all"])
+
+    interrupted_db = ImportQuestionDB.instances[-1]
+    assert isinstance(interrupted.exception, RuntimeError)
+    assert sorted(interrupted_db.questions) == [1]
+    assert interrupted_db.save_count == 1
+    assert [question.id for question in FakeReadmeHandler.built_lists[-1]] == [1]
 
 
 def test_init_can_create_repository(monkeypatch, tmp_path):
@@ -545,3 +800,502 @@ def test_reset_hard_removes_generated_files_and_regenerates_repo(monkeypatch, tm
     assert not test_file.exists()
     assert ResetQuestionDB.reset_count == 1
     assert FakeHandler.generated_repos == [str(tmp_path)]
+
+
+def test_list_filters_questions_and_prints_json(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3",
+                source_path=str(tmp_path),
+                legacy_data_path=str(tmp_path / "legacy"),
+            )
+
+    config = ConfigManagerWithSource().config
+    question_db = QuestionDB(config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            difficulty="Easy",
+            creation_time=time.time(),
+            categories=[TopicTag(name="Array", slug="array")],
+        )
+    )
+    question_db.add_question(
+        QuestionData(id=2, title="Add Two Numbers", difficulty="Medium", creation_time=time.time())
+    )
+    question_db.add_question(
+        QuestionData(id=3, title="Old Question", difficulty="Easy", creation_time=1.0)
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    result = CliRunner().invoke(
+        leet2git, ["list", "--difficulty", "easy", "--since-days", "7", "--json"]
+    )
+    table_result = CliRunner().invoke(leet2git, ["list", "--tag", "array"])
+
+    assert result.exit_code == 0
+    listed = json.loads(result.output)
+    assert [question["id"] for question in listed] == [1]
+    assert listed[0]["categories"] == ["array"]
+    assert "Two Sum" in table_result.output
+    assert "1 questions found." in table_result.output
+
+
+def test_test_runs_generated_tests_and_skips_unchanged_questions(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_1.py").write_text("def test_solution():\n    assert True\n")
+    (tmp_path / "tests" / "test_2.py").write_text("def test_solution():\n    assert False\n")
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    for question_id in (1, 2):
+        question_db.add_question(
+            QuestionData(
+                id=question_id,
+                title=f"Question {question_id}",
+                test_file_path=f"tests/test_{question_id}.py",
+            )
+        )
+    question_db.add_question(QuestionData(id=3, title="Without Tests"))
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    missing_selection = CliRunner().invoke(leet2git, ["test"])
+    first_run = CliRunner().invoke(leet2git, ["test", "--all", "-v"])
+    (tmp_path / "tests" / "test_2.py").write_text("def test_solution():\n    assert 2\n")
+    changed_run = CliRunner().invoke(leet2git, ["test", "--changed"])
+    unchanged_run = CliRunner().invoke(leet2git, ["test", "--changed", "3"])
+
+    assert missing_selection.exit_code == 2
+    assert first_run.exit_code == 1
+    assert "1/2 questions passed" in first_run.output
+    assert "assert False" in first_run.output
+    assert changed_run.exit_code == 0
+    assert "    2  passed" in changed_run.output
+    assert "    1  passed" not in changed_run.output
+    assert "The question 3 has no generated tests." in unchanged_run.output
+    assert "No questions to test." in unchanged_run.output
+
+
+def test_bench_reports_timings_and_compares_with_previous_run(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return [0, 1]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            inputs=["[2,7,11,15], 9"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    first = CliRunner().invoke(leet2git, ["bench", "1", "-r", "5", "-i", "[3,3], 6"])
+    second = CliRunner().invoke(leet2git, ["bench", "1", "-r", "5", "-i", "[3,3], 6", "--no-save"])
+    missing = CliRunner().invoke(leet2git, ["bench", "2"])
+
+    assert first.exit_code == 0
+    assert "example 1" in first.output
+    assert "input 1" in first.output
+    assert "total" in first.output
+    assert "than on" in second.output or "since" in second.output
+    assert len(json.loads((tmp_path / ".leet2git" / "benchmarks" / "1.json").read_text())["runs"]) == 1
+    assert missing.exit_code == 1
+
+
+def test_bench_ranks_variants_and_reports_disagreements(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n"
+        "    def twoSum(self, nums, target):\n"
+        "        seen = {}\n"
+        "        for i, num in enumerate(nums):\n"
+        "            if target - num in seen:\n"
+        "                return [seen[target - num], i]\n"
+        "            seen[num] = i\n"
+        "class SolutionBrute:\n"
+        "    def twoSum(self, nums, target):\n"
+        "        for i in range(len(nums)):\n"
+        "            for j in range(i + 1, len(nums)):\n"
+        "                if nums[i] + nums[j] == target:\n"
+        "                    return (i, j)\n"
+    )
+    (tmp_path / "wrong.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return [0, 1]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            inputs=["[2,7,11,15], 9", "[3,2,4], 6"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    agree = CliRunner().invoke(leet2git, ["bench", "1", "-r", "3", "-V", "SolutionBrute"])
+    disagree = CliRunner().invoke(leet2git, ["bench", "1", "-r", "3", "-V", "wrong.py"])
+    missing = CliRunner().invoke(leet2git, ["bench", "1", "-V", "SolutionMissing"])
+
+    assert agree.exit_code == 0
+    assert "SolutionBrute" in agree.output
+    assert "1.00x" in agree.output
+    assert "All solutions agree on the 2 inputs." in agree.output
+    assert disagree.exit_code == 1
+    assert "wrong.py disagrees with Solution on example 2: [0, 1] != [1, 2]" in disagree.output
+    assert "do not agree" in disagree.output
+    assert missing.exit_code == 1
+    assert "Could not find SolutionMissing" in missing.output
+    assert not (tmp_path / ".leet2git" / "benchmarks").exists()
+
+
+def test_generate_input_prints_seeded_inputs_and_bench_uses_them(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return [0, 1]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            question_template=(
+                "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n"
+            ),
+            description=["Constraints:", "2 <= nums.length <= 50", "-10 <= nums[i], target <= 10"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    first = CliRunner().invoke(leet2git, ["generate-input", "1", "-n", "2", "--seed", "5"])
+    second = CliRunner().invoke(leet2git, ["generate-input", "1", "-n", "2", "--seed", "5"])
+    bench = CliRunner().invoke(leet2git, ["bench", "1", "-r", "2", "-g", "2", "--no-save"])
+
+    assert first.exit_code == 0
+    assert first.output == second.output
+    lines = first.output.splitlines()
+    assert len(lines) == 2
+    assert len(json.loads(f"[{lines[0]}]")[0]) == 50
+    assert bench.exit_code == 0
+    assert "generated 2" in bench.output
+
+
+def test_complexity_reports_the_best_fit(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return sorted(nums)[:2]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            question_template=(
+                "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n"
+            ),
+            description=["Constraints:", "2 <= nums.length <= 2000", "-10 <= nums[i], target <= 10"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    result = CliRunner().invoke(leet2git, ["complexity", "1", "--steps", "5", "-r", "2"])
+    missing = CliRunner().invoke(leet2git, ["complexity", "2"])
+
+    assert result.exit_code == 0
+    assert "Best fit: O(" in result.output
+    assert "n = 2000" in result.output
+    assert missing.exit_code == 1
+
+
+def test_memprofile_reports_sites_and_compares_with_previous_profile(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n"
+        "    def twoSum(self, nums, target):\n"
+        "        seen = {num: i for i, num in enumerate(nums * 100)}\n"
+        "        return [0, 1]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            inputs=["[2,7,11,15], 9"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    first = CliRunner().invoke(leet2git, ["memprofile", "1", "-i", "[3,3], 6"])
+    second = CliRunner().invoke(leet2git, ["memprofile", "1", "-i", "[3,3], 6", "--no-save"])
+
+    assert first.exit_code == 0
+    assert "example 1" in first.output
+    assert "seen = {num: i" in first.output
+    assert "since" in second.output or "than on" in second.output
+    runs = json.loads((tmp_path / ".leet2git" / "memory_profiles" / "1.json").read_text())["runs"]
+    assert len(runs) == 1
+
+
+def test_profile_prints_hot_functions_and_diffs_with_the_last_profile(monkeypatch, tmp_path):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n"
+        "    def twoSum(self, nums, target):\n"
+        "        return sorted(range(len(nums)), key=lambda i: nums[i])[:2]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            inputs=["[2,7,11,15], 9"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    no_previous = CliRunner().invoke(leet2git, ["profile", "1", "--diff"])
+    diff = CliRunner().invoke(leet2git, ["profile", "1", "--diff", "--no-save"])
+    other_repeat = CliRunner().invoke(leet2git, ["profile", "1", "-r", "3", "--diff", "--no-save"])
+    other_inputs = CliRunner().invoke(
+        leet2git, ["profile", "1", "-i", "[3,3], 6", "--diff", "--no-save"]
+    )
+
+    assert no_previous.exit_code == 0
+    assert "no stored profile" in no_previous.output
+    assert "leetcode_1_two_sum.py:2(twoSum)" in no_previous.output
+    assert diff.exit_code == 0
+    assert "change" in diff.output
+    assert "since the last profile of these inputs" in diff.output
+    for result in (other_repeat, other_inputs):
+        assert result.exit_code == 0
+        assert "no stored profile of these inputs" in result.output
+        assert "since the last profile" not in result.output
+    assert len(list((tmp_path / ".leet2git" / "profiles" / "1").glob("*.prof"))) == 1
+
+
+@pytest.mark.parametrize("command", ["bench", "memprofile", "profile", "complexity"])
+def test_solution_commands_report_a_failing_solution(monkeypatch, tmp_path, command):
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = AppConfig(
+                language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path)
+            )
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1_two_sum.py").write_text(
+        "class Solution:\n    def twoSum(self, nums, target):\n        return nums[10]\n"
+    )
+    question_db = QuestionDB(ConfigManagerWithSource().config)
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            title="Two Sum",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            function_name=["twoSum"],
+            question_template=(
+                "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n"
+            ),
+            description=["Constraints:", "2 <= nums.length <= 10", "-10 <= nums[i], target <= 10"],
+            inputs=["[2,7,11,15], 9"],
+        )
+    )
+    question_db.save()
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+
+    result = CliRunner().invoke(leet2git, [command, "1"])
+
+    assert result.exit_code == 1
+    assert "The solution raised IndexError: list index out of range" in result.output
+
+
+def test_batch_reads_commands_from_stdin_and_saves_once(monkeypatch, tmp_path):
+    config = AppConfig(language="python3", source_path=str(tmp_path), legacy_data_path=str(tmp_path))
+
+    class ConfigManagerWithSource(FakeConfigManager):
+        def __init__(self):
+            self.config = config
+
+    seed_db = QuestionDB(config)
+    for question_id in (1, 2):
+        (tmp_path / f"leetcode_{question_id}.py").write_text("class Solution: ...\n")
+        seed_db.add_question(
+            QuestionData(
+                id=question_id, title=f"Problem {question_id}", file_path=f"leetcode_{question_id}.py"
+            )
+        )
+    seed_db.save()
+    seed_db.set_id_title_map(IdTitleMap(id_to_title={3: "problem-3"}, title_to_id={"problem-3": 3}))
+    seed_db.save_catalog()
+
+    saves = []
+    readme_updates = []
+    original_save = QuestionDB.save
+
+    def counting_save(self):
+        saves.append(self)
+        original_save(self)
+
+    def fake_generate_files(
+        args,
+        question_id,
+        title_slug,
+        lc,
+        timestamp,
+        config,
+        code="",
+        defer_formatting=False,
+        previous=None,
+        overwrite_local_changes=False,
+    ):
+        args[question_id] = QuestionData(id=question_id, title=title_slug, creation_time=timestamp)
+
+    monkeypatch.setattr(QuestionDB, "save", counting_save)
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", ConfigManagerWithSource)
+    monkeypatch.setattr("leet2git.leet2git.LeetcodeClient", object)
+    monkeypatch.setattr("leet2git.leet2git.generate_files", fake_generate_files)
+    monkeypatch.setattr(
+        "leet2git.readme_handler.ReadmeHandler.build_readme",
+        lambda self, question_list: readme_updates.append([qd.id for qd in question_list]),
+    )
+
+    result = CliRunner().invoke(leet2git, ["batch"], input="# cleanup\ndelete 1 2\n\nget 3\n")
+
+    assert result.exit_code == 0, result.output
+    assert len(saves) == 1
+    assert readme_updates == [[3]]
+    qdb = QuestionDB(config)
+    qdb.load()
+    assert sorted(qdb.get_data()) == [3]
+    assert not (tmp_path / "leetcode_1.py").exists()
+
+
+def test_batch_rejects_unknown_commands_before_running_anything(monkeypatch):
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", FakeConfigManager)
+
+    def fail_load(config):
+        raise AssertionError("the database must not be loaded")
+
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", fail_load)
+
+    result = CliRunner().invoke(leet2git, ["batch"], input="get 1\nsubmit 2\n")
+
+    assert result.exit_code == 2
+    assert "line 2" in result.output
+
+
+def test_delete_batch_reads_ids_from_stdin(monkeypatch):
+    class DeleteQuestionDB(EmptyQuestionDB):
+        instances = []
+
+        def __init__(self, config):
+            super().__init__(config)
+            self.deleted = []
+            self.save_count = 0
+            self.instances.append(self)
+
+        def check_if_exists(self, question_id):
+            return question_id != 4
+
+        def get_data(self):
+            return {qid: QuestionData(id=qid, file_path=f"missing_{qid}.py") for qid in (1, 2, 3)}
+
+        def delete_question(self, question_id):
+            self.deleted.append(question_id)
+
+        def save(self):
+            self.save_count += 1
+
+        def get_questions_sorted_by_creation_time(self):
+            return []
+
+    class FakeReadmeHandler:
+        built_lists = []
+
+        def __init__(self, config):
+            self.config = config
+
+        def build_readme(self, question_list):
+            self.built_lists.append(question_list)
+
+    monkeypatch.setattr("leet2git.leet2git.ConfigManager", FakeConfigManager)
+    monkeypatch.setattr("leet2git.leet2git.QuestionDB", DeleteQuestionDB)
+    monkeypatch.setattr("leet2git.leet2git.ReadmeHandler", FakeReadmeHandler)
+
+    result = CliRunner().invoke(leet2git, ["delete", "3", "--batch"], input="1\n2 4\n")
+
+    qdb = DeleteQuestionDB.instances[-1]
+    assert result.exit_code == 0
+    assert qdb.deleted == [3, 1, 2]
+    assert "The question 4 could not be found!" in result.output
+    assert qdb.save_count == 1
+    assert len(FakeReadmeHandler.built_lists) == 1
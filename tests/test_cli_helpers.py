@@ -31,7 +31,7 @@ def test_get_question_id_refreshes_unknown_slug_mapping():
         def set_id_title_map(self, id_title_map):
             self.title_to_id = id_title_map.title_to_id
 
-        def save(self):
+        def save_catalog(self):
             self.saved = True
 
         def get_id_from_title(self, title_slug):
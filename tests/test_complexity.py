@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from leet2git.complexity import (
+    ComplexityError,
+    estimate_complexity,
+    fit_model,
+    input_size,
+    measure_growth,
+)
+
+SIZES = [20 * 2**step for step in range(9)]
+
+
+def noisy(function):
+    # a fixed +-3% noise, alternating between sizes
+    return [(size, function(size) * (1.03 if index % 2 else 0.97)) for index, size in enumerate(SIZES)]
+
+
+@pytest.mark.parametrize(
+    "name, function",
+    [
+        ("O(1)", lambda n: 1e-6),
+        ("O(log n)", lambda n: 1e-7 * math.log2(n)),
+        ("O(n)", lambda n: 1e-6 + 1e-8 * n),
+        ("O(n^2)", lambda n: 1e-9 * n * n),
+    ],
+)
+def test_estimate_complexity_finds_the_growth_model(name, function):
+    estimate = estimate_complexity(noisy(function))
+
+    assert estimate.best.name == name
+    assert estimate.confidence > 0.5
+
+
+def test_estimate_complexity_fits_exponential_growth_on_small_sizes():
+    estimate = estimate_complexity([(n, 1e-7 * 2**n) for n in range(5, 20, 2)])
+
+    assert estimate.best.name == "O(2^n)"
+    assert estimate.best.predict(21) == pytest.approx(1e-7 * 2**21)
+    with pytest.raises(ComplexityError, match="At least"):
+        estimate_complexity([(1, 1.0), (2, 2.0), (2, 2.0), (3, 3.0)])
+
+
+def test_fit_model_skips_overflowing_models():
+    assert fit_model("O(2^n)", lambda n: math.pow(2, n), [10, 5000], [1.0, 2.0]) is None
+    fit = fit_model("O(n)", lambda n: n, [1, 2, 3], [3.0, 5.0, 7.0])
+    assert fit is not None
+    assert (fit.intercept, fit.coefficient, fit.r_squared) == pytest.approx((1.0, 2.0, 1.0))
+
+
+def test_input_size_counts_elements_or_uses_the_largest_integer():
+    assert input_size([[[1, 2], [3, 4]], 5]) == 4
+    assert input_size(["abc", ["a", "bb"]]) == 6
+    assert input_size([45, -3]) == 45
+
+
+def test_measure_growth_doubles_the_scale_and_stops_at_the_time_limit(monkeypatch):
+    import leet2git.complexity as complexity
+
+    scales = []
+    fake_times = iter([0.1, 0.2, 0.4, 0.8, 1.6])
+    monkeypatch.setattr(complexity, "measure", lambda *args, **kwargs: ([next(fake_times)], 0))
+
+    def generate(scale):
+        scales.append(scale)
+        return [[0] * max(int(scale * 160), 1)]
+
+    points, stopped = measure_growth(lambda arguments: lambda: None, generate, 10, 3, 1.0)
+
+    assert stopped
+    assert points == [(1, 0.1), (2, 0.2), (5, 0.4), (10, 0.8), (20, 1.6)]
+    assert scales[-1] == 2.0**-3
@@ -0,0 +1,99 @@
+import functools
+import os
+import pstats
+
+from leet2git.cpu_profile import (
+    FunctionStats,
+    ProfileStore,
+    StoredProfile,
+    diff_function_stats,
+    function_location,
+    function_stats,
+    profile_calls,
+)
+
+
+def slow_helper(n):
+    return sum(i * i for i in range(n))
+
+
+def solution(n):
+    return slow_helper(n) + len(str(n))
+
+
+def test_profile_calls_prepares_outside_of_the_profile_and_repeats():
+    prepared = []
+
+    def prepare():
+        prepared.append(True)
+        return lambda: solution(20000)
+
+    stats = profile_calls([prepare, prepare], repeat=3)
+    rows = {row.location: row for row in function_stats(stats)}
+
+    assert len(prepared) == 6
+    assert (
+        rows[function_location(__file__, slow_helper.__code__.co_firstlineno, "slow_helper")].calls == 6
+    )
+    assert (
+        rows[function_location(__file__, solution.__code__.co_firstlineno, "solution")].cumulative_time
+        > 0
+    )
+    assert not any("_lsprof" in location or "prepare" in location for location in rows)
+
+
+def test_function_stats_sorts_by_own_or_cumulative_time():
+    stats = profile_calls([lambda: functools.partial(solution, 50000)])
+
+    by_own_time = function_stats(stats)
+    by_cumulative_time = function_stats(stats, "cumtime")
+
+    assert [row.total_time for row in by_own_time] == sorted(
+        (row.total_time for row in by_own_time), reverse=True
+    )
+    assert by_cumulative_time[0].location.endswith("(solution)")
+
+
+def test_diff_function_stats_matches_functions_after_lines_move():
+    current = [
+        FunctionStats("leetcode_1.py:5(twoSum)", 1, 0.3, 0.5),
+        FunctionStats("{built-in method builtins.len}", 2, 0.1, 0.1),
+    ]
+    previous = [FunctionStats("leetcode_1.py:3(twoSum)", 1, 0.5, 0.6)]
+
+    changes = diff_function_stats(current, previous)
+
+    assert changes["leetcode_1.py:5(twoSum)"] == -0.2
+    assert changes["{built-in method builtins.len}"] == 0.1
+
+
+def test_profile_store_saves_pstats_files_and_drops_the_oldest(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    store.max_runs = 2
+    paths = [
+        store.add_profile(
+            1, profile_calls([lambda: lambda: solution(10)]), StoredProfile(inputs_hash="a", repeat=1)
+        )
+        for _ in range(3)
+    ]
+
+    assert store.previous_profile(1, "a", 1) == paths[-1]
+    assert store.previous_profile(2, "a", 1) is None
+    assert [run.file_name for run in store.load(1).runs] == [
+        os.path.relpath(path, tmp_path / ".leet2git" / "profiles") for path in paths[1:]
+    ]
+    assert sorted((tmp_path / ".leet2git" / "profiles" / "1").iterdir()) == sorted(
+        tmp_path / ".leet2git" / "profiles" / "1" / os.path.basename(path) for path in paths[1:]
+    )
+    assert function_stats(pstats.Stats(paths[-1]))
+
+
+def test_profile_store_only_compares_profiles_of_the_same_calls(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    stats = profile_calls([lambda: lambda: solution(10)])
+    first = store.add_profile(1, stats, StoredProfile(inputs_hash="a", repeat=1))
+    store.add_profile(1, stats, StoredProfile(inputs_hash="b", repeat=1))
+    store.add_profile(1, stats, StoredProfile(inputs_hash="a", repeat=3))
+
+    assert store.previous_profile(1, "a", 1) == first
+    assert store.previous_profile(1, "b", 3) is None
@@ -0,0 +1,92 @@
+import errno
+import stat
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from leet2git import file_lock as file_lock_module
+from leet2git.file_lock import atomic_write, file_lock
+
+
+def test_atomic_write_replaces_file_without_leaving_temporary_files(tmp_path):
+    target = tmp_path / "data" / "database.json"
+
+    atomic_write(str(target), "first")
+    atomic_write(str(target), "second")
+
+    assert target.read_text(encoding="UTF8") == "second"
+    assert [path.name for path in target.parent.iterdir()] == ["database.json"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows has no permission bits")
+def test_atomic_write_keeps_the_permission_bits(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_lock_module, "_UMASK", 0o027)
+    new_file = tmp_path / "new.txt"
+    atomic_write(str(new_file), "new")
+    existing_file = tmp_path / "script.sh"
+    existing_file.write_text("old", encoding="UTF8")
+    existing_file.chmod(0o755)
+
+    atomic_write(str(existing_file), "new")
+
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o640
+    assert stat.S_IMODE(existing_file.stat().st_mode) == 0o755
+
+
+def test_file_lock_is_reentrant_inside_a_process(tmp_path):
+    lock_path = str(tmp_path / ".lock")
+
+    with file_lock(lock_path), file_lock(lock_path):
+        atomic_write(str(tmp_path / "file.txt"), "locked")
+
+    with file_lock(lock_path):
+        pass
+
+    assert (tmp_path / "file.txt").read_text(encoding="UTF8") == "locked"
+
+
+def test_file_lock_excludes_other_threads(tmp_path):
+    lock_path = str(tmp_path / ".lock")
+    events: list[str] = []
+    first_entered = threading.Event()
+
+    def hold_lock():
+        with file_lock(lock_path):
+            events.append("first entered")
+            first_entered.set()
+            time.sleep(0.2)
+            events.append("first left")
+
+    def wait_for_lock():
+        first_entered.wait()
+        with file_lock(lock_path):
+            events.append("second entered")
+
+    threads = [threading.Thread(target=hold_lock), threading.Thread(target=wait_for_lock)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert events == ["first entered", "first left", "second entered"]
+
+
+def test_acquire_on_windows_only_retries_lock_timeouts(tmp_path, monkeypatch):
+    errors = [OSError(errno.EDEADLOCK, "timeout"), OSError(errno.EBADF, "bad file")]
+
+    def locking(fileno, mode, size):
+        raise errors.pop(0)
+
+    monkeypatch.setattr(file_lock_module.sys, "platform", "win32")
+    monkeypatch.setattr(
+        file_lock_module, "msvcrt", SimpleNamespace(LK_LOCK=1, locking=locking), raising=False
+    )
+
+    with open(tmp_path / ".lock", "a+b") as lock_file, pytest.raises(OSError) as error:
+        file_lock_module._acquire(lock_file.fileno())
+
+    assert error.value.errno == errno.EBADF
+    assert errors == []
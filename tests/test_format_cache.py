@@ -0,0 +1,81 @@
+import hashlib
+
+from leet2git import format_cache
+from leet2git.format_cache import AUTOIMPORT, RUFF, FormatCache
+from leet2git.question_db import GeneratedFile, QuestionData
+
+
+def test_format_cache_returns_stored_output(tmp_path, monkeypatch):
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    cache = FormatCache(str(tmp_path))
+
+    assert cache.get(RUFF, "x=1\n") is None
+    cache.put(RUFF, "x=1\n", "x = 1\n")
+
+    assert cache.get(RUFF, "x=1\n") == "x = 1\n"
+    assert cache.get(AUTOIMPORT, "x=1\n") is None
+    assert (tmp_path / ".leet2git" / "format_cache" / ".gitignore").read_text() == "*\n"
+
+
+def test_format_cache_misses_after_tool_or_config_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    FormatCache(str(tmp_path)).put(RUFF, "x=1\n", "x = 1\n")
+
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.1")
+    assert FormatCache(str(tmp_path)).get(RUFF, "x=1\n") is None
+
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    (tmp_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 80\n")
+    assert FormatCache(str(tmp_path)).get(RUFF, "x=1\n") is None
+
+
+def test_format_cache_misses_after_parent_or_user_config_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    source_path = tmp_path / "workspace" / "solutions"
+    source_path.mkdir(parents=True)
+    FormatCache(str(source_path)).put(RUFF, "x=1\n", "x = 1\n")
+    assert FormatCache(str(source_path)).get(RUFF, "x=1\n") == "x = 1\n"
+
+    (tmp_path / "workspace" / "ruff.toml").write_text("line-length = 80\n")
+    assert FormatCache(str(source_path)).get(RUFF, "x=1\n") is None
+
+    FormatCache(str(source_path)).put(RUFF, "x=1\n", "x = 1\n")
+    (tmp_path / "config" / "ruff").mkdir(parents=True)
+    (tmp_path / "config" / "ruff" / "ruff.toml").write_text("indent-width = 2\n")
+    assert FormatCache(str(source_path)).get(RUFF, "x=1\n") is None
+
+
+def test_format_cache_misses_after_source_or_tests_config_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    for directory, config_file in (("src", "ruff.toml"), ("tests", ".ruff.toml")):
+        FormatCache(str(tmp_path)).put(RUFF, "x=1\n", "x = 1\n")
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / config_file).write_text("line-length = 80\n")
+        assert FormatCache(str(tmp_path)).get(RUFF, "x=1\n") is None
+
+
+def test_format_cache_prunes_entries_of_untracked_content(tmp_path, monkeypatch):
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr(format_cache, "PRUNE_SLACK", 2)
+    cache = FormatCache(str(tmp_path))
+    (tmp_path / "solution.py").write_text("x = 1\n")
+    question = QuestionData(
+        id=1,
+        generated_files={
+            "solution.py": GeneratedFile(content_hash=hashlib.sha256(b"x=1\n").hexdigest())
+        },
+    )
+    cache.put(RUFF, "x=1\n", "x = 1\n")
+    cache.put(RUFF, "x = 1\n", "x = 1\n")
+    cache.put(RUFF, "y=2\n", "y = 2\n")
+    cache.put(AUTOIMPORT, "y=2\n", "y=2\n")
+
+    assert cache.prune([question]) == 0
+
+    cache.put(RUFF, "z=3\n", "z = 3\n")
+    assert cache.prune([question]) == 3
+    assert cache.get(RUFF, "x=1\n") == "x = 1\n"
+    assert cache.get(RUFF, "x = 1\n") == "x = 1\n"
+    assert cache.get(RUFF, "y=2\n") is None
+    assert cache.get(AUTOIMPORT, "y=2\n") is None
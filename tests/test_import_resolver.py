@@ -0,0 +1,65 @@
+from leet2git.import_resolver import add_missing_imports
+
+
+def test_add_missing_imports_resolves_common_leetcode_names():
+    source = (
+        "# [1] Two Sum\n"
+        "\n"
+        "from __future__ import annotations\n"
+        "\n"
+        "class Solution:\n"
+        "    def twoSum(self, nums: List[int], root: Optional[TreeNode]) -> int:\n"
+        "        heap = []\n"
+        "        heapq.heappush(heap, 1)\n"
+        "        return len(Counter(nums)) + bisect_left(nums, 1)\n"
+    )
+
+    fixed, unresolved = add_missing_imports(source)
+
+    assert fixed == (
+        "# [1] Two Sum\n"
+        "\n"
+        "from __future__ import annotations\n"
+        "import heapq\n"
+        "from bisect import bisect_left\n"
+        "from collections import Counter\n"
+        "from typing import List, Optional\n"
+        "\n"
+        "class Solution:\n"
+        "    def twoSum(self, nums: List[int], root: Optional[TreeNode]) -> int:\n"
+        "        heap = []\n"
+        "        heapq.heappush(heap, 1)\n"
+        "        return len(Counter(nums)) + bisect_left(nums, 1)\n"
+    )
+    assert unresolved == set()
+
+
+def test_add_missing_imports_inserts_before_decorated_first_statement():
+    fixed, _ = add_missing_imports("# header\n@cache\ndef f(x):\n    return sqrt(x)\n")
+
+    assert fixed == (
+        "# header\nfrom functools import cache\nfrom math import sqrt\n\n@cache\ndef f(x):\n    return sqrt(x)\n"
+    )
+
+
+def test_add_missing_imports_ignores_bound_and_imported_names():
+    source = (
+        "from collections import deque as Deque\n"
+        "def f(inf, *args):\n"
+        "    product = 1\n"
+        "    for comb in args:\n"
+        "        product *= comb\n"
+        "    return [Deque(), inf, product, lambda gcd: gcd]\n"
+    )
+
+    assert add_missing_imports(source) == (source, set())
+
+
+def test_add_missing_imports_reports_unknown_names():
+    source = "def f():\n    return np.zeros(3), Fraction(1, 2)\n"
+
+    fixed, unresolved = add_missing_imports(source)
+
+    assert fixed.startswith("from fractions import Fraction\n\ndef f():")
+    assert unresolved == {"np"}
+    assert add_missing_imports("def f(:\n") == ("def f(:\n", set())
@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from leet2git.input_generator import (
+    InputGenerationError,
+    InputGenerator,
+    get_parameters,
+    parse_constraints,
+)
+from leet2git.question_db import QuestionData
+
+TWO_SUM_DESCRIPTION = [
+    "Given an array of integers nums and an integer target, return indices.",
+    "Constraints:",
+    "2 <= nums.length <= 10^4",
+    "-10^9 <= nums[i] <= 10^9",
+    "-10^9 <= target <= 10^9",
+    "Only one valid answer exists.",
+    "Follow-up: Can you come up with an algorithm that is less than O(n^2)?",
+    "1 <= ignored <= 5",
+]
+TWO_SUM_TEMPLATE = "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n"
+
+
+def two_sum(description=TWO_SUM_DESCRIPTION):
+    return QuestionData(
+        id=1,
+        language="python3",
+        function_name=["twoSum"],
+        question_template=TWO_SUM_TEMPLATE,
+        description=description,
+    )
+
+
+def test_parse_constraints_reads_ranges_until_the_follow_up():
+    constraints = parse_constraints(TWO_SUM_DESCRIPTION)
+
+    assert constraints.ranges == {
+        "nums.length": (2, 10**4),
+        "nums[i]": (-(10**9), 10**9),
+        "target": (-(10**9), 10**9),
+    }
+
+
+def test_parse_constraints_resolves_aliases_references_and_alphabets():
+    constraints = parse_constraints(
+        [
+            "Constraints:",
+            "m == grid.length",
+            "n == grid[i].length",
+            "1 <= m, n < 201",
+            "1 <= k <= m * n",
+            "grid[i][j] is '0' or '1'.",
+            "word consists of only uppercase English letters.",
+        ]
+    )
+
+    assert constraints.ranges["grid.length"] == (1, 200)
+    assert constraints.ranges["grid[i].length"] == (1, 200)
+    assert constraints.ranges["k"] == (1, 40000)
+    assert constraints.alphabets["grid[i][i]"] == "01"
+    assert constraints.alphabets["word"] == "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def test_get_parameters_reads_the_template_signature():
+    assert get_parameters(two_sum()) == [("nums", "List[int]"), ("target", "int")]
+    with pytest.raises(InputGenerationError, match="single function"):
+        get_parameters(QuestionData(function_name=["Counter", "add"]))
+
+
+def test_generator_uses_the_largest_lengths_and_is_seeded():
+    raw_input = InputGenerator(two_sum(), seed=3).generate()
+    nums, target = json.loads(f"[{raw_input}]")
+
+    assert len(nums) == 10**4
+    assert all(-(10**9) <= value <= 10**9 for value in nums)
+    assert -(10**9) <= target <= 10**9
+    assert InputGenerator(two_sum(), seed=3).generate() == raw_input
+    assert InputGenerator(two_sum(), seed=4).generate() != raw_input
+    assert len(json.loads(f"[{InputGenerator(two_sum()).generate(0.1)}]")[0]) == 1000
+
+
+def test_generator_builds_grids_and_strings():
+    question = QuestionData(
+        function_name=["numIslands"],
+        question_template=(
+            "class Solution:\n"
+            "    def numIslands(self, grid: List[List[str]], word: str, k: int) -> int:\n"
+        ),
+        description=[
+            "Constraints:",
+            "m == grid.length",
+            "n == grid[i].length",
+            "1 <= m, n <= 30",
+            "grid[i][j] is '0' or '1'.",
+            "1 <= word.length <= 15",
+            "word consists of lowercase English letters.",
+            "0 <= k <= 7",
+        ],
+    )
+
+    grid, word, k = json.loads(f"[{InputGenerator(question).generate()}]")
+
+    assert len(grid) == 30
+    assert all(len(row) == 30 and set(row) <= {"0", "1"} for row in grid)
+    assert len(word) == 15 and word.islower()
+    assert k == 7
+
+
+def test_generator_rejects_unsupported_types():
+    question = QuestionData(
+        function_name=["maxDepth"],
+        question_template=(
+            "class Solution:\n    def maxDepth(self, root: Optional[TreeNode]) -> int:\n"
+        ),
+    )
+
+    with pytest.raises(InputGenerationError, match="root"):
+        InputGenerator(question).generate()
+
+
+def test_parse_constraints_reads_chained_comparisons():
+    constraints = parse_constraints(
+        ["Constraints:", "1 <= k <= nums.length <= 10^5", "0 <= i < j < n <= 50"]
+    )
+
+    assert constraints.ranges["k"] == (1, 10**5)
+    assert constraints.ranges["nums.length"] == (1, 10**5)
+    assert constraints.ranges["i"] == (0, 48)
+    assert constraints.ranges["j"] == (1, 49)
+    assert constraints.ranges["n"] == (2, 50)
+
+
+def test_generator_keeps_chained_values_within_the_lengths():
+    question = QuestionData(
+        function_name=["topKFrequent"],
+        question_template=(
+            "class Solution:\n    def topKFrequent(self, nums: List[int], k: int) -> List[int]:\n"
+        ),
+        description=["Constraints:", "1 <= k <= nums.length <= 10^5", "-10 <= nums[i] <= 10"],
+    )
+
+    for scale in (1.0, 0.1):
+        nums, k = json.loads(f"[{InputGenerator(question, seed=1).generate(scale)}]")
+        assert 1 <= k <= len(nums) <= 10**5
+
+
+def test_parse_constraints_rejects_empty_ranges():
+    with pytest.raises(InputGenerationError, match="empty range"):
+        parse_constraints(["Constraints:", "-5 <= n <= -10"])
+    with pytest.raises(InputGenerationError, match="empty range"):
+        parse_constraints(["Constraints:", "1 <= n < 1"])
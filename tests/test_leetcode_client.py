@@ -709,7 +709,7 @@ def test_async_submit_question_polls_until_success(monkeypatch):
     monkeypatch.setattr("leet2git.leetcode_client.asyncio.sleep", fake_sleep)
     client = make_client(handler)
 
-    asyncio.run(
+    result = asyncio.run(
         client.async_submit_question(
             "class Solution: ...",
             1,
@@ -720,6 +720,7 @@ def test_async_submit_question_polls_until_success(monkeypatch):
         )
     )
 
+    assert result.status_msg == "Accepted"
     assert requests == [
         ("POST", "https://leetcode.com/problems/two-sum/interpret_solution/"),
         ("GET", "https://leetcode.com/submissions/detail/runcode_123/check/"),
@@ -0,0 +1,113 @@
+import pytest
+
+from leet2git.local_judge import (
+    ACCEPTED,
+    COMPILE_ERROR,
+    MEMORY_LIMIT_EXCEEDED,
+    RUNTIME_ERROR,
+    TIME_LIMIT_EXCEEDED,
+    WRONG_ANSWER,
+    LocalJudge,
+    same_output,
+)
+from leet2git.solution_runner import SolutionError
+
+
+@pytest.fixture
+def two_sum(write_solution):
+    def write(body):
+        return write_solution(
+            "import time\n\n\nclass Solution:\n    def twoSum(self, nums, target):\n" + body,
+            "twoSum",
+            file_name="leetcode_1_two_sum.py",
+            inputs=["[2,7,11,15], 9", "[3,2,4], 6"],
+            outputs=["[0,1]", "[1,2]"],
+        )
+
+    return write
+
+
+def test_same_output_compares_json_with_float_tolerance():
+    assert same_output([0, 1], "[0,1]")
+    assert same_output(2.0000001, "2.00000")
+    assert same_output(None, "null")
+    assert same_output("ab", '"ab"')
+    assert not same_output([1, 0], "[0,1]")
+    assert not same_output(True, "1")
+
+
+def test_judge_accepts_a_correct_solution(tmp_path, two_sum):
+    question = two_sum(
+        "        print('debugging output')\n"
+        "        seen = {}\n"
+        "        for i, num in enumerate(nums):\n"
+        "            if target - num in seen:\n"
+        "                return [seen[target - num], i]\n"
+        "            seen[num] = i\n",
+    )
+
+    result = LocalJudge(str(tmp_path)).judge(question)
+
+    assert result.status_code == ACCEPTED
+    assert result.status_msg == "Accepted"
+    assert result.status_runtime.endswith(" ms")
+
+
+@pytest.mark.parametrize(
+    "body, status_code",
+    [
+        ("        return [1, 0]\n", WRONG_ANSWER),
+        ("        return nums[10]\n", RUNTIME_ERROR),
+        ("        return\n  nums\n", COMPILE_ERROR),
+        (
+            "        end = time.process_time() + 0.3\n        while time.process_time() < end: pass\n",
+            TIME_LIMIT_EXCEEDED,
+        ),
+        ("        return [0] * 10**9\n", MEMORY_LIMIT_EXCEEDED),
+    ],
+)
+def test_judge_classifies_the_first_failing_example(tmp_path, two_sum, body, status_code):
+    question = two_sum(body)
+
+    result = LocalJudge(str(tmp_path), time_limit=0.1, memory_limit=256).judge(question)
+
+    assert result.status_code == status_code
+    assert result.last_testcase == "[2,7,11,15], 9"
+    assert result.expected_output == "[0,1]"
+    if status_code == WRONG_ANSWER:
+        assert result.code_output == "[1,0]"
+    if status_code == RUNTIME_ERROR:
+        assert "IndexError" in result.runtime_error
+        assert "local_judge" not in result.runtime_error
+
+
+CORRECT_BODY = (
+    "        seen = {}\n"
+    "        for i, num in enumerate(nums):\n"
+    "            if target - num in seen:\n"
+    "                return [seen[target - num], i]\n"
+    "            seen[num] = i\n"
+)
+
+
+def test_judge_ignores_what_the_solution_prints_at_import_time(tmp_path, two_sum):
+    question = two_sum(CORRECT_BODY + "\n\nprint('debugging output')\n")
+
+    assert LocalJudge(str(tmp_path)).judge(question).status_code == ACCEPTED
+
+
+def test_judge_reports_output_written_past_the_redirection(tmp_path, two_sum):
+    question = two_sum(CORRECT_BODY + "\n\nimport os\n\nos.write(1, b'debugging output')\n")
+
+    result = LocalJudge(str(tmp_path)).judge(question)
+
+    assert result.status_code == RUNTIME_ERROR
+    assert "debugging output" in result.runtime_error
+
+
+def test_judge_needs_expected_outputs(tmp_path, two_sum):
+    question = two_sum("        return [0, 1]\n")
+    question.outputs = []
+
+    with pytest.raises(SolutionError, match="no expected outputs"):
+        LocalJudge(str(tmp_path)).judge(question)
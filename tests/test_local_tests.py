@@ -0,0 +1,98 @@
+from leet2git.local_tests import (
+    FAILED,
+    PASSED,
+    TIMEOUT,
+    LocalTestRecord,
+    LocalTestResult,
+    LocalTestRunner,
+    render_results,
+)
+from leet2git.question_db import QuestionData
+
+
+def write_question(tmp_path, question_id, test_body):
+    (tmp_path / "tests").mkdir(exist_ok=True)
+    (tmp_path / "src").mkdir(exist_ok=True)
+    source = tmp_path / "src" / f"leetcode_{question_id}.py"
+    source.write_text("VALUE = 1\n")
+    (tmp_path / "tests" / f"test_{question_id}.py").write_text(
+        f"import time\n\n\ndef test_solution():\n    {test_body}\n"
+    )
+    return QuestionData(
+        id=question_id,
+        title=f"Question {question_id}",
+        file_path=f"src/leetcode_{question_id}.py",
+        test_file_path=f"tests/test_{question_id}.py",
+    )
+
+
+def test_runner_reports_outcomes_and_stores_history(tmp_path):
+    questions = [
+        write_question(tmp_path, 1, "assert True"),
+        write_question(tmp_path, 2, "assert False"),
+    ]
+    runner = LocalTestRunner(str(tmp_path), jobs=2)
+
+    results = runner.run(reversed(questions))
+
+    assert [(result.question_id, result.outcome) for result in results] == [(1, PASSED), (2, FAILED)]
+    assert "assert False" in results[1].output
+    history = LocalTestRunner(str(tmp_path)).history
+    assert history.questions[1].outcome == PASSED
+    assert set(history.questions[1].file_stats) == {"src/leetcode_1.py", "tests/test_1.py"}
+    assert (tmp_path / ".leet2git" / "local_tests" / ".gitignore").read_text() == "*\n"
+
+
+def test_runner_stops_tests_after_the_timeout(tmp_path):
+    question = write_question(tmp_path, 1, "time.sleep(30)")
+
+    result = LocalTestRunner(str(tmp_path), timeout=0.5).run_question(question)
+
+    assert result.outcome == TIMEOUT
+    assert result.duration < 10
+
+
+def test_runner_selects_changed_questions_and_schedules_longest_first(tmp_path):
+    questions = [write_question(tmp_path, question_id, "assert True") for question_id in (1, 2, 3, 4)]
+    runner = LocalTestRunner(str(tmp_path))
+    for question, outcome, duration in zip(
+        questions[:3], (PASSED, PASSED, FAILED), (0.5, 2.0, 1.0), strict=True
+    ):
+        runner.history.questions[question.id] = LocalTestRecord(
+            outcome=outcome, duration=duration, file_stats=runner._file_stats(question)
+        )
+    (tmp_path / "src" / "leetcode_2.py").write_text("VALUE = 2\n")
+
+    assert [question.id for question in runner.select_changed(questions)] == [2, 3, 4]
+    assert [question.id for question in runner.schedule(questions)] == [4, 2, 3, 1]
+
+
+def test_render_results_colors_each_outcome():
+    lines = render_results(
+        [LocalTestResult(1, "Two Sum", PASSED, 0.25), LocalTestResult(2, "Add", TIMEOUT, 3.0)]
+    )
+
+    assert lines[1] == ("    1  passed       0.25s  Two Sum", "green")
+    assert lines[2][1] == "red"
+
+
+def test_verify_caches_a_pass_by_file_content(tmp_path):
+    question = write_question(tmp_path, 1, "assert True")
+    runner = LocalTestRunner(str(tmp_path))
+
+    first = runner.verify(question)
+    cached = LocalTestRunner(str(tmp_path)).verify(question)
+    (tmp_path / "src" / "leetcode_1.py").write_text("VALUE = 2\n")
+    changed = runner.verify(question)
+
+    assert first is not None and first.outcome == PASSED
+    assert cached is None
+    assert changed is not None and changed.outcome == PASSED
+
+
+def test_verify_runs_failing_tests_again(tmp_path):
+    question = write_question(tmp_path, 1, "assert False")
+    runner = LocalTestRunner(str(tmp_path))
+
+    assert runner.verify(question).outcome == FAILED
+    assert runner.verify(question).outcome == FAILED
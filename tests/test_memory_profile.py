@@ -0,0 +1,80 @@
+import tracemalloc
+
+from leet2git.memory_profile import (
+    AllocationSite,
+    MemoryProfileRun,
+    MemoryProfileStore,
+    format_size,
+    profile_memory,
+    sizes_by_line,
+)
+from leet2git.solution_runner import load_solution_module, prepare_call
+
+
+def test_profile_memory_finds_the_lines_holding_memory_at_the_peak(tmp_path, write_solution):
+    question = write_solution(
+        "class Solution:\n"
+        "    def build(self, n):\n"
+        "        table = {i: str(i) for i in range(n)}\n"
+        "        small = [0] * 10\n"
+        "        return len(table) + len(small)\n",
+        "build",
+    )
+    module = load_solution_module(str(tmp_path), question)
+
+    profile = profile_memory(prepare_call(module, question, [20000]), module.__file__)
+
+    assert profile.peak_memory > 1_000_000
+    assert profile.sites[0].line_number == 3
+    assert profile.sites[0].line.startswith("table = ")
+    assert profile.sites[0].size > 1_000_000
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_memory_snapshots_recursive_helpers(tmp_path, write_solution):
+    question = write_solution(
+        "class Solution:\n"
+        "    def build(self, n):\n"
+        "        def fill(depth, rows):\n"
+        "            if depth == 0:\n"
+        "                return len(rows)\n"
+        "            rows.append([depth] * 1000)\n"
+        "            return fill(depth - 1, rows)\n"
+        "        return fill(n, [])\n",
+        "build",
+    )
+    module = load_solution_module(str(tmp_path), question)
+
+    profile = profile_memory(prepare_call(module, question, [200]), module.__file__)
+
+    assert profile.sites[0].line_number == 6
+    assert profile.sites[0].count >= 200
+
+
+def test_memory_profile_store_keeps_comparable_runs(tmp_path):
+    store = MemoryProfileStore(str(tmp_path))
+    store.add_run(1, MemoryProfileRun(inputs_hash="a", peak_memory=10, sites={"table = {}": 8}))
+    store.add_run(1, MemoryProfileRun(inputs_hash="b", peak_memory=20))
+
+    previous = MemoryProfileStore(str(tmp_path)).previous_run(1, "a")
+
+    assert previous.peak_memory == 10
+    assert previous.sites == {"table = {}": 8}
+    assert store.previous_run(1, "c") is None
+    assert store.previous_run(2, "a") is None
+
+
+def test_sizes_by_line_matches_sites_by_their_code():
+    sites = [
+        AllocationSite(3, "table = {}", 8, 1),
+        AllocationSite(5, "row = []", 4, 1),
+        AllocationSite(9, "row = []", 2, 1),
+    ]
+
+    assert sizes_by_line(sites) == {"table = {}": 8, "row = []": 6}
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(-2048) == "-2.0 KiB"
+    assert format_size(3 * 2**20) == "3.0 MiB"
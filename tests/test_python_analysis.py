@@ -0,0 +1,71 @@
+from leet2git.python_analysis import PythonSourceAnalysis, analyze_python_source
+
+DESIGN_TEMPLATE = (
+    "class MinStack:\n"
+    "\n"
+    "    def __init__(self):\n"
+    "        \n"
+    "\n"
+    "    def push(self, val: int) -> None:\n"
+    "        \n"
+)
+
+
+def test_analysis_tokenizes_callables_and_def_lines_together():
+    analysis = PythonSourceAnalysis(DESIGN_TEMPLATE)
+
+    assert analysis.callables == ["MinStack", "push"]
+    assert analysis.def_lines == {3, 6}
+    # the template has empty function bodies, so it cannot be parsed
+    assert analysis.tree is None
+    assert analysis.main_block_line is None
+    assert analysis.without_main_block() == DESIGN_TEMPLATE
+
+
+def test_analysis_finds_future_import_position_and_main_block():
+    source = (
+        '"""Docstring"""\n'
+        "from __future__ import division\n"
+        "\n"
+        "class Solution:\n"
+        "    pass\n"
+        "\n"
+        'if __name__ == "__main__":\n'
+        "    print(Solution())\n"
+    )
+    analysis = PythonSourceAnalysis(source)
+
+    assert not analysis.has_future_annotations
+    assert analysis.future_insertion_line == 2
+    assert analysis.main_block_line == 7
+    assert analysis.without_main_block() == source[: source.index("if __name__")]
+    assert PythonSourceAnalysis("from __future__ import annotations\n").has_future_annotations
+
+
+def test_analysis_parses_once_and_is_shared_per_source(monkeypatch):
+    import leet2git.python_analysis as python_analysis
+
+    parsed_sources = []
+    original_parse = python_analysis.ast.parse
+    monkeypatch.setattr(
+        python_analysis.ast,
+        "parse",
+        lambda source: parsed_sources.append(source) or original_parse(source),
+    )
+    source = "x = 1  # shared analysis test\n"
+
+    analysis = analyze_python_source(source)
+    assert analysis.main_block_line is None
+    assert analysis.future_insertion_line == 0
+    assert not analyze_python_source(source).has_future_annotations
+
+    assert analyze_python_source(source) is analysis
+    assert parsed_sources == [source]
+
+
+def test_signatures_skip_self_and_keep_annotations():
+    analysis = analyze_python_source(
+        "class Solution:\n    def search(self, nums: List[int], target) -> int:\n        pass\n"
+    )
+
+    assert analysis.signatures == {"search": [("nums", "List[int]"), ("target", "")]}
@@ -1,8 +1,10 @@
 import ast
 import runpy
+import subprocess
 
 import pytest
 
+from leet2git import file_handler
 from leet2git.config_manager import AppConfig
 from leet2git.config_manager import TestCodeConfig as LeetTestCodeConfig
 from leet2git.file_handler import create_file_handler
@@ -66,8 +68,7 @@ def test_generate_source_creates_python_file_without_tests_when_disabled(tmp_pat
         test_code=LeetTestCodeConfig(generate_tests=False),
     )
     handler = make_handler(question, config)
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     file_path = handler.generate_source()
 
@@ -90,8 +91,7 @@ def test_generate_source_adds_test_entrypoint_when_enabled(tmp_path, monkeypatch
         question_template="class Solution:\n    def twoSum(self, nums, target):\n",
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     file_path = handler.generate_source()
 
@@ -100,6 +100,160 @@ def test_generate_source_adds_test_entrypoint_when_enabled(tmp_path, monkeypatch
     assert "pytest.main([os.path.join('tests', 'test_1.py')])" in content
 
 
+def test_generate_source_transforms_in_memory_and_writes_once(tmp_path, monkeypatch):
+    question = QuestionData(
+        id=1,
+        title="Two Sum",
+        difficulty="Easy",
+        url="https://leetcode.com/problems/two-sum",
+        file_path="src/leetcode_1_two_sum",
+        language="python3",
+        question_template="class Solution:\n    def twoSum(self, nums: List[int]) -> List[int]:\n",
+    )
+    handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
+    writes = []
+    original_atomic_write = file_handler.atomic_write
+    monkeypatch.setattr(
+        file_handler,
+        "atomic_write",
+        lambda file_path, content: (
+            writes.append((file_path, content)) or original_atomic_write(file_path, content)
+        ),
+    )
+    monkeypatch.setattr(
+        handler, "format_source", lambda source, _: source.replace("    pass", "  pass")
+    )
+
+    handler.generate_source()
+
+    assert len(writes) == 1
+    file_path, content = writes[0]
+    assert file_path == str(tmp_path / "src" / "leetcode_1_two_sum.py")
+    assert "from typing import List" in content
+    assert content.endswith("pytest.main([os.path.join('tests', 'test_1.py')])\n")
+    assert "        pass" not in content
+    assert list(handler.source_timings) == [
+        "header",
+        "code",
+        "imports",
+        "entrypoint",
+        "format",
+        "write",
+    ]
+
+
+def test_regenerating_unchanged_files_skips_formatting_and_writing(tmp_path, monkeypatch):
+    question = QuestionData(
+        id=1,
+        title="Two Sum",
+        file_path="src/leetcode_1_two_sum",
+        language="python3",
+        question_template="class Solution:\n    def twoSum(self, nums, target):\n",
+        function_name=["twoSum"],
+        inputs=["[2,7,11,15], 9"],
+        outputs=["[0, 1]"],
+    )
+    handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
+    formatted = []
+    monkeypatch.setattr(handler, "format_source", lambda source, path: formatted.append(path) or source)
+    source_path = str(handler.generate_source())
+    test_path = handler.generate_tests()
+    assert set(question.generated_files) == {source_path, test_path}
+    stats = [(tmp_path / path).stat().st_mtime_ns for path in (source_path, test_path)]
+    formatted.clear()
+
+    handler.generate_source()
+    handler.generate_tests()
+
+    assert formatted == []
+    assert [(tmp_path / path).stat().st_mtime_ns for path in (source_path, test_path)] == stats
+    assert "format" not in handler.source_timings
+
+
+def test_regenerating_detects_local_edits_and_unrecorded_files(tmp_path, monkeypatch, capsys):
+    question = QuestionData(
+        id=1,
+        file_path="src/leetcode_1_two_sum",
+        language="python3",
+        raw_code="class Solution:\n    def f(self):\n        return 1\n",
+    )
+    handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
+    source_file = tmp_path / handler.generate_source()
+    generated = source_file.read_text(encoding="UTF8")
+
+    # a file with the generated content but without record is kept as it is
+    question.generated_files.clear()
+    mtime_ns = source_file.stat().st_mtime_ns
+    handler.generate_source()
+    assert source_file.stat().st_mtime_ns == mtime_ns
+    assert question.generated_files
+
+    source_file.write_text(generated + "# local change\n", encoding="UTF8")
+    handler.generate_source()
+
+    assert source_file.read_text(encoding="UTF8") == generated + "# local change\n"
+    assert "Keeping the local changes" in capsys.readouterr().out
+
+    handler.overwrite_local_changes = True
+    handler.generate_source()
+
+    assert source_file.read_text(encoding="UTF8") == generated
+    assert "Overwriting the local changes" in capsys.readouterr().out
+
+
+def test_generate_source_and_tests_leave_deferred_formatting_to_the_queue(tmp_path, monkeypatch):
+    question = QuestionData(
+        id=1,
+        title="Two Sum",
+        file_path="src/leetcode_1_two_sum",
+        language="python3",
+        question_template="class Solution:\n    def twoSum(self, nums, target):\n",
+        function_name=["twoSum"],
+        inputs=["[2,7,11,15], 9"],
+        outputs=["[0, 1]"],
+    )
+    handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
+    handler.defer_formatting = True
+
+    def fail_format(*args):
+        raise AssertionError("deferred files must not be formatted immediately")
+
+    monkeypatch.setattr(handler, "format_source", fail_format)
+
+    question.file_path = str(handler.generate_source())
+    handler.generate_tests()
+
+    assert "format" not in handler.source_timings
+    assert (tmp_path / "tests" / "test_1.py").exists()
+
+
+def test_generate_source_falls_back_to_autoimport_for_unknown_names(tmp_path, monkeypatch):
+    question = QuestionData(
+        id=1,
+        file_path="src/leetcode_1_two_sum",
+        language="python3",
+        raw_code="class Solution:\n    def f(self) -> int:\n        return Decimal(1) + deque()\n",
+    )
+    handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
+    fallback_sources = []
+    monkeypatch.setattr(
+        handler,
+        "_fix_imports_with_autoimport",
+        lambda source: fallback_sources.append(source) or source,
+    )
+
+    handler.generate_source()
+    question.raw_code = (
+        "class Solution:\n    def f(self, root: TreeNode) -> int:\n        return deque()\n"
+    )
+    handler.generate_source()
+
+    assert len(fallback_sources) == 1
+    assert "from collections import deque\n" in fallback_sources[0]
+
+
 def test_generate_source_omits_test_entrypoint_for_soft_error_import(tmp_path, monkeypatch):
     question = QuestionData(
         id=987,
@@ -115,8 +269,7 @@ def test_generate_source_omits_test_entrypoint_for_soft_error_import(tmp_path, m
         requires_custom_test_harness=True,
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     file_path = handler.generate_source()
 
@@ -125,7 +278,7 @@ def test_generate_source_omits_test_entrypoint_for_soft_error_import(tmp_path, m
     assert 'if __name__ == "__main__"' not in content
 
 
-def test_remove_test_entrypoint_preserves_generated_solution(tmp_path, monkeypatch):
+def test_remove_test_entrypoint_preserves_generated_solution(tmp_path, monkeypatch, capsys):
     question = QuestionData(
         id=1,
         title="Two Sum",
@@ -134,8 +287,7 @@ def test_remove_test_entrypoint_preserves_generated_solution(tmp_path, monkeypat
         question_template="class Solution:\n    def twoSum(self, nums, target):\n",
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
     question.file_path = str(handler.generate_source())
 
     handler.remove_test_entrypoint()
@@ -143,6 +295,9 @@ def test_remove_test_entrypoint_preserves_generated_solution(tmp_path, monkeypat
     content = (tmp_path / question.file_path).read_text(encoding="UTF8")
     assert "class Solution" in content
     assert 'if __name__ == "__main__"' not in content
+    record = question.generated_files[question.file_path]
+    assert record.matches((tmp_path / question.file_path).stat())
+    assert "local changes" not in capsys.readouterr().out
 
 
 @pytest.mark.parametrize("judge_type", ["TreeNode", "ListNode"])
@@ -166,8 +321,7 @@ def test_generate_source_defers_judge_type_annotations(judge_type, tmp_path, mon
             test_code=LeetTestCodeConfig(generate_tests=False),
         ),
     )
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     source_path = tmp_path / handler.generate_source()
     content = source_path.read_text(encoding="UTF8")
@@ -194,8 +348,7 @@ def test_generate_source_keeps_module_docstring_before_future_import(tmp_path, m
             test_code=LeetTestCodeConfig(generate_tests=False),
         ),
     )
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     source_path = tmp_path / handler.generate_source()
     content = source_path.read_text(encoding="UTF8")
@@ -222,8 +375,7 @@ def test_generate_source_does_not_duplicate_existing_annotations_future(tmp_path
             test_code=LeetTestCodeConfig(generate_tests=False),
         ),
     )
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     source_path = tmp_path / handler.generate_source()
 
@@ -241,7 +393,7 @@ def test_generate_tests_creates_single_function_pytest_file(tmp_path, monkeypatc
         outputs=["[0, 1]", "[1, 2]"],
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     test_file_path = handler.generate_tests()
 
@@ -275,7 +427,7 @@ def test_generate_tests_creates_constructor_style_pytest_file(tmp_path, monkeypa
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
     question.function_name = handler.get_function_name()
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     test_file_path = handler.generate_tests()
 
@@ -305,7 +457,7 @@ def test_generate_tests_uses_each_design_cases_constructor_arguments(tmp_path, m
         outputs=["[null,3]", "[null,12]"],
     )
     handler = make_handler(question, AppConfig(source_path=str(tmp_path)))
-    monkeypatch.setattr(handler, "run_formatter", lambda _: None)
+    monkeypatch.setattr(handler, "format_source", lambda source, _: source)
 
     test_file_path = handler.generate_tests()
 
@@ -346,26 +498,54 @@ def test_generate_submission_file_strips_generated_main_block(tmp_path):
     assert handler.generate_submission_file() == "class Solution:\n    pass\n\n"
 
 
-def test_run_formatter_skips_when_ruff_is_unavailable(monkeypatch, capsys):
-    handler = make_handler()
-    monkeypatch.setattr("leet2git.python_handler.shutil.which", lambda _: None)
+def test_format_source_pipes_code_through_ruff_and_caches_the_output(tmp_path, monkeypatch):
+    handler = make_handler(config=AppConfig(source_path=str(tmp_path)))
+    calls = []
 
-    handler.run_formatter("solution.py")
+    def fake_run(args, **kwargs):
+        calls.append((args, kwargs))
+        return subprocess.CompletedProcess(args, 0, kwargs["input"] + f"# {args[1]}\n", "")
 
-    assert "ruff is not installed" in capsys.readouterr().out
+    monkeypatch.setattr("leet2git.python_handler.shutil.which", lambda _: "/usr/bin/ruff")
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr("leet2git.python_handler.subprocess.run", fake_run)
 
+    formatted = handler.format_source("x = 1\n", "src/solution.py")
+
+    assert formatted == "x = 1\n# check\n# format\n"
+    assert calls[0][0][-3:] == ["--stdin-filename", "src/solution.py", "-"]
+    assert calls[1][0] == ["ruff", "format", "--stdin-filename", "src/solution.py", "-"]
+
+    assert handler.format_source("x = 1\n", "src/other.py") == formatted
+    (tmp_path / "ruff.toml").write_text("line-length = 80\n")
+    handler.format_source("x = 1\n", "src/solution.py")
+    assert len(calls) == 4
+
+
+def test_format_source_keeps_code_when_ruff_fails(tmp_path, monkeypatch, capsys):
+    handler = make_handler(config=AppConfig(source_path=str(tmp_path)))
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+
+    def failing_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 2, "", "error: Failed to parse solution.py")
 
-def test_run_formatter_invokes_ruff_without_shell(monkeypatch):
-    handler = make_handler()
-    calls = []
     monkeypatch.setattr("leet2git.python_handler.shutil.which", lambda _: "/usr/bin/ruff")
-    monkeypatch.setattr(
-        "leet2git.python_handler.subprocess.run",
-        lambda args, **kwargs: calls.append((args, kwargs)),
-    )
+    monkeypatch.setattr("leet2git.python_handler.subprocess.run", failing_run)
+
+    assert handler.format_source("def f(:\n", "solution.py") == "def f(:\n"
+    assert "Could not format solution.py: error: Failed to parse" in capsys.readouterr().out
+    assert not (tmp_path / ".leet2git" / "format_cache").exists()
+
+
+def test_format_source_keeps_fixes_when_some_issues_remain(tmp_path, monkeypatch):
+    handler = make_handler(config=AppConfig(source_path=str(tmp_path)))
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr("leet2git.python_handler.shutil.which", lambda _: "/usr/bin/ruff")
+
+    def run_with_unfixable_issue(args, **kwargs):
+        returncode = 1 if args[1] == "check" else 0
+        return subprocess.CompletedProcess(args, returncode, kwargs["input"] + f"# {args[1]}\n", "")
 
-    handler.run_formatter("solution.py")
+    monkeypatch.setattr("leet2git.python_handler.subprocess.run", run_with_unfixable_issue)
 
-    assert calls[0][0] == ["ruff", "check", "--fix", "--select", "I,UP,F401", "solution.py"]
-    assert calls[1][0] == ["ruff", "format", "solution.py"]
-    assert all("shell" not in kwargs for _, kwargs in calls)
+    assert handler.format_source("x = 1\n", "solution.py") == "x = 1\n# check\n# format\n"
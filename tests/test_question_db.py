@@ -1,7 +1,16 @@
+import json
+import multiprocessing
+import os
 import pickle
 
 from leet2git.config_manager import AppConfig
-from leet2git.question_db import IdTitleMap, QuestionData, QuestionDB, TopicTag
+from leet2git.question_db import (
+    GeneratedFile,
+    IdTitleMap,
+    QuestionData,
+    QuestionDB,
+    TopicTag,
+)
 
 
 def make_config(tmp_path):
@@ -81,3 +90,230 @@ def test_question_data_unpickles_dataclass_style_state():
     question.__setstate__({"id": "7", "title": "Reverse Integer"})
 
     assert question == QuestionData(id=7, title="Reverse Integer")
+
+
+def test_question_db_keeps_creation_order_across_updates(tmp_path):
+    question_db = QuestionDB(make_config(tmp_path))
+    question_db.add_question(QuestionData(id=3, creation_time=30.0))
+    question_db.add_question(QuestionData(id=1, creation_time=10.0))
+    question_db.add_question(QuestionData(id=2, creation_time=20.0))
+    question_db.add_question(QuestionData(id=1, creation_time=40.0))
+    question_db.delete_question(3)
+
+    assert [q.id for q in question_db.get_questions_sorted_by_creation_time()] == [2, 1]
+
+
+def test_question_db_returns_questions_in_creation_time_range(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    for question_id in range(1, 6):
+        question_db.add_question(QuestionData(id=question_id, creation_time=question_id * 10.0))
+    question_db.save()
+
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    assert [q.id for q in loaded_db.get_questions_created_between(20.0, 40.0)] == [2, 3]
+    assert [q.id for q in loaded_db.get_questions_created_between(start=35.0)] == [4, 5]
+    assert [q.id for q in loaded_db.get_questions_created_between(end=15.0)] == [1]
+    assert [q.id for q in loaded_db.get_questions_created_since(1, now=30.0 + 86400)] == [3, 4, 5]
+
+
+def test_question_db_keeps_catalog_in_its_own_lazy_file(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    question_db.add_question(QuestionData(id=1, title="Two Sum"))
+    question_db.set_id_title_map(IdTitleMap(id_to_title={1: "two-sum"}, title_to_id={"two-sum": 1}))
+    question_db.save()
+
+    assert "two-sum" not in (tmp_path / "solutions" / ".leet2git" / "database.json").read_text()
+
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    assert loaded_db._id_title_map is None
+    assert loaded_db.get_title_from_id(1) == "two-sum"
+    assert loaded_db.catalog_fetched_at > 0
+
+
+def test_question_db_migrates_embedded_catalog(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    os.makedirs(question_db.db_dir)
+    with open(question_db.db_file, "w", encoding="UTF8") as file:
+        json.dump(
+            {
+                "version": 1,
+                "questions": {"1": {"id": 1, "title": "Two Sum"}},
+                "id_title_map": {"id_to_title": {"1": "two-sum"}, "title_to_id": {"two-sum": 1}},
+            },
+            file,
+        )
+
+    question_db.load()
+
+    assert os.path.isfile(question_db.catalog_file)
+    with open(question_db.db_file, encoding="UTF8") as file:
+        assert "id_title_map" not in json.load(file)
+    assert question_db.get_id_from_title("two-sum") == 1
+
+
+def test_question_db_save_merges_concurrent_changes(tmp_path):
+    config = make_config(tmp_path)
+    seed_db = QuestionDB(config)
+    seed_db.add_question(QuestionData(id=1, title="Two Sum"))
+    seed_db.add_question(QuestionData(id=2, title="Add Two Numbers"))
+    seed_db.save()
+
+    first_db = QuestionDB(config)
+    first_db.load()
+    second_db = QuestionDB(config)
+    second_db.load()
+
+    first_db.add_question(QuestionData(id=3, title="Longest Substring"))
+    first_db.save()
+    second_db.delete_question(1)
+    second_db.add_question(QuestionData(id=4, title="Median of Two Sorted Arrays"))
+    second_db.save()
+
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    assert sorted(loaded_db.get_data()) == [2, 3, 4]
+    assert sorted(second_db.get_data()) == [2, 3, 4]
+
+
+def test_question_db_save_skips_merge_when_file_is_unchanged(tmp_path, monkeypatch):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    question_db.add_question(QuestionData(id=1, title="Two Sum"))
+    question_db.save()
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    def fail_read():
+        raise AssertionError("an unchanged database must not be read again")
+
+    monkeypatch.setattr(question_db, "_read_database", fail_read)
+    monkeypatch.setattr(loaded_db, "_read_database", fail_read)
+    question_db.add_question(QuestionData(id=2, title="Add Two Numbers"))
+    question_db.save()
+    monkeypatch.undo()
+    loaded_db.add_question(QuestionData(id=3, title="Longest Substring"))
+    loaded_db.save()
+
+    assert sorted(loaded_db.get_data()) == [1, 2, 3]
+
+
+def _save_questions(config, first_id):
+    for question_id in range(first_id, first_id + 5):
+        question_db = QuestionDB(config)
+        question_db.load()
+        question_db.add_question(QuestionData(id=question_id))
+        question_db.save()
+
+
+def test_question_db_save_is_safe_across_processes(tmp_path):
+    config = make_config(tmp_path)
+    processes = [
+        multiprocessing.Process(target=_save_questions, args=(config, first_id))
+        for first_id in (0, 10, 20, 30)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    assert len(loaded_db.get_data()) == 20
+
+
+def test_question_db_reset_discards_stored_questions(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    question_db.add_question(QuestionData(id=1))
+    question_db.save()
+
+    QuestionDB(config).reset()
+
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+    assert loaded_db.get_data() == {}
+
+
+def test_question_db_round_trips_generated_files_and_ignores_its_lock_file(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    question = QuestionData(
+        id=1,
+        title="Two Sum",
+        generated_files={"src/leetcode_1.py": GeneratedFile(content_hash="ab", mtime_ns=3, size=4)},
+    )
+    question_db.add_question(question)
+    question_db.save()
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+
+    assert loaded_db.get_question(1) == question
+    with open(os.path.join(question_db.db_dir, ".gitignore"), encoding="UTF8") as file:
+        assert file.read().splitlines() == [".lock"]
+
+
+def test_question_db_query_uses_secondary_indexes(tmp_path):
+    question_db = QuestionDB(make_config(tmp_path))
+    array = TopicTag(name="Array", slug="array")
+    string = TopicTag(name="String", slug="string")
+    question_db.add_question(
+        QuestionData(
+            id=1,
+            creation_time=10.0,
+            difficulty="Easy",
+            language="python3",
+            file_path="src/leetcode_1_two_sum.py",
+            categories=[array],
+        )
+    )
+    question_db.add_question(
+        QuestionData(
+            id=2, creation_time=20.0, difficulty="Medium", language="python3", categories=[string]
+        )
+    )
+    question_db.add_question(
+        QuestionData(
+            id=3, creation_time=30.0, difficulty="Easy", language="rust", categories=[array, string]
+        )
+    )
+
+    assert [q.id for q in question_db.query(difficulty="easy")] == [1, 3]
+    assert [q.id for q in question_db.query(tag="string", language="python3")] == [2]
+    assert [q.id for q in question_db.query(file_path="src/leetcode_1_two_sum.py")] == [1]
+    assert [q.id for q in question_db.query(tag="array", created_after=15.0)] == [3]
+    assert [q.id for q in question_db.query(created_before=25.0)] == [1, 2]
+    assert question_db.query(difficulty="Hard") == []
+
+    question_db.add_question(QuestionData(id=3, creation_time=30.0, difficulty="Hard"))
+    question_db.delete_question(1)
+
+    assert question_db.query(tag="array") == []
+    assert [q.id for q in question_db.query(difficulty="hard")] == [3]
+    assert question_db.query(file_path="src/leetcode_1_two_sum.py") == []
+
+
+def test_question_db_builds_indexes_on_first_query(tmp_path):
+    config = make_config(tmp_path)
+    question_db = QuestionDB(config)
+    question_db.add_question(QuestionData(id=1, difficulty="Easy", creation_time=2.0))
+    question_db.save()
+    loaded_db = QuestionDB(config)
+    loaded_db.load()
+    loaded_db.add_question(QuestionData(id=2, difficulty="Easy", creation_time=1.0))
+    assert loaded_db._indexes_built is False
+
+    assert [qd.id for qd in loaded_db.query(difficulty="easy")] == [2, 1]
+    loaded_db.delete_question(2)
+    loaded_db.add_question(QuestionData(id=3, difficulty="Hard", creation_time=3.0))
+    assert [qd.id for qd in loaded_db.query(difficulty="easy")] == [1]
+    assert [qd.id for qd in loaded_db.get_questions_sorted_by_creation_time()] == [1, 3]
+    assert loaded_db._indexes_built is True
@@ -1,3 +1,4 @@
+from leet2git import readme_handler
 from leet2git.config_manager import AppConfig, ReadmeConfig
 from leet2git.question_db import QuestionData, TopicTag
 from leet2git.readme_handler import ReadmeHandler
@@ -58,3 +59,97 @@ def test_readme_handler_can_disable_anchor_sections(tmp_path):
         "|1|[Two Sum](src/leetcode_1_two_sum.py)|[1](https://leetcode.com/problems/two-sum)|Array|Easy|"
         in readme
     )
+
+
+def make_question(question_id, difficulty, *categories):
+    return QuestionData(
+        id=question_id,
+        title=f"Problem {question_id}",
+        difficulty=difficulty,
+        url=f"https://leetcode.com/problems/problem-{question_id}",
+        file_path=f"src/leetcode_{question_id}_problem.py",
+        creation_time=float(question_id),
+        categories=[TopicTag(name=slug.title(), slug=slug) for slug in categories],
+    )
+
+
+def test_build_readme_skips_write_when_content_is_unchanged(tmp_path, monkeypatch):
+    config = AppConfig(source_path=str(tmp_path))
+    questions = [make_question(1, "Easy", "array")]
+    handler = ReadmeHandler(config)
+    handler.build_readme(questions)
+    readme = (tmp_path / "README.md").read_bytes()
+
+    def fail_write(file_path, content):
+        raise AssertionError("an unchanged README must not be written")
+
+    monkeypatch.setattr(readme_handler, "atomic_write", fail_write)
+    handler.build_readme(questions)
+
+    written = []
+    monkeypatch.setattr(
+        readme_handler, "atomic_write", lambda file_path, content: written.append(content)
+    )
+    handler.build_readme([*questions, make_question(2, "Hard", "string")])
+
+    assert (tmp_path / "README.md").read_bytes() == readme
+    assert len(written) == 1
+    assert b"|2|[Problem 2](src/leetcode_2_problem.py)|" in written[0]
+
+
+def read_tree(path):
+    return {
+        str(file.relative_to(path)): file.read_text(encoding="UTF8")
+        for file in sorted(path.rglob("*.md"))
+    }
+
+
+def test_multi_page_readme_links_pages_relative_to_the_repository(tmp_path):
+    config = AppConfig(source_path=str(tmp_path), readme=ReadmeConfig(multi_page=True))
+    questions = [make_question(1, "Easy", "array"), make_question(2, "Medium", "array", "string")]
+
+    ReadmeHandler(config).build_readme(questions)
+
+    readme = (tmp_path / "README.md").read_text(encoding="UTF8")
+    assert "|1|[Problem 1](src/leetcode_1_problem.py)|" in readme
+    assert "[Array](readme/categories/array.md)" in readme
+    assert "- [Array](readme/categories/array.md) (2)" in readme
+    assert "- [Hard Questions](readme/difficulty/Hard.md) (0)" in readme
+    assert "Problem 1" not in (tmp_path / "readme" / "categories" / "string.md").read_text()
+    array_page = (tmp_path / "readme" / "categories" / "array.md").read_text(encoding="UTF8")
+    assert "[Back to the summary](../../README.md)" in array_page
+    assert (
+        "|2|[Problem 2](../../src/leetcode_2_problem.py)|"
+        "[2](https://leetcode.com/problems/problem-2)|[Medium](../../readme/difficulty/Medium.md)|"
+        in array_page
+    )
+
+
+def test_multi_page_readme_removes_pages_no_longer_listed(tmp_path):
+    config = AppConfig(source_path=str(tmp_path), readme=ReadmeConfig(multi_page=True))
+    questions = [make_question(1, "Easy", "array"), make_question(3, "Medium", "string")]
+    ReadmeHandler(config).build_readme(questions)
+
+    questions[1] = make_question(3, "Medium", "tree")
+    ReadmeHandler(config).build_readme(questions)
+
+    assert sorted(read_tree(tmp_path)) == [
+        "README.md",
+        "readme/categories/array.md",
+        "readme/categories/tree.md",
+        "readme/difficulty/Easy.md",
+        "readme/difficulty/Hard.md",
+        "readme/difficulty/Medium.md",
+    ]
+
+
+def test_single_page_readme_removes_the_multi_page_pages(tmp_path):
+    questions = [make_question(1, "Easy", "array")]
+    multi_page = AppConfig(source_path=str(tmp_path), readme=ReadmeConfig(multi_page=True))
+    ReadmeHandler(multi_page).build_readme(questions)
+    (tmp_path / "readme" / "notes.md").write_text("kept", encoding="UTF8")
+
+    ReadmeHandler(AppConfig(source_path=str(tmp_path))).build_readme(questions)
+
+    assert sorted(read_tree(tmp_path)) == ["README.md", "readme/notes.md"]
+    assert sorted(path.name for path in (tmp_path / "readme").iterdir()) == ["notes.md"]
@@ -0,0 +1,167 @@
+import shutil
+import subprocess
+
+import pytest
+
+from leet2git import ruff_formatter
+from leet2git.question_db import GeneratedFile, QuestionData
+from leet2git.ruff_formatter import FormatQueue, format_files
+
+
+class Completed:
+    def __init__(self, returncode=0, stderr=""):
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def test_format_files_runs_ruff_once_per_chunk(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ruff_formatter, "FORMAT_CHUNK_SIZE", 2)
+    monkeypatch.setattr("leet2git.ruff_formatter.shutil.which", lambda _: "/usr/bin/ruff")
+    monkeypatch.setattr(
+        "leet2git.ruff_formatter.subprocess.run",
+        lambda args, **kwargs: calls.append(args) or Completed(),
+    )
+
+    format_files(["a.py", "b.py", "c.py"])
+
+    assert calls == [
+        ["ruff", "check", "--fix", "--select", "I,UP,F401", "a.py", "b.py"],
+        ["ruff", "format", "a.py", "b.py"],
+        ["ruff", "check", "--fix", "--select", "I,UP,F401", "c.py"],
+        ["ruff", "format", "c.py"],
+    ]
+
+
+def test_format_files_only_reports_real_failures(monkeypatch, capsys):
+    results = iter([Completed(1), Completed(0), Completed(1), Completed(2, "c.py: parse error")])
+    monkeypatch.setattr("leet2git.ruff_formatter.shutil.which", lambda _: "/usr/bin/ruff")
+    monkeypatch.setattr("leet2git.ruff_formatter.subprocess.run", lambda args, **kwargs: next(results))
+
+    format_files(["a.py"])
+    assert capsys.readouterr().out == ""
+
+    format_files(["c.py"])
+    assert "c.py: parse error" in capsys.readouterr().out
+
+
+def test_format_files_skips_when_ruff_is_unavailable(monkeypatch, capsys):
+    monkeypatch.setattr("leet2git.ruff_formatter.shutil.which", lambda _: None)
+
+    format_files(["a.py"])
+
+    assert "ruff is not installed" in capsys.readouterr().out
+
+
+def test_format_queue_collects_existing_python_files(tmp_path, monkeypatch):
+    formatted = []
+    monkeypatch.setattr("leet2git.ruff_formatter.format_files", formatted.append)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "leetcode_1.py").write_text("x=1\n")
+    (tmp_path / "src" / "leetcode_2.rs").write_text("fn main() {}\n")
+    queue = FormatQueue(str(tmp_path))
+
+    queue.add_question(
+        QuestionData(id=1, file_path="src/leetcode_1.py", test_file_path="tests/test_1.py")
+    )
+    queue.add_question(QuestionData(id=1, file_path="src/leetcode_1.py"))
+    queue.add_question(QuestionData(id=2, file_path="src/leetcode_2.rs"))
+    queue.flush()
+    queue.flush()
+
+    assert formatted == [[str(tmp_path / "src" / "leetcode_1.py")], []]
+
+
+def test_format_queue_reuses_cached_output(tmp_path, monkeypatch):
+    runs = []
+
+    def fake_format_files(file_paths):
+        runs.append(file_paths)
+        for file_path in file_paths:
+            with open(file_path, "a") as f:
+                f.write("# formatted\n")
+        return True
+
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr("leet2git.ruff_formatter.format_files", fake_format_files)
+    first = tmp_path / "leetcode_1.py"
+    second = tmp_path / "leetcode_2.py"
+    first.write_text("x=1\n")
+    queue = FormatQueue(str(tmp_path))
+
+    queue.add_question(QuestionData(id=1, file_path="leetcode_1.py"))
+    queue.flush()
+    second.write_text("x=1\n")
+    queue.add_question(QuestionData(id=1, file_path="leetcode_1.py"))
+    queue.add_question(QuestionData(id=2, file_path="leetcode_2.py"))
+    queue.flush()
+
+    assert runs == [[str(first)], []]
+    assert first.read_text() == second.read_text() == "x=1\n# formatted\n"
+
+
+def test_format_queue_updates_generated_file_records(tmp_path, monkeypatch):
+    def fake_format_files(file_paths):
+        for file_path in file_paths:
+            with open(file_path, "a") as f:
+                f.write("# formatted\n")
+        return True
+
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr("leet2git.ruff_formatter.format_files", fake_format_files)
+    source = tmp_path / "leetcode_1.py"
+    source.write_text("x=1\n")
+    question = QuestionData(
+        id=1,
+        file_path="leetcode_1.py",
+        generated_files={
+            "leetcode_1.py": GeneratedFile(
+                content_hash="ab", mtime_ns=source.stat().st_mtime_ns, size=4
+            )
+        },
+    )
+    queue = FormatQueue(str(tmp_path))
+
+    queue.add_question(question)
+    queue.flush()
+
+    record = question.generated_files["leetcode_1.py"]
+    assert record.content_hash == "ab"
+    assert record.matches(source.stat())
+
+
+def test_format_queue_skips_locally_edited_files(tmp_path, monkeypatch):
+    def fail_format_files(file_paths):
+        assert not file_paths, "an edited file must not be formatted"
+        return False
+
+    monkeypatch.setattr("leet2git.format_cache._ruff_version", lambda: "ruff 0.0.0")
+    monkeypatch.setattr("leet2git.ruff_formatter.format_files", fail_format_files)
+    source = tmp_path / "leetcode_1.py"
+    source.write_text("x=1  # edited\n")
+    record = GeneratedFile(content_hash="ab", size=4)
+    question = QuestionData(id=1, file_path="leetcode_1.py", generated_files={"leetcode_1.py": record})
+    queue = FormatQueue(str(tmp_path))
+
+    queue.add_question(question)
+    queue.flush()
+
+    assert source.read_text() == "x=1  # edited\n"
+    assert not record.matches(source.stat())
+
+
+@pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff is not installed")
+def test_format_queue_formats_files_with_ruff(tmp_path):
+    source = tmp_path / "leetcode_1.py"
+    source.write_text(
+        "import os\nfrom typing import List\ndef f(x: List[int])->List[int]:\n  return x\n"
+    )
+    queue = FormatQueue(str(tmp_path))
+
+    queue.add_question(QuestionData(id=1, file_path="leetcode_1.py"))
+    queue.flush()
+
+    assert source.read_text() == "def f(x: list[int]) -> list[int]:\n    return x\n"
+    assert (
+        subprocess.run(["ruff", "format", "--check", str(source)], capture_output=True).returncode == 0
+    )
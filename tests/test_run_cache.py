@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import leet2git.run_cache as run_cache_module
+from leet2git.leetcode_models import SubmissionResultResponse
+from leet2git.run_cache import RunCache, run_key
+
+
+def test_run_key_changes_with_the_language_code_and_inputs():
+    key = run_key("python3", "code", "[1]\n2")
+
+    assert key == run_key("python3", "code", "[1]\n2")
+    assert key != run_key("python", "code", "[1]\n2")
+    assert key != run_key("python3", "code ", "[1]\n2")
+    assert key != run_key("python3", "code", "[1]\n3")
+
+
+def test_run_cache_stores_results_per_question(tmp_path):
+    result = SubmissionResultResponse(state="SUCCESS", status_msg="Wrong Answer", status_code=11)
+    RunCache(str(tmp_path)).add(1, "key", result)
+
+    cache = RunCache(str(tmp_path))
+
+    assert cache.get(1, "key").result == result
+    assert cache.get(1, "other") is None
+    assert cache.get(2, "key") is None
+    assert (tmp_path / ".leet2git" / "run_cache" / ".gitignore").read_text() == "*\n"
+
+
+def test_run_cache_drops_the_oldest_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_cache_module, "MAX_CACHED_RUNS", 2)
+    clock = iter(range(10))
+    monkeypatch.setattr(run_cache_module, "time", SimpleNamespace(time=lambda: float(next(clock))))
+    cache = RunCache(str(tmp_path))
+    result = SubmissionResultResponse(state="SUCCESS", status_code=10)
+
+    for key in ("first", "second", "third"):
+        cache.add(1, key, result)
+
+    assert cache.get(1, "first") is None
+    assert cache.get(1, "second") is not None
+    assert cache.get(1, "third") is not None
+
+
+def test_run_cache_skips_verdicts_that_may_change(tmp_path):
+    cache = RunCache(str(tmp_path))
+
+    for key, status_code in (("limit", 14), ("memory", 12), ("unknown", None)):
+        result = SubmissionResultResponse(state="SUCCESS", status_code=status_code)
+        assert not cache.add(1, key, result)
+        assert cache.get(1, key) is None
+    assert cache.add(1, "accepted", SubmissionResultResponse(state="SUCCESS", status_code=10))
+    assert cache.get(1, "accepted") is not None
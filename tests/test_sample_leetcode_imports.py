@@ -101,8 +101,9 @@ def test_inspect_problem_generates_and_validates_python_files(tmp_path, monkeypa
                 outputs=["[0,1]"],
             )
 
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr("leet2git.python_handler.PythonHandler.run_formatter", lambda *_: None)
+    monkeypatch.setattr(
+        "leet2git.python_handler.PythonHandler.format_source", lambda self, source, _: source
+    )
     candidate = Candidate(1, "two-sum", "Easy", 0)
 
     result = inspect_problem(candidate, tmp_path, "python3", FakeClient())
@@ -137,8 +138,9 @@ def test_inspect_problem_reports_non_module_constructor_as_soft_error(tmp_path,
                 outputs=['[null,"",null]'],
             )
 
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr("leet2git.python_handler.PythonHandler.run_formatter", lambda *_: None)
+    monkeypatch.setattr(
+        "leet2git.python_handler.PythonHandler.format_source", lambda self, source, _: source
+    )
     candidate = Candidate(297, "serialize-and-deserialize-binary-tree", "Hard", 1)
 
     result = inspect_problem(candidate, tmp_path, "python3", FakeClient())
@@ -169,8 +171,9 @@ def test_inspect_problem_classifies_judge_supplied_types_as_unsupported_tests(tm
                 outputs=["[[9],[3,15],[20],[7]]"],
             )
 
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr("leet2git.python_handler.PythonHandler.run_formatter", lambda *_: None)
+    monkeypatch.setattr(
+        "leet2git.python_handler.PythonHandler.format_source", lambda self, source, _: source
+    )
     candidate = Candidate(987, "vertical-order-traversal-of-a-binary-tree", "Hard", 1)
 
     result = inspect_problem(candidate, tmp_path, "python3", FakeClient())
@@ -202,8 +205,9 @@ def test_inspect_problem_classifies_custom_output_metadata_as_unsupported(tmp_pa
                 requires_custom_test_harness=True,
             )
 
-    monkeypatch.setattr("leet2git.python_handler.fix_files", lambda _: None)
-    monkeypatch.setattr("leet2git.python_handler.PythonHandler.run_formatter", lambda *_: None)
+    monkeypatch.setattr(
+        "leet2git.python_handler.PythonHandler.format_source", lambda self, source, _: source
+    )
     candidate = Candidate(27, "remove-element", "Easy", 0)
 
     result = inspect_problem(candidate, tmp_path, "python3", FakeClient())
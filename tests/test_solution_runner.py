@@ -0,0 +1,115 @@
+import pytest
+
+from leet2git.question_db import QuestionData, TopicTag
+from leet2git.solution_runner import (
+    SolutionError,
+    load_solution_module,
+    load_variant,
+    main_class_name,
+    normalize_output,
+    parse_input,
+    parse_inputs,
+    prepare_call,
+    same_value,
+)
+
+
+def test_parse_input_reads_json_arguments():
+    assert parse_input('[2,7,11,15], 9, "ab", null, true') == [[2, 7, 11, 15], 9, "ab", None, True]
+    assert parse_inputs(QuestionData(inputs=["[1], 2"]), ["[3], 4"]) == [[[1], 2], [[3], 4]]
+    with pytest.raises(SolutionError, match="Could not parse"):
+        parse_input("[1,")
+
+
+def test_prepare_call_uses_fresh_arguments_and_solution(tmp_path, write_solution):
+    question = write_solution(
+        "class Solution:\n"
+        "    calls = 0\n"
+        "    def sortFirst(self, nums):\n"
+        "        Solution.calls += 1\n"
+        "        nums.sort()\n"
+        "        return nums[0], Solution.calls\n",
+        "sortFirst",
+    )
+    module = load_solution_module(str(tmp_path), question)
+    arguments = [[3, 1, 2]]
+
+    assert prepare_call(module, question, arguments)() == (1, 1)
+    assert prepare_call(module, question, arguments)() == (1, 2)
+    assert arguments == [[3, 1, 2]]
+
+
+def test_prepare_call_runs_design_problems(tmp_path, write_solution):
+    question = write_solution(
+        "class Counter:\n"
+        "    def __init__(self, start):\n"
+        "        self.value = start\n"
+        "    def add(self, amount):\n"
+        "        self.value += amount\n"
+        "        return self.value\n",
+        "Counter",
+        "add",
+    )
+    module = load_solution_module(str(tmp_path), question)
+
+    call = prepare_call(module, question, parse_input('["Counter","add","add"], [[1],[2],[3]]'))
+
+    assert call() == [None, 3, 6]
+    with pytest.raises(SolutionError, match="method and argument lists"):
+        prepare_call(module, question, [1])
+
+
+def test_load_solution_module_reports_unsupported_questions(tmp_path, write_solution):
+    question = write_solution("raise RuntimeError('broken')\n", "f")
+
+    with pytest.raises(SolutionError, match="RuntimeError: broken"):
+        load_solution_module(str(tmp_path), question)
+    with pytest.raises(SolutionError, match="Only Python"):
+        load_solution_module(str(tmp_path), QuestionData(language="rust"))
+    with pytest.raises(SolutionError, match="cannot run locally"):
+        load_solution_module(
+            str(tmp_path),
+            QuestionData(language="python3", categories=[TopicTag(slug="concurrency")]),
+        )
+
+
+def test_load_variant_finds_classes_and_files(tmp_path, write_solution):
+    question = write_solution(
+        "class Solution:\n"
+        "    def double(self, x):\n"
+        "        return x * 2\n"
+        "class SolutionShift:\n"
+        "    def double(self, x):\n"
+        "        return x << 1\n",
+        "double",
+    )
+    (tmp_path / "drafts").mkdir()
+    (tmp_path / "drafts" / "double.py").write_text(
+        "class Solution:\n    def double(self, x):\n        return x + x\n"
+        "class SolutionSum:\n    def double(self, x):\n        return sum([x, x])\n"
+    )
+    module = load_solution_module(str(tmp_path), question)
+
+    same_file = load_variant(str(tmp_path), question, module, "SolutionShift")
+    other_file = load_variant(str(tmp_path), question, module, "drafts/double.py")
+    other_class = load_variant(str(tmp_path), question, module, "drafts/double.py:SolutionSum")
+
+    assert main_class_name(question) == "Solution"
+    assert same_file.module is module
+    assert prepare_call(same_file.module, question, [3], same_file.class_name)() == 6
+    assert other_file.module is not module
+    assert other_file.class_name == "Solution"
+    assert other_class.module.__name__ == other_file.module.__name__
+    assert prepare_call(other_class.module, question, [4], other_class.class_name)() == 8
+    with pytest.raises(SolutionError, match="Could not find SolutionMissing"):
+        load_variant(str(tmp_path), question, module, "SolutionMissing")
+    with pytest.raises(SolutionError, match="Could not import .*missing.py"):
+        load_variant(str(tmp_path), question, module, "drafts/missing.py")
+
+
+def test_same_value_compares_normalized_outputs():
+    assert normalize_output((1, [2.5, None])) == [1, [2.5, None]]
+    assert same_value(normalize_output([1.000001, 2]), [1, 2])
+    assert not same_value([1, 2], [1, 2, 3])
+    assert not same_value(True, 1)
+    assert same_value("ab", "ab")
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+
+from leet2git.state_store import JsonStateStore, RunHistory, RunHistoryStore, StoredRun
+
+
+class Counter(BaseModel):
+    version: int = 1
+    count: int = 0
+
+
+class CounterStore(JsonStateStore[Counter]):
+    dir_name = "counters"
+    state_type = Counter
+
+
+class TimedRun(StoredRun):
+    seconds: float = 0.0
+
+
+class TimedRunStore(RunHistoryStore[TimedRun]):
+    dir_name = "timed_runs"
+    state_type = RunHistory[TimedRun]
+    max_runs = 2
+
+
+def test_json_state_store_round_trips_and_ignores_unreadable_or_older_files(tmp_path):
+    store = CounterStore(str(tmp_path))
+
+    assert store.load(1) == Counter()
+    store.save(1, Counter(count=3))
+    assert store.load(1).count == 3
+    assert (tmp_path / ".leet2git" / "counters" / ".gitignore").exists()
+
+    (tmp_path / ".leet2git" / "counters" / "1.json").write_text("{not json")
+    assert store.load(1) == Counter()
+    (tmp_path / ".leet2git" / "counters" / "1.json").write_text('{"version": 0, "count": 3}')
+    assert store.load(1) == Counter()
+
+
+def test_run_history_store_keeps_the_last_runs_and_matches_the_inputs(tmp_path):
+    store = TimedRunStore(str(tmp_path))
+
+    assert store.previous_run(1, "a") is None
+    for inputs_hash, seconds in (("a", 1.0), ("a", 2.0), ("b", 3.0)):
+        store.add_run(1, TimedRun(inputs_hash=inputs_hash, seconds=seconds))
+
+    assert [run.seconds for run in store.load(1).runs] == [2.0, 3.0]
+    previous = store.previous_run(1, "a")
+    assert isinstance(previous, TimedRun) and previous.seconds == 2.0
+    assert store.previous_run(2, "a") is None